@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Benchmark the store-asset stages and hot paths against a stored baseline.
+
+Stages run the real scripts (single process, --force, into a scratch
+folder with its own build cache); startup benchmarks time a fresh
+interpreter importing a module; hot paths call one function in a fresh
+interpreter, repeated --repeat times with its caches cleared:
+
+    stage:screenshots       generate-screenshots.py
+    stage:resize            resize-screenshots.py (on the stage:screenshots output)
+    stage:featured-graphic  generate-featured-graphic.py (on the stage:screenshots output)
+    stage:icons             generate-icons.py
+    stage:pipeline          screenshot-pipeline.py
+    startup:api             import store_assets.api (must stay free of Pillow)
+    scene:<output>          scenes.render_scene() per screen (the old create_screenshot_N)
+    add_phone_mockup        featured.add_phone_mockup() (with the decode of a fresh render)
+    create_gradient         featured.create_gradient()
+    encode:png, encode:jpeg encode.encode() of one master screenshot
+
+Each benchmark records wall time, CPU time (user + sys), peak RSS of its
+process and the bytes it wrote. Results go to --out (JSON); --save-baseline
+also stores them as the baseline, and later runs fail (exit 1) when a gated
+metric grows by more than --threshold over it. Peak RSS needs os.wait4
+(Linux/macOS).
+
+Timings from one machine say nothing about another, so baselines are not
+committed: each machine (or CI job, with --baseline on a cached path) records
+its own in .asset-cache/bench/baseline.json, keyed by machine_key() (OS,
+architecture and CPU count). Saving replaces only the benchmarks that ran,
+and only this machine's entry.
+
+    python benchmark-assets.py --save-baseline       # on main, before the change
+    python benchmark-assets.py --only scene: create_gradient
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from store_assets import build_cache  # noqa: E402
+
+BENCH_DIR = os.path.join(build_cache.CACHE_DIR, "bench")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+LATEST_PATH = os.path.join(BENCH_DIR, "latest.json")
+
+METRICS = ("wall", "cpu", "peak_rss", "output_bytes")
+# Time differences below this many seconds are noise, whatever the ratio
+MIN_TIME_DELTA = 0.01
+
+# name -> (script and arguments, output path); {work} is the scratch folder
+STAGES = {
+    "stage:screenshots": (["generate-screenshots.py", "--out", "{work}/screenshots", "-j", "1"], "{work}/screenshots"),
+    "stage:resize": (["resize-screenshots.py", "--src", "{work}/screenshots", "--out", "{work}/resized", "-j", "1"],
+                     "{work}/resized"),
+    "stage:featured-graphic": (["generate-featured-graphic.py", "--screenshots", "{work}/screenshots",
+                                "--out", "{work}/featured.png"], "{work}/featured.png"),
+    "stage:icons": (["generate-icons.py", "--out", "{work}/icons", "--allow-upscale", "-j", "1"], "{work}/icons"),
+    "stage:pipeline": (["screenshot-pipeline.py", "--out", "{work}/pipeline", "-j", "1"], "{work}/pipeline"),
+}
+# name -> module imported by a fresh interpreter
+STARTUP = {
+    "startup:api": "store_assets.api",
+}
+
+
+# --- hot paths (run inside the child process) -----------------------------
+
+def hot_paths():
+    """name -> zero-argument callable returning the bytes it produced (or None)."""
+    from PIL import Image
+    from store_assets import encode, featured, frames, registry, scenes
+
+    # Rendered by the warm-up into the scratch build cache, not read from store-screenshots/
+    screenshot_path = os.path.join(build_cache.CACHE_DIR, featured.MOCKUP_NAMES[0])
+    paths = {}
+    for scene in scenes.load_scenes():
+        def render(scene=scene):
+            scenes._base_layers.clear()
+            scenes.render_scene(scene)
+        paths[f"scene:{scene['output']}"] = render
+
+    def add_phone_mockup():
+        if not os.path.exists(screenshot_path):
+            os.makedirs(build_cache.CACHE_DIR, exist_ok=True)
+            scenes.render_scene(scenes.load_scenes()[0]).save(screenshot_path, compress_level=1)
+        frames.frame_template.cache_clear()
+        frames.shadow_template.cache_clear()
+        canvas = Image.new("RGBA", (featured.WIDTH, featured.HEIGHT))
+        registry.clear()
+        featured.add_phone_mockup(canvas, registry.load(screenshot_path), 560, 60, 380)
+
+    def create_gradient():
+        featured.create_gradient(featured.WIDTH, featured.HEIGHT, featured.DARK_NAVY, featured.MEDIUM_BLUE)
+
+    master = {}
+
+    def encode_master(fmt):
+        def run():
+            if "img" not in master:
+                master["img"] = scenes.render_scene(scenes.load_scenes()[0])
+            return len(encode.encode(master["img"], fmt).data)
+        return run
+
+    paths["add_phone_mockup"] = add_phone_mockup
+    paths["create_gradient"] = create_gradient
+    paths["encode:png"] = encode_master("PNG")
+    paths["encode:jpeg"] = encode_master("JPEG")
+    return paths
+
+
+def run_child(name, repeat):
+    """Child mode: time one hot path and print its result as JSON."""
+    fn = hot_paths()[name]
+    fn()  # warm-up: imports, fonts, lazily built inputs
+    best_wall = best_cpu = float("inf")
+    output = None
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        output = fn()
+        best_wall = min(best_wall, time.perf_counter() - wall)
+        best_cpu = min(best_cpu, time.process_time() - cpu)
+    print(json.dumps({"wall": best_wall, "cpu": best_cpu, "output_bytes": output}))
+
+
+# --- parent ---------------------------------------------------------------
+
+def run_process(cmd, env):
+    """Run cmd; returns (wall, cpu, peak RSS bytes or None, stdout)."""
+    # Output goes to files, not pipes: a child filling a pipe nobody reads yet would block forever
+    with tempfile.TemporaryFile("w+") as out, tempfile.TemporaryFile("w+") as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=SCRIPTS_DIR, env=env, stdout=out, stderr=err, text=True)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            cpu = usage.ru_utime + usage.ru_stime
+            # ru_maxrss is in KiB on Linux and in bytes on macOS
+            peak = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+        else:
+            proc.wait()
+            cpu = peak = None
+        wall = time.perf_counter() - start
+        out.seek(0)
+        err.seek(0)
+        stdout, stderr = out.read(), err.read()
+    if proc.returncode:
+        raise RuntimeError(f"{' '.join(cmd)} failed:\n{stderr}")
+    return wall, cpu, peak, stdout
+
+
+def disk_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def run_benchmark(name, work, env, repeat):
+    if name in STAGES:
+        args, output = STAGES[name]
+        cmd = [sys.executable] + [a.format(work=work) for a in args] + ["--force"]
+        wall, cpu, peak, _ = run_process(cmd, env)
+        return {"wall": wall, "cpu": cpu, "peak_rss": peak, "output_bytes": disk_bytes(output.format(work=work))}
+    if name in STARTUP:
+        # Best of repeat: a cold start is noisy
+        runs = [run_process([sys.executable, "-c", f"import {STARTUP[name]}"], env) for _ in range(repeat)]
+        wall, cpu, peak, _ = min(runs, key=lambda r: r[0])
+        return {"wall": wall, "cpu": cpu, "peak_rss": peak, "output_bytes": None}
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", name, "--repeat", str(repeat)]
+    _, _, peak, stdout = run_process(cmd, env)
+    result = json.loads(stdout.strip().splitlines()[-1])
+    result["peak_rss"] = peak
+    return result
+
+
+def benchmark_names():
+    from store_assets import scenes
+    return list(STAGES) + list(STARTUP) + [f"scene:{s['output']}" for s in scenes.load_scenes()] + [
+        "add_phone_mockup", "create_gradient", "encode:png", "encode:jpeg"]
+
+
+def machine_key():
+    """Which baseline entry this machine compares against, e.g. "linux-x86_64-8cpu"."""
+    return f"{platform.system().lower()}-{platform.machine().lower()}-{os.cpu_count()}cpu"
+
+
+def load_baselines(path):
+    """machine key -> report, from path ({} when there is none yet)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["machines"]
+
+
+def save_baseline(path, report):
+    """Store report's results as this machine's baseline, keeping the other machines' and benchmarks'."""
+    baselines = load_baselines(path)
+    entry = baselines.get(machine_key(), {"results": {}})
+    baselines[machine_key()] = {"meta": report["meta"], "results": {**entry["results"], **report["results"]}}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"machines": dict(sorted(baselines.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baseline, gates, threshold):
+    """Lines describing each gated regression past threshold."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in gates:
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            if metric in ("wall", "cpu") and new - old < MIN_TIME_DELTA:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append(f"{name} {metric}: {fmt(metric, old)} -> {fmt(metric, new)} (+{new / old - 1:.0%})")
+    return regressions
+
+
+def fmt(metric, value):
+    if value is None:
+        return "-"
+    if metric in ("wall", "cpu"):
+        return f"{value:.3f}s"
+    return f"{value / 2**20:.1f}MiB" if metric == "peak_rss" else f"{value:,}B"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", help="benchmarks to run (names or prefixes, e.g. 'stage:' 'scene:')")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per hot path (best is kept)")
+    parser.add_argument("--out", default=LATEST_PATH, help="where to write this run's results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed growth per metric (0.15 = 15%%)")
+    parser.add_argument("--gate", nargs="+", default=list(METRICS), choices=METRICS, help="metrics that can fail the run")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.repeat)
+        return
+
+    names = benchmark_names()
+    if args.only:
+        names = [n for n in names if any(n == o or (o.endswith(":") and n.startswith(o)) for o in args.only)]
+        readers = [n for n in names if n in ("stage:resize", "stage:featured-graphic")]
+        if readers and "stage:screenshots" not in names:
+            names.insert(names.index(readers[0]), "stage:screenshots")  # they read its output
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="asset-bench-") as work:
+        # Scratch build cache (seeded with the font index so it is not rebuilt)
+        cache = os.path.join(work, "cache")
+        os.makedirs(cache)
+        font_index = os.path.join(build_cache.CACHE_DIR, "font-index.json")
+        if os.path.exists(font_index):
+            shutil.copy(font_index, cache)
+        env = dict(os.environ, ASSET_CACHE_DIR=cache)
+        for name in names:
+            results[name] = run_benchmark(name, work, env, args.repeat)
+            r = results[name]
+            print(f"{name:<32}{fmt('wall', r['wall']):>10}{fmt('cpu', r['cpu']):>10}"
+                  f"{fmt('peak_rss', r['peak_rss']):>11}{fmt('output_bytes', r['output_bytes']):>14}")
+
+    from PIL import __version__ as pillow_version
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "pillow": pillow_version,
+            "platform": platform.platform(), "cpus": os.cpu_count(), "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+    machine = machine_key()
+    if args.save_baseline:
+        save_baseline(args.baseline, report)
+        print(f"Baseline for {machine} saved to {args.baseline}")
+        return
+    baseline = load_baselines(args.baseline).get(machine)
+    if baseline is None:
+        print(f"No baseline for {machine} yet (run with --save-baseline)")
+        return
+    regressions = compare(results, baseline["results"], args.gate, args.threshold)
+    if regressions:
+        print(f"\nRegressions past {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No regressions past {args.threshold:.0%} against {args.baseline} ({machine})")
+
+
+if __name__ == "__main__":
+    main()
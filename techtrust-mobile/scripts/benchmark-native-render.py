@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare native rendering at each store size with resizing the 1290x2796 master.
+
+For every scene and every entry in SIZES this times
+  - resize: LANCZOS-resampling the master render (what resize-screenshots.py does;
+    the master render itself is timed once per scene and reported separately)
+  - native: rendering the scene directly at the target size
+and scores both against a supersampled reference (the scene rendered natively
+at 2x the target size, then box-reduced):
+  - psnr:    PSNR in dB against the reference (higher is better)
+  - stretch: aspect-ratio distortion of the layout (0% = none)
+
+Nothing is written unless --json is given.
+"""
+import argparse
+import json
+import math
+import os
+import time
+
+from PIL import Image, ImageChops, ImageStat
+
+from store_assets import scenes
+from store_assets.sizes import SIZES
+
+
+def timed(fn, *args, repeat=1):
+    """(result, best wall time in seconds) over `repeat` runs."""
+    best = math.inf
+    for _ in range(repeat):
+        scenes._base_layers.clear()  # every target pays for its own base layer
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def psnr(img, ref):
+    rms = ImageStat.Stat(ImageChops.difference(img, ref)).rms
+    mse = sum(v * v for v in rms) / len(rms)
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def reference(scene, size):
+    w, h = size
+    return scenes.render_scene(scene, (2 * w, 2 * h)).reduce(2)
+
+
+def bench_scene(scene, sizes, repeat):
+    master, master_s = timed(scenes.render_scene, scene, repeat=repeat)
+    rows = []
+    for size_name, size in sizes.items():
+        resized, resize_s = timed(master.resize, size, Image.LANCZOS, repeat=repeat)
+        native, native_s = timed(scenes.render_scene, scene, size, repeat=repeat)
+        ref = reference(scene, size)
+        stretch = abs((size[0] / size[1]) / (scenes.W / scenes.H) - 1)
+        rows.append({
+            "size": size_name,
+            "resize": {"seconds": resize_s, "psnr": psnr(resized, ref), "stretch": stretch},
+            "native": {"seconds": native_s, "psnr": psnr(native, ref), "stretch": 0.0},
+        })
+    return {"output": scene["output"], "master_seconds": master_s, "sizes": rows}
+
+
+def print_report(results):
+    header = f"  {'size':<14}{'resize s':>9}{'native s':>9}{'psnr resize/native':>21}{'stretch':>9}"
+    totals = {"resize": 0.0, "native": 0.0}
+    for result in results:
+        print(f"\n{result['output']} (master render {result['master_seconds']:.3f}s)")
+        print(header)
+        totals["resize"] += result["master_seconds"]
+        for row in result["sizes"]:
+            r, n = row["resize"], row["native"]
+            totals["resize"] += r["seconds"]
+            totals["native"] += n["seconds"]
+            print(f"  {row['size']:<14}{r['seconds']:>9.3f}{n['seconds']:>9.3f}"
+                  f"{r['psnr']:>12.1f} /{n['psnr']:>5.1f} dB{r['stretch']:>8.1%}")
+    print(f"\nTotal: resize path {totals['resize']:.2f}s (master + resamples), native {totals['native']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screens", default=scenes.SCREENS_DIR, help="folder with the JSON scene specs")
+    parser.add_argument("--sizes", nargs="*", default=list(SIZES), help="target size names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per measurement (best is kept)")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    sizes = {name: SIZES[name] for name in args.sizes}
+    results = [bench_scene(scene, sizes, args.repeat) for scene in scenes.load_scenes(args.screens)]
+    print_report(results)
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Wrap raw screenshots or device captures in device frames for every store size.
+
+Frame bodies and blurred shadows come from store_assets/frames.py, which
+renders them once per (device, frame size); a batch of captures with the
+same aspect ratio shares one shadow blur per target size. Each capture's
+framed sizes are composed here and encoded on one process pool (--jobs)
+while the next capture is framed, so at most two captures' framed canvases
+are held at a time.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from PIL import ImageColor
+import argparse
+import inspect
+import os
+import time
+
+from store_assets import encode, frames, output_store, registry, trace
+from store_assets.build_cache import BuildManifest, input_digest
+from store_assets.sizes import SIZES, list_screenshots
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(BASE, "store-screenshots")
+OUT = os.path.join(SRC, "framed")
+
+
+def frame_capture(src_path, args, background, manifest, code):
+    """Frame one capture at every stale size. Returns [(framed image, out_path, digest)]."""
+    fname = os.path.basename(src_path)
+    pending = []
+    for size_name in args.sizes:
+        size = SIZES[size_name]
+        out_dir = os.path.join(args.out, size_name)
+        out_path = os.path.join(out_dir, os.path.splitext(fname)[0] + ".png")
+        digest = input_digest(
+            files=[src_path],
+            constants={
+                "size": size, "device": frames.DEVICES[args.device], "background": background,
+                "encode": encode.settings("app_store"),
+            },
+            code=code,
+        )
+        if manifest.is_fresh(out_path, digest):
+            continue
+        os.makedirs(out_dir, exist_ok=True)
+        with trace.stage("frame", file=fname, size=size_name):
+            framed = frames.framed_canvas(registry.load(src_path), size, args.device, background)
+        pending.append((framed, out_path, digest))
+    return pending
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--src", default=SRC, help="folder with the screenshots or captures to frame")
+    parser.add_argument("--out", default=OUT, help="root for the per-size output folders")
+    parser.add_argument("--device", default="phone", choices=sorted(frames.DEVICES))
+    parser.add_argument("--background", default="#1b3a6b", help="canvas color behind the device (default: brand navy)")
+    parser.add_argument("--sizes", nargs="*", default=list(SIZES), help="target size names (default: all)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="encoder processes (default: CPU count, 1 = run in-process)")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and re-frame everything")
+    args = parser.parse_args()
+    unknown = set(args.sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"unknown size(s): {' '.join(sorted(unknown))} (available: {' '.join(SIZES)})")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    background = ImageColor.getrgb(args.background)
+    output_store.start_run()
+    manifest = BuildManifest(force=args.force)
+    code = [inspect.getsource(frames), inspect.getsource(encode)]
+    start = time.perf_counter()
+    jobs = args.jobs or os.cpu_count() or 1
+    # One pool for the whole run; its workers start on the first submit, so an up-to-date run spawns none
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+
+    def finish(fname, pending, futures):
+        with trace.stage("save framed", file=fname, count=len(pending)):
+            if futures is None:
+                encode.save_all([(img, out_path, "app_store") for img, out_path, _ in pending], 1)
+            for future in futures or ():
+                future.result()
+        for _, out_path, digest in pending:
+            manifest.record(out_path, digest)
+        print(f"Framed: {fname}")
+
+    in_flight = None  # (fname, pending, futures) of the capture being encoded
+    try:
+        for fname in list_screenshots(args.src, encode.IMAGE_EXTENSIONS):
+            pending = frame_capture(os.path.join(args.src, fname), args, background, manifest, code)
+            if not pending:
+                continue
+            if pool is None:
+                finish(fname, pending, None)
+                continue
+            futures = [pool.submit(encode.save, img, out_path, "app_store") for img, out_path, _ in pending]
+            # This capture is queued: wait for the previous one before framing the next
+            if in_flight:
+                finish(*in_flight)
+            in_flight = fname, pending, futures
+        if in_flight:
+            finish(*in_flight)
+    finally:
+        if pool:
+            pool.shutdown()
+    manifest.save()
+
+    blurs = frames.shadow_template.cache_info().misses
+    print(f"\nDone in {time.perf_counter() - start:.2f}s ({manifest.summary()}, {blurs} shadow blurs)")
+    print(f"Framed screenshots saved in subfolders of: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,189 +3,102 @@
 Generate Google Play Featured Graphic (1024x500px)
 Uses the TechTrust logo + tagline + app screenshots.
 No prohibited words: no "best", "free", "top", "#1", "promotions", etc.
+The layout is store_assets/featured.py; this script reads the inputs and
+writes the PNG.
+
+--quality draft keeps the 1024x500 canvas (the layout is in pixels) but
+mocks up the draft screenshots, drops the phone shadows, resamples
+bilinearly and writes a fast PNG to .asset-cache/draft/; --quality final
+draws the phone frames at 2x. See store_assets/quality.py.
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import argparse
+import inspect
 import os
+import sys
+
+from store_assets import emoji, encode, featured, frames, output_store, quality, registry, trace
+from store_assets.build_cache import BuildManifest, input_digest
+from store_assets.featured import HEIGHT, LOGO_PATH, WIDTH
+from store_assets.fonts import resolved_font_files
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_PATH = os.path.join(BASE_DIR, "store-screenshots", "featured_graphic_1024x500.png")
+SCREENSHOTS_DIR = os.path.join(BASE_DIR, "store-screenshots")
 
-# Brand colors
-DARK_NAVY = (18, 32, 64)       # #122040
-MEDIUM_BLUE = (30, 58, 110)    # #1e3a6e
-ACCENT_BLUE = (45, 100, 180)   # #2d64b4
-WHITE = (255, 255, 255)
-LIGHT_GRAY = (200, 210, 225)
-
-WIDTH, HEIGHT = 1024, 500
-
-
-def create_gradient(width, height, color_start, color_end):
-    """Create a horizontal gradient background."""
-    img = Image.new("RGB", (width, height))
-    draw = ImageDraw.Draw(img)
-    for x in range(width):
-        ratio = x / width
-        r = int(color_start[0] + (color_end[0] - color_start[0]) * ratio)
-        g = int(color_start[1] + (color_end[1] - color_start[1]) * ratio)
-        b = int(color_start[2] + (color_end[2] - color_start[2]) * ratio)
-        draw.line([(x, 0), (x, height)], fill=(r, g, b))
-    return img
-
-
-def get_font(size, bold=False):
-    """Try to load a nice font, fall back to default."""
-    font_paths = [
-        "/System/Library/Fonts/Helvetica.ttc",
-        "/System/Library/Fonts/SFNSDisplay.ttf",
-        "/System/Library/Fonts/SFCompact.ttf",
-        "/Library/Fonts/Arial.ttf",
-        "/System/Library/Fonts/Supplemental/Arial Bold.ttf" if bold else "/System/Library/Fonts/Supplemental/Arial.ttf",
-    ]
-    for path in font_paths:
-        if os.path.exists(path):
-            try:
-                return ImageFont.truetype(path, size)
-            except Exception:
-                continue
-    return ImageFont.load_default()
-
-
-def add_phone_mockup(canvas, screenshot_path, x, y, phone_height):
-    """Add a screenshot in a phone-like frame."""
-    if not os.path.exists(screenshot_path):
-        return
 
-    screenshot = Image.open(screenshot_path).convert("RGBA")
-
-    # Calculate dimensions for the phone
-    aspect = screenshot.width / screenshot.height
-    screen_h = int(phone_height * 0.88)
-    screen_w = int(screen_h * aspect)
-    phone_w = screen_w + 16
-    phone_h = phone_height
-
-    # Create phone frame
-    phone = Image.new("RGBA", (phone_w, phone_h), (0, 0, 0, 0))
-    phone_draw = ImageDraw.Draw(phone)
-
-    # Phone body (rounded rectangle)
-    phone_draw.rounded_rectangle(
-        [0, 0, phone_w - 1, phone_h - 1],
-        radius=18,
-        fill=(20, 20, 25, 255),
-        outline=(60, 60, 70, 255),
-        width=2,
-    )
+def mockup_screenshots(q=None, folder=None):
+    """The screenshots in folder to mock up; by default those in store-screenshots/ or, for a draft, its draft folder."""
+    if folder is None:
+        folder = quality.out_dir(quality.get(q), SCREENSHOTS_DIR)
+    return [os.path.join(folder, name) for name in featured.MOCKUP_NAMES]
+
+
+def _open(path):
+    """The decoded image at path (from the registry), or None (with a warning) if it is missing."""
+    if not os.path.exists(path):
+        print(f"Warning: {os.path.basename(path)} not found, mockup left out "
+              "(run generate-screenshots.py first, or use store-assets.py)", file=sys.stderr)
+        return None
+    return registry.load(path)
 
-    # Screen area
-    screen_x = 8
-    screen_y = int(phone_h * 0.06)
-    resized = screenshot.resize((screen_w, screen_h), Image.LANCZOS)
-    phone.paste(resized, (screen_x, screen_y))
-
-    # Add subtle shadow
-    shadow = Image.new("RGBA", (phone_w + 20, phone_h + 20), (0, 0, 0, 0))
-    shadow_draw = ImageDraw.Draw(shadow)
-    shadow_draw.rounded_rectangle(
-        [10, 10, phone_w + 9, phone_h + 9],
-        radius=18,
-        fill=(0, 0, 0, 80),
-    )
-    shadow = shadow.filter(ImageFilter.GaussianBlur(8))
 
-    # Composite shadow then phone
-    canvas.paste(shadow, (x - 10, y - 5), shadow)
-    canvas.paste(phone, (x, y), phone)
+def render_featured_graphic(q=None, screenshots=None):
+    """Compose the featured graphic from the files and return it as an RGB image.
 
-    return phone_w
+    screenshots: the paths to mock up, instead of mockup_screenshots(q).
+    """
+    logo = registry.load(LOGO_PATH, "RGBA") if os.path.exists(LOGO_PATH) else None
+    return featured.render([_open(path) for path in screenshots or mockup_screenshots(q)], logo, q)
+
+
+def featured_graphic_digest(q=None, screenshots=None):
+    """Digest of everything the featured graphic is built from (screenshots: as for render_featured_graphic)."""
+    q = quality.get(q)
+    return input_digest(
+        files=[LOGO_PATH] + (screenshots or mockup_screenshots(q)),
+        constants={
+            **featured.constants(),
+            "encode": encode.settings(quality.profile(q, "play"), quality.effort(q)), "quality": quality.settings(q),
+        },
+        fonts=resolved_font_files() + emoji.source_files(),
+        code=[inspect.getsource(f) for f in (featured, render_featured_graphic, frames, emoji, encode, quality)],
+    )
 
 
 def main():
-    print("Generating Featured Graphic (1024x500)...")
+    parser = argparse.ArgumentParser(description="Generate the Google Play featured graphic.")
+    parser.add_argument("--out", default=None, help="output PNG path (drafts: under .asset-cache/draft/)")
+    parser.add_argument("--quality", default=quality.DEFAULT, choices=list(quality.QUALITIES),
+                        help="draft: cheap preview, final: supersampled frames (see store_assets/quality.py)")
+    parser.add_argument("--screenshots", default=None,
+                        help="folder with the screenshots to mock up (default: store-screenshots/, "
+                             "drafts: .asset-cache/draft/store-screenshots)")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and re-render")
+    args = parser.parse_args()
+    q = quality.get(args.quality)
+    screenshots = mockup_screenshots(q, args.screenshots)
+    args.out = args.out or os.path.join(quality.out_dir(q, SCREENSHOTS_DIR), os.path.basename(OUTPUT_PATH))
+
+    output_store.start_run()
+    manifest = BuildManifest(force=args.force)
+    digest = featured_graphic_digest(q, screenshots)
+    if manifest.is_fresh(args.out, digest):
+        print(f"Up to date: {args.out}")
+        return
 
-    # 1. Create gradient background
-    canvas = create_gradient(WIDTH, HEIGHT, DARK_NAVY, MEDIUM_BLUE).convert("RGBA")
-
-    # 2. Add subtle decorative elements
-    overlay = Image.new("RGBA", (WIDTH, HEIGHT), (0, 0, 0, 0))
-    overlay_draw = ImageDraw.Draw(overlay)
-
-    # Subtle circles for visual interest
-    overlay_draw.ellipse([WIDTH - 350, -100, WIDTH + 100, 350], fill=(255, 255, 255, 8))
-    overlay_draw.ellipse([WIDTH - 250, 150, WIDTH + 50, 450], fill=(255, 255, 255, 5))
-    overlay_draw.ellipse([-150, 200, 200, 550], fill=(255, 255, 255, 5))
-    canvas = Image.alpha_composite(canvas, overlay)
-
-    # 3. Add logo
-    logo_path = os.path.join(BASE_DIR, "assets", "images", "logo_icon_blue.png")
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path).convert("RGBA")
-        logo_size = 80
-        logo = logo.resize((logo_size, logo_size), Image.LANCZOS)
-        canvas.paste(logo, (60, 60), logo)
-
-    # 4. Add text
-    draw = ImageDraw.Draw(canvas)
-
-    # Company name
-    font_title = get_font(42, bold=True)
-    font_subtitle = get_font(22)
-    font_tagline = get_font(18)
-    font_features = get_font(16)
-
-    text_x = 155
-
-    # "TechTrust" title
-    draw.text((text_x, 65), "TechTrust", fill=WHITE, font=font_title)
-    draw.text((text_x, 115), "AutoSolutions", fill=ACCENT_BLUE, font=font_subtitle)
-
-    # Tagline
-    draw.text((60, 170), "Driven by Technology. Trusted by You.", fill=LIGHT_GRAY, font=font_tagline)
-
-    # Separator line
-    draw.line([(60, 210), (380, 210)], fill=ACCENT_BLUE, width=2)
-
-    # Feature bullets (safe language only)
-    features = [
-        "🔧  Auto Repair & Maintenance Services",
-        "📋  Compare Quotes from Verified Providers",
-        "💬  Chat Directly with Mechanics",
-        "💳  Secure In-App Payments",
-    ]
-
-    y_pos = 230
-    for feat in features:
-        draw.text((60, y_pos), feat, fill=WHITE, font=font_features)
-        y_pos += 32
-
-    # Bottom tagline
-    draw.text((60, 440), "Find Verified Mechanics Near You", fill=LIGHT_GRAY, font=font_tagline)
-
-    # 5. Add phone mockups on the right side
-    screenshots_dir = os.path.join(BASE_DIR, "store-screenshots")
-    screenshots = [
-        os.path.join(screenshots_dir, "01_find_services.png"),
-        os.path.join(screenshots_dir, "03_instant_quotes.png"),
-        os.path.join(screenshots_dir, "04_dashboard.png"),
-    ]
-
-    phone_height = 380
-    start_x = 560
-    spacing = 155
-
-    for i, ss_path in enumerate(screenshots):
-        if os.path.exists(ss_path):
-            x = start_x + (i * spacing)
-            y = 60 + (i * 15)  # Slight stagger
-            add_phone_mockup(canvas, ss_path, x, y, phone_height)
-
-    # 6. Save
-    final = canvas.convert("RGB")
-    final.save(OUTPUT_PATH, "PNG", quality=95)
-    print(f"✅ Saved: {OUTPUT_PATH}")
-    print(f"   Size: {WIDTH}x{HEIGHT}px")
+    print("Generating Featured Graphic (1024x500)...")
+    with trace.stage("render featured graphic"):
+        final = render_featured_graphic(q, screenshots)
+
+    # Save (Play wants a 24-bit PNG or JPEG)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with trace.stage("save featured graphic"):
+        encoded = encode.save(final, args.out, quality.profile(q, "play"), quality.effort(q))
+    manifest.record(args.out, digest)
+    manifest.save()
+    print(f"✅ Saved: {args.out}")
+    print(f"   Size: {WIDTH}x{HEIGHT}px, {len(encoded.data):,} bytes ({encoded.method})")
 
 
 if __name__ == "__main__":
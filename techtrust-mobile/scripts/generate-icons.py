@@ -1,52 +1,126 @@
 #!/usr/bin/env python3
-from PIL import Image
+"""Generate the app icon, adaptive icon and splash assets, and the full icon set.
+
+Besides the three Expo assets (ICONS), every platform icon is written under
+assets/icons/ (see store_assets/icon_sets.py): iOS AppIcon sizes, Android
+mipmaps with adaptive layers, favicon ICO and web manifest icons. They are
+resampled from a halving pyramid of 1024 px masters and encoded in parallel.
+
+--master takes a higher-resolution logo, or an SVG (needs cairosvg). A
+logo smaller than the largest size it is drawn at (820 px, on the 1024 px
+app icon) is an error; --allow-upscale builds from it anyway.
+"""
+import argparse
+import importlib.util
+import inspect
 import os
 
+from store_assets import encode, icon_sets, output_store, trace
+from store_assets.build_cache import BuildManifest, input_digest
+from store_assets.icon_sets import ICON_SET_DIR, ICONS, MASTERS, IconSources, render_icon
+
 BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO_PATH = os.path.join(BASE, "assets/images/logo_icon_blue.png")
+
+
+def icon_set_jobs(sources, logo_path, root, manifest, code):
+    """(image, path, digest) for every stale icon of the set, plus the stale favicon.ico or None."""
+    pending = []
+    for rel_path, source, px in icon_sets.icon_matrix():
+        out_path = os.path.join(root, rel_path)
+        spec = MASTERS.get("icon" if source == "round" else source)
+        digest = input_digest(
+            files=[logo_path],
+            constants=[source, spec, px, icon_sets.BACKGROUND, encode.settings("lossless")],
+            code=code,
+        )
+        if not manifest.is_fresh(out_path, digest):
+            pending.append((sources.icon(source, px), out_path, digest))
+
+    ico_path = os.path.join(root, "web", "favicon.ico")
+    ico_digest = input_digest(files=[logo_path], constants=[MASTERS["icon"], icon_sets.FAVICON_SIZES], code=code)
+    favicon = None if manifest.is_fresh(ico_path, ico_digest) else (ico_path, ico_digest)
+    return pending, favicon
+
+
+def write_metadata(root):
+    """Write the asset catalog, adaptive icon XML and manifest entries (through the output store)."""
+    for rel_path, text in icon_sets.metadata_files().items():
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        output_store.write(path, text.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="encoder processes (default: CPU count, 1 = run in-process)")
+    parser.add_argument("--out", default=BASE, help="root the icon paths are relative to (default: techtrust-mobile/)")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and rebuild every icon")
+    parser.add_argument("--master", default=LOGO_PATH, help="logo to build from (PNG, or SVG with cairosvg)")
+    parser.add_argument("--allow-upscale", action="store_true",
+                        help="build from a logo smaller than the largest icon (upscaled, so blurry)")
+    parser.add_argument("--no-icon-set", action="store_true", help=f"only write the three assets, not {ICON_SET_DIR}/")
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.master.lower().endswith(".svg") and importlib.util.find_spec("cairosvg") is None:
+        parser.error("SVG masters need cairosvg (pip install cairosvg)")
+
+    manifest = BuildManifest(force=args.force)
+    code = [inspect.getsource(render_icon), inspect.getsource(encode)]
+    output_store.start_run()
+    sources = IconSources(args.master, args.allow_upscale)
+    try:
+        sources.logo  # checked before anything is written, also when every icon is up to date
+    except ValueError as e:
+        parser.error(f"{e} as --master, or pass --allow-upscale")
+    pending = []  # (image, out_path, digest, description)
+
+    for out_name, canvas_size, target_size, background, mode, description in ICONS:
+        out_path = os.path.join(args.out, out_name)
+        digest = input_digest(
+            files=[args.master],
+            constants=[canvas_size, target_size, background, mode, encode.settings("lossless")],
+            code=code,
+        )
+        if manifest.is_fresh(out_path, digest):
+            print(f"Up to date: {os.path.basename(out_name)}")
+            continue
+
+        with trace.stage("render icon", output=out_name):
+            pending.append((render_icon(sources.logo, canvas_size, target_size, background, mode), out_path, digest, description))
+
+    set_root = os.path.join(args.out, ICON_SET_DIR)
+    set_pending, favicon = [], None
+    if not args.no_icon_set:
+        with trace.stage("render icon set"):
+            set_pending, favicon = icon_set_jobs(sources, args.master, set_root, manifest,
+                                                 code + [inspect.getsource(icon_sets)])
+            if favicon:
+                os.makedirs(os.path.dirname(favicon[0]), exist_ok=True)
+                output_store.write(favicon[0], sources.favicon())
+                manifest.record(*favicon)
+            write_metadata(set_root)
+
+    # Bundled into the app build: lossless, encoded in parallel
+    items = [(img, out_path, "lossless") for img, out_path, _, _ in pending] + \
+            [(img, out_path, "lossless") for img, out_path, _ in set_pending]
+    for _, out_path, _ in items:
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with trace.stage("save icons", count=len(items)):
+        encode.save_all(items, args.jobs)
+    for _, out_path, digest, description in pending:
+        manifest.record(out_path, digest)
+        print(f"Saved {os.path.basename(out_path)} ({description})")
+    for _, out_path, digest in set_pending:
+        manifest.record(out_path, digest)
+    if not args.no_icon_set:
+        print(f"Icon set: {len(set_pending) + bool(favicon)} files written to {set_root}")
+
+    manifest.save()
+    print(f"Done! ({manifest.summary()})")
+
 
-# Load the blue icon (best square candidate: 203x197)
-icon = Image.open(os.path.join(BASE, "assets/images/logo_icon_blue.png")).convert("RGBA")
-print(f"Original: {icon.size}")
-
-# === iOS App Store Icon (1024x1024, no transparency) ===
-ios_icon = Image.new("RGBA", (1024, 1024), (255, 255, 255, 255))
-target_size = 820
-ratio = min(target_size / icon.width, target_size / icon.height)
-new_w = int(icon.width * ratio)
-new_h = int(icon.height * ratio)
-resized = icon.resize((new_w, new_h), Image.LANCZOS)
-x = (1024 - new_w) // 2
-y = (1024 - new_h) // 2
-ios_icon.paste(resized, (x, y), resized)
-ios_final = ios_icon.convert("RGB")
-ios_final.save(os.path.join(BASE, "assets/icon.png"), "PNG")
-print("Saved icon.png (1024x1024, no transparency)")
-
-# === Android Adaptive Icon (1024x1024, transparent bg) ===
-android_icon = Image.new("RGBA", (1024, 1024), (255, 255, 255, 0))
-target_android = 680
-ratio_a = min(target_android / icon.width, target_android / icon.height)
-new_wa = int(icon.width * ratio_a)
-new_ha = int(icon.height * ratio_a)
-resized_a = icon.resize((new_wa, new_ha), Image.LANCZOS)
-xa = (1024 - new_wa) // 2
-ya = (1024 - new_ha) // 2
-android_icon.paste(resized_a, (xa, ya), resized_a)
-android_icon.save(os.path.join(BASE, "assets/adaptive-icon.png"), "PNG")
-print("Saved adaptive-icon.png (1024x1024, transparent bg)")
-
-# === Splash Icon (centered on white) ===
-splash = Image.new("RGBA", (1284, 2778), (255, 255, 255, 255))
-target_splash = 600
-ratio_s = min(target_splash / icon.width, target_splash / icon.height)
-new_ws = int(icon.width * ratio_s)
-new_hs = int(icon.height * ratio_s)
-resized_s = icon.resize((new_ws, new_hs), Image.LANCZOS)
-xs = (1284 - new_ws) // 2
-ys = (2778 - new_hs) // 2
-splash.paste(resized_s, (xs, ys), resized_s)
-splash_final = splash.convert("RGB")
-splash_final.save(os.path.join(BASE, "assets/splash-icon.png"), "PNG")
-print("Saved splash-icon.png (1284x2778)")
-
-print("Done!")
+if __name__ == "__main__":
+    main()
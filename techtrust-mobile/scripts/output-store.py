@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Inspect and maintain the content-addressed output store (store_assets/output_store.py).
+
+    python output-store.py report              # what the last run changed, per folder
+    python output-store.py folders             # which store-screenshots/ folders really differ
+    python output-store.py dedupe              # link existing identical images to one stored copy
+    python output-store.py gc                  # drop objects no output uses, and old run logs
+
+folders and dedupe compare decoded images, not bytes: dedupe links files
+showing the same pixels to the smallest encoding among them, so their bytes
+may change. That saves disk space in the working tree only; git already
+stores identical blobs once. The linked files are read-only and shared, so
+only dedupe a tree nothing edits in place (the scripts write plain files
+unless ASSET_OUTPUT_STORE=1, see store_assets/output_store.py).
+"""
+import argparse
+import os
+from collections import defaultdict
+
+from store_assets import encode, output_store
+from store_assets.build_cache import MOBILE_DIR
+
+SCREENSHOTS_DIR = os.path.join(MOBILE_DIR, "store-screenshots")
+
+
+def image_files(root):
+    """folder -> sorted image file names, for every folder under root that has any."""
+    folders = {}
+    for dirpath, dirnames, files in os.walk(root):
+        dirnames.sort()
+        images = sorted(f for f in files if f.lower().endswith(encode.IMAGE_EXTENSIONS))
+        if images:
+            folders[dirpath] = images
+    return folders
+
+
+def report(args):
+    records = output_store.run_records(args.run)
+    if not records:
+        print("No runs recorded yet")
+        return
+    by_folder = defaultdict(lambda: defaultdict(list))
+    for path, record in sorted(records.items()):
+        by_folder[os.path.dirname(path)][record["status"]].append(os.path.basename(path))
+    for folder, statuses in by_folder.items():
+        counts = ", ".join(f"{len(statuses[s])} {s}" for s in ("changed", "new", "unchanged") if statuses[s])
+        print(f"{folder or '.'}: {counts}")
+        for status in ("changed", "new"):
+            for name in statuses[status]:
+                print(f"    {status:<8} {name}")
+
+
+def folders(args):
+    listing = image_files(args.root)
+    keys = output_store.file_keys([os.path.join(d, f) for d, files in listing.items() for f in files])
+    contents = {d: {f: keys[os.path.join(d, f)] for f in files} for d, files in listing.items()}
+
+    groups = defaultdict(list)
+    for folder, content in contents.items():
+        groups[frozenset(content.items())].append(folder)
+
+    def rel(folder):
+        return os.path.relpath(folder, args.root)
+
+    print("Identical folders:")
+    same = [sorted(g) for g in groups.values() if len(g) > 1]
+    for group in same:
+        print("    " + " = ".join(rel(d) for d in group))
+    if not same:
+        print("    none")
+
+    # Folders that hold a subset of another's files, all with the same images
+    print("Same images on shared file names:")
+    firsts = sorted(g[0] for g in groups.values())
+    found = False
+    for a in firsts:
+        for b in firsts:
+            common = contents[a].keys() & contents[b].keys()
+            if a < b and common and all(contents[a][f] == contents[b][f] for f in common):
+                print(f"    {rel(a)} ~ {rel(b)} ({len(common)} files)")
+                found = True
+    if not found:
+        print("    none")
+    print(f"{len(groups)} distinct folder contents in {len(contents)} folders")
+
+
+def dedupe(args):
+    paths = [os.path.join(d, f) for d, files in image_files(args.root).items() for f in files]
+    keys = output_store.file_keys(paths)
+    before = sum(os.path.getsize(p) for p in {os.stat(p).st_ino: p for p in paths}.values())
+    groups = defaultdict(list)
+    for path in paths:
+        groups[keys[path], os.path.splitext(path)[1].lower()].append(path)
+    for group in groups.values():
+        # Every file of the image gets the smallest encoding of it
+        with open(min(group, key=os.path.getsize), "rb") as f:
+            data = f.read()
+        for path in group:
+            output_store.put(path, data)
+    after = sum(os.path.getsize(p) for p in {os.stat(p).st_ino: p for p in paths}.values())
+    print(f"{len(paths)} files, {len(set(keys.values()))} distinct images: "
+          f"{before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB on disk")
+
+
+def gc(args):
+    count, freed = output_store.gc()
+    print(f"Removed {count} unused objects ({freed / 2**20:.1f} MiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("report", help="changes made by a run (default: the latest)")
+    p.add_argument("--run", help="run id (a file name in .asset-cache/runs/ without .jsonl)")
+    p.set_defaults(func=report)
+    for name, func, help_text in (("folders", folders, "group folders by their images"),
+                                  ("dedupe", dedupe, "link identical images under root to one stored copy")):
+        p = commands.add_parser(name, help=help_text)
+        p.add_argument("root", nargs="?", default=SCREENSHOTS_DIR)
+        p.set_defaults(func=func)
+    commands.add_parser("gc", help="remove unused objects and old run logs").set_defaults(func=gc)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,323 @@
 #!/usr/bin/env python3
-"""Resize screenshots for all App Store required sizes."""
+"""Resize screenshots for all App Store required sizes.
+
+Every source PNG is fanned out to every entry in SIZES as resize + PNG/JPEG
+encode jobs on a process pool (see --jobs). A job carries the source's path,
+not its pixels: the worker decodes the source itself, once per worker
+through store_assets/registry.py, so the parent holds no decoded images and
+each worker holds the sources it has been working on (at most
+ASSET_REGISTRY_MB). Encoding goes through store_assets/encode.py (smallest
+file above the quality threshold, see --effort). Outputs whose inputs are
+unchanged since the last run are skipped (see --force). Localized masters
+(--locales) are read from and written under <src>/<locale>/.
+
+With --max-memory MiB the run streams under a memory ceiling instead: each
+worker decodes one source itself, writes its sizes one at a time and closes
+every image as soon as it is encoded, and the number of workers is chosen
+from header-only estimates so that the parent plus its workers stay under
+the ceiling. Peak RSS is reported at the end.
+
+For the screenshots made by generate-screenshots.py, prefer its --sizes flag:
+it renders every size natively instead of resampling (and stretching) the master.
+screenshot-pipeline.py does render + resize + encode in one pass, without
+writing and re-reading the masters.
+"""
 from PIL import Image
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+import argparse
+import inspect
 import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS report
+    resource = None
+
+from store_assets import encode, output_store, registry, trace
+from store_assets.build_cache import BuildManifest, input_digest
+from store_assets.scenes import DEFAULT_LOCALE, locale_dir
+from store_assets.sizes import SIZES, list_screenshots
 
 SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "store-screenshots")
 
-# All Apple required sizes
-SIZES = {
-    "6.7inch": (1290, 2796),   # iPhone 15 Pro Max, 14 Pro Max
-    "6.5inch": (1284, 2778),   # iPhone 15 Plus, 14 Plus, 11 Pro Max
-    "6.1inch": (1179, 2556),   # iPhone 15, 14
-    "5.5inch": (1242, 2208),   # iPhone 8 Plus
-    "ipad_13inch": (2064, 2752), # iPad Pro 13"
-    "ipad_129inch": (2048, 2732), # iPad Pro 12.9"
-}
-
-for size_name, (w, h) in SIZES.items():
-    out_dir = os.path.join(SRC, size_name)
+PROFILE = "app_store"
+
+# Streaming mode: large downscales first shrink with Image.reduce() to at most
+# this multiple of the target (Pillow's reducing_gap), then resample
+REDUCING_GAP = 3.0
+# Peak of one streaming job per pixel: the decoded source, plus the largest
+# target's resized image and the encoder's candidates and float quality
+# buffers
+SOURCE_BYTES_PER_PX = 4
+TARGET_BYTES_PER_PX = 28
+
+
+def decode_source(path, largest=None):
+    """Open and fully decode a source image so it can be shared by every size job.
+
+    With largest=(w, h), JPEG sources are decoded at the smallest DCT scale
+    that still covers it (Image.draft; a no-op for PNG).
+    """
+    with Image.open(path) as img:
+        if largest:
+            img.draft("RGB", largest)
+        img.load()
+        # Palette PNGs would be resized with NEAREST; resample in RGB instead
+        return img.convert("RGB") if img.mode == "P" else img.copy()
+
+
+def load_source(path):
+    """path decoded for resizing, shared by the jobs this process runs (see store_assets/registry.py)."""
+    img = registry.load(path)
+    # Palette PNGs would be resized with NEAREST; resample in RGB instead
+    return registry.load(path, "RGB") if img.mode == "P" else img
+
+
+def pool_job(src_path, key, fname, size_name, size, out_root, effort="default"):
+    """Decode src_path (or reuse this worker's copy) and run resize_job; returns its result, the decode time and pid."""
+    start = time.perf_counter()
+    img = load_source(src_path)
+    decode = time.perf_counter() - start
+    return resize_job(img, key, fname, size_name, size, out_root, effort) + (decode, os.getpid())
+
+
+def resize_job(img, key, fname, size_name, size, out_root, effort="default", reducing_gap=None):
+    """Resize one decoded source to one target size and write PNG + JPEG."""
+    start = time.perf_counter()
+    out_dir = os.path.join(out_root, size_name)
     os.makedirs(out_dir, exist_ok=True)
-    
-    for fname in sorted(os.listdir(SRC)):
-        if not fname.endswith(".png"):
-            continue
-        src_path = os.path.join(SRC, fname)
-        if not os.path.isfile(src_path):
-            continue
-        
-        img = Image.open(src_path)
-        resized = img.resize((w, h), Image.LANCZOS)
+
+    with trace.stage("resize + save", file=key, size=size_name):
+        resized = img.resize(size, Image.LANCZOS, reducing_gap=reducing_gap)
         # Ensure RGB (no alpha) and save as JPEG too for compatibility
-        resized_rgb = resized.convert("RGB")
-        
+        resized_rgb = resized if resized.mode == "RGB" else resized.convert("RGB")
+
         # Save PNG
-        resized_rgb.save(os.path.join(out_dir, fname), "PNG")
+        encode.save(resized_rgb, os.path.join(out_dir, fname), PROFILE, effort)
         # Save JPEG too (some stores prefer JPEG)
         jpg_name = fname.replace(".png", ".jpg")
-        resized_rgb.save(os.path.join(out_dir, jpg_name), "JPEG", quality=95)
-    
-    print(f"Created {size_name} ({w}x{h})")
+        encode.save(resized_rgb, os.path.join(out_dir, jpg_name), PROFILE, effort)
+        resized_rgb.close()
+        resized.close()
+    return key, size_name, time.perf_counter() - start
+
+
+def stream_job(src_path, key, fname, stale, out_root, effort="default"):
+    """Streaming mode: decode one source here and write its stale sizes one at a time."""
+    start = time.perf_counter()
+    img = decode_source(src_path, largest=max(stale.values(), key=lambda s: s[0] * s[1]))
+    decode = time.perf_counter() - start
+    try:
+        results = [resize_job(img, key, fname, size_name, size, out_root, effort, REDUCING_GAP)
+                   for size_name, size in stale.items()]
+    finally:
+        img.close()
+    return key, decode, results, os.getpid()
+
+
+def job_memory(src_path, sizes):
+    """Estimated peak bytes of one stream_job, from the source's header only."""
+    with Image.open(src_path) as img:
+        width, height = img.size
+    largest = max(w * h for w, h in sizes)
+    return width * height * SOURCE_BYTES_PER_PX + largest * TARGET_BYTES_PER_PX
+
+
+def current_rss():
+    """Resident set size of this process in bytes (Linux; falls back to the peak)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss()[0]
+
+
+def peak_rss():
+    """(this process, largest child process) peak RSS in bytes, None where unknown."""
+    if resource is None:
+        return None, None
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+def job_outputs(fname, size_name, out_root):
+    out_dir = os.path.join(out_root, size_name)
+    return [os.path.join(out_dir, fname), os.path.join(out_dir, fname.replace(".png", ".jpg"))]
+
+
+def locale_folders(src_dir, out_root, locales):
+    """(label, source folder, output root) per locale; non-English masters live in <src>/<locale>/."""
+    folders = []
+    for locale in locales:
+        if locale == DEFAULT_LOCALE:
+            folders.append(("", src_dir, out_root or src_dir))
+            continue
+        locale_src = locale_dir(src_dir, locale)
+        if not os.path.isdir(locale_src):
+            print(f"Skipping {locale}: {locale_src} does not exist (render it with generate-screenshots.py --locales {locale})")
+            continue
+        folders.append((locale, locale_src, locale_dir(out_root or src_dir, locale)))
+    return folders
+
+
+def stream_sources(sources, jobs, max_memory, effort="default"):
+    """Run stream_job for each source, keeping this process plus its workers under max_memory bytes.
+
+    Workers are forked from this process, so each is assumed to start at its
+    current RSS; a job is only submitted when a worker is free, so no decoded
+    image ever waits in a queue. Yields stream_job results as they finish.
+    """
+    if not sources:
+        return
+    base = current_rss()
+    job_peak = max(job_memory(src_path, stale.values()) for src_path, _, _, stale, _ in sources)
+    workers = min(jobs, len(sources), (max_memory - base) // (base + job_peak))
+    if workers < 2:
+        if base + job_peak > max_memory:
+            print(f"Warning: one file needs about {(base + job_peak) / 2**20:.0f} MiB, over the "
+                  f"{max_memory / 2**20:.0f} MiB ceiling; processing one file at a time", file=sys.stderr)
+        for source in sources:
+            yield stream_job(*source, effort)
+        return
+
+    print(f"Streaming {len(sources)} files on {workers} workers "
+          f"(~{(base + job_peak) / 2**20:.0f} MiB each, ceiling {max_memory / 2**20:.0f} MiB)")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = iter(sources)
+        running = {pool.submit(stream_job, *source, effort) for source in _take(pending, workers)}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            running |= {pool.submit(stream_job, *source, effort) for source in _take(pending, len(done))}
+
+
+def _take(iterator, n):
+    return [item for _, item in zip(range(n), iterator)]
+
+
+def resize_all(src_dir=SRC, out_root=None, sizes=SIZES, jobs=None, manifest=None, locales=(DEFAULT_LOCALE,),
+               effort="default", max_memory=None):
+    """Fan every source of every locale out to every size. Returns per-file timings in seconds
+    and the pids of the processes that resized each file.
+
+    max_memory (bytes) switches to the bounded streaming mode (stream_sources).
+    """
+    jobs = jobs or os.cpu_count() or 1
+    manifest = manifest or BuildManifest()
+    code = [inspect.getsource(resize_job), inspect.getsource(encode)]
+    timings = {}
+    job_info = {}
+
+    def record(result):
+        key, size_name, seconds, decode, pid = result
+        timings[key]["decode"] += decode
+        timings[key]["workers"].add(pid)
+        timings[key]["sizes"][size_name] = seconds
+        outputs, digest = job_info[key, size_name]
+        manifest.record(outputs, digest)
+
+    def stale_sources():
+        """(source path, key, file name, {size name: size}, output root) per source with stale sizes."""
+        for label, folder, folder_out in locale_folders(src_dir, out_root, locales):
+            for fname in list_screenshots(folder):
+                src_path = os.path.join(folder, fname)
+                key = os.path.join(label, fname)
+                stale = {}
+                for size_name, size in sizes.items():
+                    digest = input_digest(
+                        files=[src_path],
+                        constants={"size": size, "encode": encode.settings(PROFILE, effort)},
+                        code=code,
+                    )
+                    outputs = job_outputs(fname, size_name, folder_out)
+                    if not manifest.is_fresh(outputs, digest):
+                        job_info[key, size_name] = (outputs, digest)
+                        stale[size_name] = size
+                if stale:
+                    yield src_path, key, fname, stale, folder_out
+
+    def pending_jobs():
+        """One (source path, size) job per stale size; the worker decodes the source."""
+        for src_path, key, fname, stale, folder_out in stale_sources():
+            timings[key] = {"decode": 0.0, "sizes": {}, "workers": set()}
+            for size_name, size in stale.items():
+                yield src_path, key, fname, size_name, size, folder_out, effort
+
+    try:
+        if max_memory:
+            for key, decode, results, pid in stream_sources(list(stale_sources()), jobs, max_memory, effort):
+                timings[key] = {"decode": decode, "sizes": {}, "workers": set()}
+                for result in results:
+                    record(result + (0.0, pid))
+            return timings
+        if jobs == 1:
+            for job in pending_jobs():
+                record(pool_job(*job))
+            return timings
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(pool_job, *job) for job in pending_jobs()]
+            for future in as_completed(futures):
+                record(future.result())
+        return timings
+    finally:
+        manifest.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--src", default=SRC, help="folder with the full-size source PNGs")
+    parser.add_argument("--out", default=None, help="root for the size subfolders (default: --src)")
+    parser.add_argument("--locales", nargs="+", default=[DEFAULT_LOCALE],
+                        help="locales to resize; non-English masters are read from <src>/<locale>/")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes (default: CPU count, 1 = run in-process)")
+    parser.add_argument("--effort", default="default", choices=list(encode.EFFORTS), help="PNG compression effort")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and redo every size")
+    parser.add_argument("--max-memory", type=int, metavar="MIB",
+                        help="stream under this memory ceiling (this process plus its workers, in MiB)")
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    wall_start = time.perf_counter()
+    output_store.start_run()
+    manifest = BuildManifest(force=args.force)
+    timings = resize_all(args.src, args.out, jobs=args.jobs, manifest=manifest, locales=args.locales,
+                         effort=args.effort, max_memory=args.max_memory and args.max_memory * 2**20)
+    wall = time.perf_counter() - wall_start
+
+    for size_name, (w, h) in SIZES.items():
+        written = sum(size_name in t["sizes"] for t in timings.values())
+        if written:
+            print(f"Created {size_name} ({w}x{h}): {written} screenshot{'s' * (written != 1)}")
+    if manifest.skipped:
+        print(f"{len(manifest.skipped)} outputs up to date (--force redoes them)")
+
+    print("\nPer-file timings:")
+    work = 0.0
+    for key, t in timings.items():
+        file_work = t["decode"] + sum(t["sizes"].values())
+        work += file_work
+        print(f"  {key}: decode {t['decode']:.2f}s, {len(t['sizes'])} sizes {file_work:.2f}s")
+    outputs = sum(len(t["sizes"]) for t in timings.values())
+    print(f"\nTotal: {outputs} resized ({manifest.summary()} files) in {wall:.2f}s wall ({work:.2f}s of work, jobs={args.jobs or os.cpu_count()})")
+
+    main_peak, worker_peak = peak_rss()
+    if main_peak is not None:
+        # Only when workers did the resizing (not with -j 1, a streaming run on one process, or nothing to do)
+        pooled = any(pid != os.getpid() for t in timings.values() for pid in t["workers"])
+        workers = f", {worker_peak / 2**20:.0f} MiB largest worker" if pooled else ""
+        print(f"Peak RSS: {main_peak / 2**20:.0f} MiB main{workers}")
+
+    print(f"\nAll sizes saved in subfolders of: {args.out or args.src}")
+    print("\nFor App Store Connect, use the folder matching the device size you see in the upload area.")
+
 
-print(f"\nAll sizes saved in subfolders of: {SRC}")
-print("\nFor App Store Connect, use the folder matching the device size you see in the upload area.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Render, resize, frame and encode the store screenshots in one streaming pass.
+
+Equivalent to generate-screenshots.py followed by resize-screenshots.py (and
+frame-screenshots.py with --frame), but the rendered masters are handed to
+the resize and framing stages in memory instead of being written as PNGs
+and decoded again; sizes with another aspect ratio (5.5", iPads) are drawn
+natively, as with generate-screenshots.py --sizes. Pass --keep-masters to also write the 1290x2796 masters
+(the featured graphic is built from them). See store_assets/pipeline.py.
+--quality draft/final as in generate-screenshots.py.
+"""
+from PIL import ImageColor
+import argparse
+import os
+import time
+
+from store_assets import encode, frames, output_store, pipeline, quality, scenes
+from store_assets.build_cache import BuildManifest
+from store_assets.sizes import SIZES
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT_DIR = os.path.join(BASE, "store-screenshots")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screens", default=scenes.SCREENS_DIR, help="folder with the JSON scene specs")
+    parser.add_argument("--out", default=None,
+                        help="output root (non-English locales go in subfolders; drafts default to .asset-cache/draft/)")
+    parser.add_argument("--locales", nargs="+", default=[scenes.DEFAULT_LOCALE],
+                        help=f"locales to render, or 'all' (available: {' '.join(scenes.available_locales())})")
+    parser.add_argument("--sizes", nargs="*", default=list(SIZES), help="target size names (default: all)")
+    parser.add_argument("--keep-masters", action="store_true", help="also write the full-size master PNGs")
+    parser.add_argument("--frame", action="store_true", help="also write device-framed versions to <out>/framed/<size>/")
+    parser.add_argument("--device", default="phone", choices=sorted(frames.DEVICES))
+    parser.add_argument("--background", default="#1b3a6b", help="canvas color behind framed devices (default: brand navy)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="encoder processes (default: CPU count, 1 = run in-process)")
+    parser.add_argument("--effort", default="default", choices=list(encode.EFFORTS), help="PNG compression effort")
+    parser.add_argument("--quality", default=quality.DEFAULT, choices=list(quality.QUALITIES),
+                        help="draft: reduced scale for layout checks, final: supersampled (see store_assets/quality.py)")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache and redo every output")
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    q = quality.get(args.quality)
+    args.out = args.out or quality.out_dir(q, OUT_DIR)
+
+    locales = scenes.available_locales() if args.locales == ["all"] else args.locales
+    unknown = set(args.sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"unknown size(s): {' '.join(sorted(unknown))} (available: {' '.join(SIZES)})")
+    sizes = {name: SIZES[name] for name in args.sizes}
+    background = ImageColor.getrgb(args.background)[:3]
+
+    start = time.perf_counter()
+    output_store.start_run()
+    manifest = BuildManifest(force=args.force)
+    work = pipeline.plan(
+        scenes.scene_paths(args.screens), locales, args.out, sizes, manifest,
+        keep_masters=args.keep_masters, frame=args.frame, q=q,
+        effort=args.effort, device=args.device, background=background,
+    )
+    print(f"{len(work)} screenshot(s) to render, {sum(len(t) for _, _, t in work)} output(s) stale")
+
+    images = pipeline.render_outputs(work, args.device, background, q)
+    try:
+        for (target, digest), seconds in pipeline.encode_outputs(images, args.jobs, args.effort, q):
+            manifest.record(target.outputs, digest)
+            print(f"Created: {os.path.relpath(target.outputs[0], args.out)} ({seconds:.2f}s)")
+    finally:
+        manifest.save()
+
+    print(f"\nDone in {time.perf_counter() - start:.2f}s ({manifest.summary()} files)")
+    print(f"Outputs saved in subfolders of: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Build every store asset, running the scripts as a task graph.
+
+    icons             generate-icons.py
+    screenshots       generate-screenshots.py
+    featured-graphic  generate-featured-graphic.py   (needs screenshots 01/03/04)
+    resize            resize-screenshots.py          (needs screenshots)
+    frame             frame-screenshots.py           (needs screenshots; only with --only)
+
+Tasks whose dependencies are done run at the same time (up to --jobs), so a
+full build takes about as long as its longest chain. The scripts' own
+process pools share one budget of --workers processes (default: CPU count):
+a task is started with -j set to its share of the workers not held by the
+tasks already running, and gives them back when it finishes, so concurrent
+tasks do not each start a pool of every CPU. Every task holds at least one
+worker, so a ready task waits while none is free. --only runs the named tasks
+plus whatever they depend on. Each script keeps its own build cache, so
+up-to-date tasks finish almost immediately.
+"""
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from store_assets import output_store, quality, trace
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# options: which of our flags the script understands ("jobs": it runs a pool sized by -j)
+Task = namedtuple("Task", "script deps options default")
+
+TASKS = {
+    "icons": Task("generate-icons.py", (), ("force", "allow_upscale", "jobs"), True),
+    "screenshots": Task("generate-screenshots.py", (), ("force", "locales", "quality", "jobs"), True),
+    "featured-graphic": Task("generate-featured-graphic.py", ("screenshots",), ("force", "quality"), True),
+    "resize": Task("resize-screenshots.py", ("screenshots",), ("force", "locales", "jobs"), True),
+    "frame": Task("frame-screenshots.py", ("screenshots",), ("force", "jobs"), False),
+}
+
+
+def select(names):
+    """The named tasks plus their transitive dependencies."""
+    selected = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            stack.extend(TASKS[name].deps)
+    return selected
+
+
+def command(name, args, workers=1):
+    task = TASKS[name]
+    cmd = [sys.executable, os.path.join(SCRIPTS_DIR, task.script)]
+    if args.force and "force" in task.options:
+        cmd.append("--force")
+    if args.locales and "locales" in task.options:
+        cmd += ["--locales", *args.locales]
+    if args.quality and "quality" in task.options:
+        cmd += ["--quality", args.quality]
+    if args.allow_upscale and "allow_upscale" in task.options:
+        cmd.append("--allow-upscale")
+    if "jobs" in task.options:
+        cmd += ["-j", str(workers)]
+    return cmd
+
+
+def worker_shares(ready, free):
+    """name -> workers for the tasks of ready that can start, splitting the free workers (at least 1 each).
+
+    Only the first `free` tasks start; the others stay queued until running tasks give workers back.
+    """
+    ready = ready[:max(0, free)]
+    pools = [name for name in ready if "jobs" in TASKS[name].options]
+    shares = {name: 1 for name in ready}
+    spare = max(0, free - len(ready))
+    for i, name in enumerate(pools):
+        shares[name] += spare // len(pools) + (i < spare % len(pools))
+    return shares
+
+
+def run_task(name, args, workers=1):
+    """Run one script; returns (returncode, combined output, start, end)."""
+    start = time.perf_counter()
+    with trace.span(name, "task", workers=workers):
+        proc = subprocess.run(command(name, args, workers), cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    return proc.returncode, proc.stdout + proc.stderr, start, time.perf_counter()
+
+
+def run_graph(selected, args):
+    """Run the selected tasks in dependency order. Returns {name: (status, start, end)}."""
+    results = {}
+    running = {}
+    held = {}  # running task -> workers it was given
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        while len(results) < len(selected):
+            ready = []
+            for name in sorted(selected):
+                if name in results or name in running.values():
+                    continue
+                deps = TASKS[name].deps
+                if any(results.get(dep, ("",))[0] in ("failed", "skipped") for dep in deps):
+                    results[name] = ("skipped", None, None)
+                    print(f"[{name}] skipped: a dependency failed")
+                elif all(dep in results for dep in deps):
+                    ready.append(name)
+            ready = ready[:max(0, args.jobs - len(running))]
+            for name, workers in worker_shares(ready, args.workers - sum(held.values())).items():
+                print(f"[{name}] started ({workers} worker{'s' * (workers != 1)})")
+                held[name] = workers
+                running[pool.submit(run_task, name, args, workers)] = name
+            if not running:
+                continue  # only skips were recorded this round
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                held.pop(name)
+                code, output, start, end = future.result()
+                status = "ok" if code == 0 else "failed"
+                results[name] = (status, start, end)
+                for line in output.rstrip().splitlines():
+                    print(f"[{name}] {line}")
+                print(f"[{name}] {status} in {end - start:.2f}s")
+    return results
+
+
+def critical_path(results):
+    """Longest chain of completed tasks by duration: (names, seconds)."""
+    best = {}
+
+    def longest(name):
+        if name not in best:
+            status, start, end = results[name]
+            chains = [longest(dep) for dep in TASKS[name].deps if dep in results and results[dep][1] is not None]
+            names, seconds = max(chains, key=lambda c: c[1], default=([], 0.0))
+            best[name] = (names + [name], seconds + (end - start))
+        return best[name]
+
+    finished = [name for name, (_, start, _) in results.items() if start is not None]
+    return max((longest(name) for name in finished), key=lambda c: c[1], default=([], 0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(TASKS), help="run these tasks (and their dependencies)")
+    parser.add_argument("--jobs", "-j", type=int, default=len(TASKS), help="tasks to run at the same time")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes shared by the running tasks' pools (default: CPU count)")
+    parser.add_argument("--locales", nargs="+", help="passed to the screenshot and resize tasks")
+    parser.add_argument("--quality", choices=list(quality.QUALITIES),
+                        help="passed to the screenshot and featured graphic tasks (draft: use with --only)")
+    parser.add_argument("--allow-upscale", action="store_true", help="passed to the icons task")
+    parser.add_argument("--force", action="store_true", help="ignore the build caches")
+    args = parser.parse_args()
+    for flag, value in (("--jobs", args.jobs), ("--workers", args.workers)):
+        if value < 1:
+            parser.error(f"{flag} must be at least 1 (got {value})")
+
+    output_store.start_run()  # all tasks share this process's run log
+    selected = select(args.only or [name for name, task in TASKS.items() if task.default])
+    start = time.perf_counter()
+    results = run_graph(selected, args)
+    wall = time.perf_counter() - start
+
+    work = sum(end - begin for _, begin, end in results.values() if begin is not None)
+    names, seconds = critical_path(results)
+    print(f"\nCritical path: {' -> '.join(names)} ({seconds:.2f}s)")
+    print(f"Wall time {wall:.2f}s for {work:.2f}s of task time")
+    failed = [name for name, (status, _, _) in results.items() if status != "ok"]
+    if failed:
+        print(f"Failed or skipped: {', '.join(sorted(failed))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Shared helpers for the store-asset scripts in techtrust-mobile/scripts/.
+
+store_assets.api is the in-process entry point: images in, images out.
+"""
@@ -0,0 +1,124 @@
+"""In-process entry points to the store-asset pipeline.
+
+Each function takes and returns PIL images (or encoded bytes) and writes
+nothing: paths, the build cache and the output store belong to the scripts,
+which are thin CLIs over the same modules. Importing this module loads none
+of them; Pillow, the fonts and the renderer are imported by the first call and
+stay warm for the next, so a worker can render many assets in one process:
+
+    from store_assets import api
+    master = api.render_screenshot("01_find_services", locale="es")
+    png = api.encode_image(api.resize_screenshot(master, "6.5inch"))
+
+quality is a level name, a quality.Quality or None for quality.DEFAULT,
+resolved when called (see quality.py). The import time is benchmarked
+(benchmark-assets.py --only startup:).
+"""
+import os
+
+
+def _quality(quality):
+    from store_assets import quality as qualities
+    return qualities.get(quality)
+
+
+def _size(size):
+    from store_assets.sizes import SIZES
+    return SIZES[size] if isinstance(size, str) else tuple(size)
+
+
+def load_scene(scene):
+    """A scene spec from a parsed dict, a JSON path, or a name in screens/ ("01_find_services")."""
+    from store_assets import scenes
+    if isinstance(scene, dict):
+        return scene
+    if os.path.exists(scene):
+        return scenes.load_scene(scene)
+    for path in scenes.scene_paths():
+        spec = scenes.load_scene(path)
+        if scene in (spec["output"], os.path.splitext(spec["output"])[0], os.path.basename(path)[:-5]):
+            return spec
+    raise ValueError(f"no scene {scene!r} in {scenes.SCREENS_DIR}")
+
+
+def render_screenshots(scenes=None, locales=None, quality=None):
+    """Yield (scene, locale, master) for every scene (default: all of screens/) and locale (default: English).
+
+    Each scene's locale-independent layer is drawn once for all locales.
+    """
+    from store_assets import pipeline, scenes as scene_specs
+    specs = [load_scene(s) for s in scenes] if scenes is not None else scene_specs.load_scenes()
+    work = [(spec, locale, (spec, locale)) for spec in specs for locale in locales or [scene_specs.DEFAULT_LOCALE]]
+    for (spec, locale), master in pipeline.render_masters(work, _quality(quality)):
+        yield spec, locale, master
+
+
+def render_screenshot(scene, locale=None, size=None, quality=None):
+    """One screenshot as an RGB image: the master, or at size (a SIZES name or (w, h)).
+
+    Sizes with the master's aspect ratio are resized from it, the others drawn natively.
+    """
+    from store_assets import pipeline
+    if size is not None and not pipeline.resampled(_size(size)):
+        from store_assets import quality as qualities, scenes as scene_specs
+        q = _quality(quality)
+        return pipeline.render(load_scene(scene), locale or scene_specs.DEFAULT_LOCALE,
+                               qualities.output_size(q, _size(size)), q)
+    [(_, _, master)] = render_screenshots([scene], [locale] if locale else None, quality)
+    return master if size is None else resize_screenshot(master, size, quality)
+
+
+def resize_screenshot(img, size, quality=None):
+    """img resized to size (a SIZES name or (w, h)) at the quality's output scale."""
+    from store_assets import quality as qualities
+    q = _quality(quality)
+    return qualities.resize(q, img, qualities.output_size(q, _size(size)))
+
+
+def frame_screenshot(img, size, device="phone", background=None, quality=None):
+    """img in a device frame, centered on a size canvas (default background: the scenes' navy)."""
+    from store_assets import frames, quality as qualities, scenes
+    q = _quality(quality)
+    background = scenes.PALETTE["NAVY"] if background is None else background
+    return frames.framed_canvas(img, qualities.output_size(q, _size(size)), device, background, q=q)
+
+
+def render_featured_graphic(screenshots, logo=None, quality=None):
+    """The Play featured graphic from up to three screenshot images and the logo image."""
+    from store_assets import featured
+    return featured.render(screenshots, logo, _quality(quality))
+
+
+def render_icons(logo, icon_set=True, allow_upscale=False):
+    """path (relative to techtrust-mobile/) -> image of every app icon.
+
+    logo is an image, a path or encoded bytes (an SVG needs cairosvg);
+    icon_set=False gives only the three Expo assets. A logo smaller than
+    the largest icon raises ValueError unless allow_upscale.
+    """
+    from store_assets import icon_sets
+    sources = icon_sets.IconSources(logo, allow_upscale)
+    icons = {name: icon_sets.render_icon(sources.logo, canvas_size, target_size, background, mode)
+             for name, canvas_size, target_size, background, mode, _ in icon_sets.ICONS}
+    if icon_set:
+        for rel, source, px in icon_sets.icon_matrix():
+            icons[f"{icon_sets.ICON_SET_DIR}/{rel}"] = sources.icon(source, px)
+    return icons
+
+
+def favicon(logo, allow_upscale=False):
+    """favicon.ico bytes for logo (an image, a path or encoded bytes); see render_icons() for allow_upscale."""
+    from store_assets import icon_sets
+    return icon_sets.IconSources(logo, allow_upscale).favicon()
+
+
+def icon_metadata():
+    """path (relative to techtrust-mobile/) -> text of the icon set's catalog, XML and manifest files."""
+    from store_assets import icon_sets
+    return {f"{icon_sets.ICON_SET_DIR}/{rel}": text for rel, text in icon_sets.metadata_files().items()}
+
+
+def encode_image(img, fmt="PNG", profile="app_store", effort="default"):
+    """The smallest encoding of img the profile allows (see encode.py), as bytes."""
+    from store_assets import encode
+    return encode.encode(img, fmt, profile, effort).data
@@ -0,0 +1,169 @@
+"""Whole-image gradient and background generation for the store assets.
+
+Gradients are computed as arrays instead of one draw call per column, so
+cost is dominated by a few vectorized passes and any size (1024x500 feature
+graphic, 4K promo banner) stays cheap. NumPy is used when it is
+installed; otherwise axis-aligned linear and radial gradients fall back to
+Pillow's built-in gradient primitives (dither and arbitrary angles need
+NumPy).
+
+Stops are either plain colors (spread evenly) or (position, color) pairs
+with position in 0..1.
+"""
+import math
+
+from PIL import Image, ImageDraw
+
+try:
+    import numpy as np
+except ImportError:  # optional: Pillow fallback below
+    np = None
+
+
+def _normalize_stops(stops):
+    stops = list(stops)
+    if len(stops) < 2:
+        raise ValueError("a gradient needs at least two stops")
+    if not (len(stops[0]) == 2 and isinstance(stops[0][1], (tuple, list))):
+        last = len(stops) - 1
+        stops = [(i / last, color) for i, color in enumerate(stops)]
+    stops = sorted(stops, key=lambda stop: stop[0])
+    positions = [float(pos) for pos, _ in stops]
+    colors = [tuple(color[:3]) for _, color in stops]
+    return positions, colors
+
+
+def _interp(t, positions, values):
+    """Piecewise-linear interpolation of one channel for a scalar t."""
+    if t <= positions[0]:
+        return values[0]
+    for i in range(1, len(positions)):
+        if t <= positions[i]:
+            p0, p1 = positions[i - 1], positions[i]
+            ratio = (t - p0) / (p1 - p0) if p1 > p0 else 1.0
+            return values[i - 1] + (values[i] - values[i - 1]) * ratio
+    return values[-1]
+
+
+def _colorize_array(t, size, stops, dither, seed):
+    """Map a t array (broadcastable to (h, w)) through the color stops."""
+    width, height = size
+    positions, colors = _normalize_stops(stops)
+    out = np.empty((height, width, 3), dtype=np.uint8)
+    rng = np.random.default_rng(seed) if dither else None
+    for ch in range(3):
+        channel = np.interp(t, positions, [color[ch] for color in colors])
+        if rng is not None:
+            channel = np.broadcast_to(channel, (height, width)) + rng.uniform(
+                -dither, dither, (height, width)
+            )
+        out[..., ch] = np.clip(np.floor(channel), 0, 255)
+    return Image.fromarray(out, "RGB")
+
+
+def _colorize_mask(mask, stops):
+    """Map an "L" t-mask (0..255) through the color stops with per-channel LUTs."""
+    positions, colors = _normalize_stops(stops)
+    bands = []
+    for ch in range(3):
+        values = [color[ch] for color in colors]
+        lut = [int(_interp(level / 255, positions, values)) for level in range(256)]
+        bands.append(mask.point(lut))
+    return Image.merge("RGB", bands)
+
+
+# Pillow fallback: the axis each angle runs along (0: x, 1: y) and whether it runs backwards
+_AXES = {0: (0, False), 90: (1, False), 180: (0, True), 270: (1, True)}
+
+
+def _ramp_mask(size, axis, reverse):
+    """An "L" t-mask (0..255) for an axis-aligned ramp, with t as the NumPy path computes it."""
+    n = size[axis]
+    levels = bytes(round((n - i if reverse else i) * 255 / n) for i in range(n))
+    line = Image.frombytes("L", (n, 1) if axis == 0 else (1, n), levels)
+    return line.resize(size, Image.NEAREST)
+
+
+def linear_gradient(size, stops, angle=0.0, dither=0.0, seed=0):
+    """RGB image with a linear gradient.
+
+    angle is in degrees: 0 runs left to right, 90 top to bottom.
+    dither adds +-dither levels of uniform noise before quantizing, which
+    hides banding on long, low-contrast ramps (try 0.5-1.0).
+    """
+    width, height = size
+    if np is None:
+        axis = angle % 360
+        if axis not in _AXES or dither:
+            raise RuntimeError("dithered or angled gradients need NumPy (pip install numpy)")
+        return _colorize_mask(_ramp_mask(size, *_AXES[axis]), stops)
+
+    rad = math.radians(angle)
+    c = round(math.cos(rad), 12)
+    s = round(math.sin(rad), 12)
+    lo = min(0.0, width * c) + min(0.0, height * s)
+    span = abs(width * c) + abs(height * s)
+    # Keep t as a (1, w) or (h, 1) vector for axis-aligned ramps so the
+    # color interpolation runs on one row/column and is broadcast.
+    xs = (np.arange(width, dtype=np.float64) * c)[None, :]
+    ys = (np.arange(height, dtype=np.float64) * s)[:, None]
+    if s == 0:
+        t = (xs - lo) / span
+    elif c == 0:
+        t = (ys - lo) / span
+    else:
+        t = (xs + ys - lo) / span
+    return _colorize_array(t, size, stops, dither, seed)
+
+
+def radial_gradient(size, stops, center=(0.5, 0.5), radius=None, dither=0.0, seed=0):
+    """RGB image with a radial gradient.
+
+    center is relative to the image (0..1); radius is in pixels and defaults
+    to the distance from the center to the farthest corner.
+    """
+    width, height = size
+    cx, cy = center[0] * width, center[1] * height
+    if radius is None:
+        radius = max(math.hypot(x - cx, y - cy) for x in (0, width) for y in (0, height))
+
+    if np is None:
+        if dither:
+            raise RuntimeError("dithered gradients need NumPy (pip install numpy)")
+        # radial_gradient("L") is 256x256 with floor(d * sqrt(2)) at d px from (128, 128):
+        # rescale the levels so that 255 is at d = 128, then scale d = 128 to radius
+        r = max(1, int(round(radius)))
+        lut = [min(255, round(level * 255 / (128 * math.sqrt(2)))) for level in range(256)]
+        disc = Image.radial_gradient("L").point(lut).resize((2 * r, 2 * r), Image.BILINEAR)
+        mask = Image.new("L", size, 255)
+        mask.paste(disc, (int(round(cx)) - r, int(round(cy)) - r))
+        return _colorize_mask(mask, stops)
+
+    xs = (np.arange(width, dtype=np.float64) - cx)[None, :]
+    ys = (np.arange(height, dtype=np.float64) - cy)[:, None]
+    t = np.minimum(np.sqrt(xs * xs + ys * ys) / radius, 1.0)
+    return _colorize_array(t, size, stops, dither, seed)
+
+
+def overlay_ellipses(canvas, ellipses):
+    """Blend translucent ellipses onto an RGBA canvas in place.
+
+    Each ellipse is ((x0, y0, x1, y1), (r, g, b, a)). All of them are drawn
+    on one layer (where they overlap the later one wins, nothing blends
+    twice) that is composited once, like a full-canvas overlay; the layer
+    only covers their bounding boxes, clipped to the canvas.
+    """
+    boxes = [(max(0, int(x0)), max(0, int(y0)),
+              min(canvas.width, int(math.ceil(x1)) + 1), min(canvas.height, int(math.ceil(y1)) + 1))
+             for (x0, y0, x1, y1), _ in ellipses]
+    boxes = [box for box in boxes if box[0] < box[2] and box[1] < box[3]]
+    if not boxes:
+        return canvas
+    left, top = min(box[0] for box in boxes), min(box[1] for box in boxes)
+    right, bottom = max(box[2] for box in boxes), max(box[3] for box in boxes)
+    layer = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    for (x0, y0, x1, y1), fill in ellipses:
+        draw.ellipse([x0 - left, y0 - top, x1 - left, y1 - top], fill=fill)
+    canvas.alpha_composite(layer, dest=(left, top))
+    return canvas
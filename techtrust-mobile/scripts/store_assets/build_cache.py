@@ -0,0 +1,125 @@
+"""Content-hash build manifest shared by the store-asset scripts.
+
+Each output is recorded with a digest of everything that went into it:
+source image bytes, layout constants, font files, code and the Pillow
+version. Scripts check `is_fresh()` before rendering and skip the work when
+the digest has not changed; `--force` bypasses the check.
+
+Several scripts may run at once (see store-assets.py), so save() merges this
+run's records into the manifest on disk under a lock instead of overwriting
+it with the snapshot loaded at startup.
+"""
+import hashlib
+import json
+import os
+
+import PIL
+
+try:
+    import fcntl
+except ImportError:  # Windows: no locking, last writer wins per output
+    fcntl = None
+
+MOBILE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# ASSET_CACHE_DIR points scratch runs (e.g. benchmarks) at their own cache
+CACHE_DIR = os.environ.get("ASSET_CACHE_DIR") or os.path.join(MOBILE_DIR, ".asset-cache")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "build-manifest.json")
+
+# (path, mtime_ns, size) -> sha256 hex, so a source shared by many outputs is hashed once
+_file_digests = {}
+
+
+def file_digest(path):
+    """sha256 of a file's bytes, or a fixed marker when it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return "missing"
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _file_digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _file_digests[key] = h.hexdigest()
+    return digest
+
+
+def input_digest(files=(), constants=None, fonts=(), code=()):
+    """Digest of every input of one output.
+
+    files:     source images (hashed by content)
+    constants: JSON-able layout settings (sizes, colors, encoder options)
+    fonts:     font files the render uses (hashed by content)
+    code:      source strings of the render functions
+    """
+    h = hashlib.sha256()
+    h.update(f"pillow={PIL.__version__}\n".encode())
+    for path in files:
+        h.update(f"file:{os.path.basename(path)}={file_digest(path)}\n".encode())
+    for path in fonts:
+        h.update(f"font:{os.path.basename(path)}={file_digest(path)}\n".encode())
+    if constants is not None:
+        h.update(json.dumps(constants, sort_keys=True, default=repr).encode())
+    for source in code:
+        h.update(source.encode())
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """JSON map of output path -> input digest, persisted under .asset-cache/."""
+
+    def __init__(self, path=MANIFEST_PATH, force=False):
+        self.path = path
+        self.force = force
+        self.built = []
+        self.skipped = []
+        self.entries = self._load()
+        self._recorded = {}
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("outputs", {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(output):
+        output = os.path.abspath(output)
+        if output.startswith(MOBILE_DIR + os.sep):
+            return os.path.relpath(output, MOBILE_DIR)
+        return output
+
+    def is_fresh(self, outputs, digest):
+        """True when every output exists and was last built from `digest`."""
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        fresh = not self.force and all(
+            os.path.exists(out) and self.entries.get(self._key(out)) == digest for out in outputs
+        )
+        if fresh:
+            self.skipped.extend(outputs)
+        return fresh
+
+    def record(self, outputs, digest):
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        for out in outputs:
+            self.entries[self._key(out)] = self._recorded[self._key(out)] = digest
+        self.built.extend(outputs)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self.entries = dict(self._load(), **self._recorded)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"outputs": self.entries}, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+    def summary(self):
+        return f"{len(self.built)} built, {len(self.skipped)} up to date"
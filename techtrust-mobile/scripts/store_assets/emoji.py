@@ -0,0 +1,280 @@
+"""Color emoji sprites drawn inline with scene text.
+
+The text fonts have no color emoji, so "🔍 Search" would come out as tofu.
+draw_text() splits a string into text runs and emoji sequences, draws the
+text with the font and pastes a sprite for each sequence. Sprites come from,
+in order of preference:
+
+  1. PNGs in scripts/emoji/ (or $ASSET_EMOJI_DIR) named by codepoints,
+     Twemoji style ("1f50d.png", "1f44b-1f3fd.png") or Noto style
+     ("emoji_u1f50d.png")
+  2. a color emoji font: one placed in that folder, else the platform's
+     (Apple Color Emoji, Segoe UI Emoji, Noto Color Emoji)
+
+Each sequence is rasterized once per pixel size and kept in an in-process
+atlas. No emoji images are bundled (Noto Emoji's png/128/ files can be
+dropped into scripts/emoji/ as they are), and the text fonts would draw an
+emoji as a tofu box, so drawing one that no source has raises
+MissingEmojiError. With ASSET_EMOJI_FALLBACK=1 such emoji are drawn with the
+text font instead and a warning says so once per process; a script that
+renders on a pool calls check_sources() before starting it, so it fails (or
+warns) once and the workers stay quiet. Without libraqm, ZWJ sequences only
+render from PNGs.
+"""
+import os
+import sys
+
+from PIL import Image, ImageDraw, ImageFont
+
+from store_assets import registry, trace
+from store_assets.fonts import FONT_EXTENSIONS, candidate_paths
+
+EMOJI_DIR = os.environ.get("ASSET_EMOJI_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "emoji")
+
+# Sprite box relative to the font size: square, top this far above the baseline
+SPRITE_SCALE = 1.0
+SPRITE_RISE = 0.88
+# Bitmap color fonts only load at their strike sizes (Noto: 109, Apple: 160/96/64)
+STRIKE_SIZES = (109, 160, 96, 64, 128)
+
+VS16, ZWJ, KEYCAP = "\ufe0f", "\u200d", "\u20e3"
+# BMP characters that are emoji without a VS16 (Unicode Emoji_Presentation)
+BMP_EMOJI = {
+    0x231A, 0x231B, 0x23E9, 0x23EA, 0x23EB, 0x23EC, 0x23F0, 0x23F3, 0x25FD, 0x25FE, 0x2614, 0x2615,
+    *range(0x2648, 0x2654), 0x267F, 0x2693, 0x26A1, 0x26AA, 0x26AB, 0x26BD, 0x26BE, 0x26C4, 0x26C5,
+    0x26CE, 0x26D4, 0x26EA, 0x26F2, 0x26F3, 0x26F5, 0x26FA, 0x26FD, 0x2705, 0x270A, 0x270B, 0x2728,
+    0x274C, 0x274E, 0x2753, 0x2754, 0x2755, 0x2757, 0x2795, 0x2796, 0x2797, 0x27B0, 0x27BF, 0x2B1B,
+    0x2B1C, 0x2B50, 0x2B55,
+}
+
+_sprites = {}      # (sequence, px) -> RGBA sprite or None
+_files = None      # files in EMOJI_DIR
+_font = False      # color emoji FreeTypeFont, None when there is none (False: not looked up)
+# "1": draw emoji no source has with the text font (tofu) instead of raising MissingEmojiError
+FALLBACK_ENV = "ASSET_EMOJI_FALLBACK"
+# Set by check_sources() for the worker processes it precedes (inherited also by spawned workers)
+WARNED_ENV = "ASSET_EMOJI_WARNED"
+_warned = os.environ.get(WARNED_ENV) == "1"
+
+
+class MissingEmojiError(RuntimeError):
+    """Text has an emoji that no color emoji source can draw."""
+
+
+def _is_modifier(ch):
+    cp = ord(ch)
+    return 0x1F3FB <= cp <= 0x1F3FF or ch in (VS16, KEYCAP) or 0xE0020 <= cp <= 0xE007F
+
+
+def _starts_emoji(text, i):
+    cp = ord(text[i])
+    if 0x1F000 <= cp <= 0x1FAFF and not _is_modifier(text[i]):
+        return True
+    return cp in BMP_EMOJI or text[i+1:i+2] == VS16
+
+
+def segments(text):
+    """Split text into (is_emoji, run) pairs; each emoji run is one sequence."""
+    runs = []
+    i, start = 0, 0
+    while i < len(text):
+        if not _starts_emoji(text, i):
+            i += 1
+            continue
+        if start < i:
+            runs.append((False, text[start:i]))
+        j = i + 1
+        if 0x1F1E6 <= ord(text[i]) <= 0x1F1FF and j < len(text) and 0x1F1E6 <= ord(text[j]) <= 0x1F1FF:
+            j += 1  # regional indicator pair (flag)
+        while j < len(text):
+            if _is_modifier(text[j]):
+                j += 1
+            elif text[j] == ZWJ and j + 1 < len(text):
+                j += 2
+            else:
+                break
+        runs.append((True, text[i:j]))
+        i = start = j
+    if start < len(text):
+        runs.append((False, text[start:]))
+    return runs
+
+
+# --- sources --------------------------------------------------------------
+
+def _emoji_files():
+    """Sorted file names in EMOJI_DIR, listed once."""
+    global _files
+    if _files is None:
+        _files = sorted(os.listdir(EMOJI_DIR)) if os.path.isdir(EMOJI_DIR) else []
+    return _files
+
+
+def _png_path(sequence):
+    codepoints = [f"{ord(ch):x}" for ch in sequence]
+    bare = [cp for cp in codepoints if cp != "fe0f"]
+    for name in ("-".join(codepoints), "-".join(bare), "emoji_u" + "_".join(bare)):
+        if name + ".png" in _emoji_files():
+            return os.path.join(EMOJI_DIR, name + ".png")
+    return None
+
+
+def _color_font():
+    global _font
+    if _font is not False:
+        return _font
+    bundled = [os.path.join(EMOJI_DIR, f) for f in _emoji_files() if f.lower().endswith(FONT_EXTENSIONS)]
+    _font = None
+    for path in bundled + candidate_paths("emoji"):
+        for size in STRIKE_SIZES:
+            try:
+                _font = ImageFont.truetype(path, size)
+                return _font
+            except OSError:
+                continue  # not a strike size of this bitmap font (or not loadable)
+    return _font
+
+
+def available():
+    """True when some color emoji source exists."""
+    return _color_font() is not None or any(f.endswith(".png") for f in _emoji_files())
+
+
+def _fallback():
+    return os.environ.get(FALLBACK_ENV) == "1"
+
+
+def _missing(what):
+    return MissingEmojiError(
+        f"{what}: add PNGs named by codepoint (Twemoji or Noto Emoji style) or a color emoji font to "
+        f"{EMOJI_DIR}, or set {FALLBACK_ENV}=1 to draw emoji with the text font")
+
+
+def check_sources():
+    """Raise MissingEmojiError when there is no color emoji source (with ASSET_EMOJI_FALLBACK=1: warn once).
+
+    Call it before starting a pool: the workers started after it do not repeat the warning.
+    """
+    global _warned
+    if not available() and not _fallback():
+        raise _missing("no color emoji source")
+    os.environ[WARNED_ENV] = "1"
+    if available() or _warned:
+        return
+    print(f"warning: no color emoji source (PNGs or a color font in {EMOJI_DIR}, or a system emoji "
+          "font); emoji are drawn with the text font", file=sys.stderr)
+    _warned = True
+
+
+def source_files():
+    """Files the sprites come from, for build-cache digests."""
+    files = [os.path.join(EMOJI_DIR, f) for f in _emoji_files()]
+    font = _color_font()
+    if font is not None and font.path not in files:
+        files.append(font.path)
+    return files
+
+
+@trace.traced("emoji sprite", "text", lambda sequence, px: {"sequence": sequence, "px": px})
+def _rasterize(sequence, px):
+    path = _png_path(sequence)
+    if path is not None:
+        # One decode per PNG, shared by every sprite size
+        return registry.variant(path, (px, px), "RGBA")
+    font = _color_font()
+    if font is None:
+        return None
+    box = font.getbbox(sequence)
+    source = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]))
+    ImageDraw.Draw(source).text((-box[0], -box[1]), sequence, font=font, embedded_color=True)
+    if source.getbbox() is None:
+        return None
+    return source.resize((px, px), Image.LANCZOS)
+
+
+def sprite(sequence, px):
+    """RGBA sprite of an emoji sequence at px x px, or None when no source has it."""
+    key = (sequence, px)
+    if key not in _sprites:
+        _sprites[key] = _rasterize(sequence, px)
+    return _sprites[key]
+
+
+# --- text -----------------------------------------------------------------
+
+def _sprite_px(font):
+    return max(1, round(font.size * SPRITE_SCALE))
+
+
+def _runs(text, font):
+    """(is_sprite, run, advance) for each run of text, or None when it has no drawable emoji."""
+    runs = segments(text)
+    if not any(is_emoji for is_emoji, _ in runs):
+        return None
+    if not available():
+        check_sources()
+        return None
+    px = _sprite_px(font)
+    result = []
+    for is_emoji, run in runs:
+        if is_emoji and sprite(run, px) is not None:
+            result.append((True, run, px))
+            continue
+        if is_emoji and not _fallback():
+            raise _missing(f"no color emoji source has {' '.join(f'U+{ord(ch):04X}' for ch in run)}")
+        if result and not result[-1][0]:
+            merged = result[-1][1] + run
+            result[-1] = (False, merged, font.getlength(merged))
+        else:
+            result.append((False, run, font.getlength(run)))
+    return result
+
+
+def text_length(text, font):
+    """Advance width of text as draw_text() draws it."""
+    runs = _runs(text, font)
+    if runs is None:
+        return font.getlength(text)
+    return sum(advance for _, _, advance in runs)
+
+
+def _paste(img, image, position):
+    """Blend image onto img at position; the parts outside img (also above or left of it) are clipped."""
+    x, y = position
+    left, top = max(0, -x), max(0, -y)
+    if left >= image.width or top >= image.height:
+        return
+    if left or top:
+        image = image.crop((left, top, image.width, image.height))
+    if img.mode == "RGBA":
+        img.alpha_composite(image, (x + left, y + top))
+    else:
+        img.paste(image, (x + left, y + top), image)
+
+
+def draw_text(img, draw, xy, text, fill=None, font=None, anchor=None):
+    """ImageDraw.text with color emoji sprites pasted inline (same anchors as Pillow's)."""
+    runs = _runs(text, font)
+    if runs is None:
+        draw.text(xy, text, fill=fill, font=font, anchor=anchor)
+        return
+    horizontal, vertical = anchor or "la"
+    x, y = xy
+    x -= {"l": 0, "m": 0.5, "r": 1}[horizontal] * sum(advance for _, _, advance in runs)
+    ascent, descent = font.getmetrics()
+    px = _sprite_px(font)
+    if vertical == "t":
+        plain = "".join(run for is_sprite, run, _ in runs if not is_sprite)
+        top = font.getbbox(plain, anchor="ls")[1] if plain.strip() else 0
+        baseline = y - min(top, -round(px * SPRITE_RISE))
+    else:
+        baseline = y + {"a": ascent, "m": (ascent - descent) / 2, "s": 0, "d": -descent}[vertical]
+    baseline = round(baseline)
+    for is_sprite, run, advance in runs:
+        if is_sprite:
+            image = sprite(run, px)
+            _paste(img, image, (round(x), baseline - round(px * SPRITE_RISE)))
+        else:
+            draw.text((round(x), baseline), run, fill=fill, font=font, anchor="ls")
+        x += advance
@@ -0,0 +1,212 @@
+"""Store-optimized PNG/JPEG encoding shared by the asset scripts.
+
+encode() tries the encodings a store profile allows for the requested format
+and keeps the smallest one whose quality is at or above MIN_QUALITY_DB:
+
+  - PNG: lossless (optimize or a fixed compress level, see EFFORTS), plus
+    the smallest palette PNG that passes (64, then 128, then 256 colors;
+    quantizing is the expensive part) where the profile allows 8-bit files,
+    or 256 quantized colors stored as a 24-bit PNG where it does not.
+  - JPEG: progressive, optimized, 4:4:4, walking down JPEG_QUALITIES until a
+    step falls below the threshold. The walk uses plain baseline encodes
+    (same decoded pixels, a fraction of the time) and only the chosen step
+    is encoded progressive and optimized
+
+Both searches only run on images with at most PALETTE_MAX_COLORS colors
+(our flat UI masters, which usually end up as 64-128 color palette PNGs).
+Resized screenshots and gradients have too many colors to gain from either,
+so they get one encode per format (the lossless PNG; JPEG at the first
+quality step) and no quality measurement.
+
+effort="fast" skips the search and trades size for speed: a compress_level=1
+PNG and one optimized 4:4:4 JPEG (4:2:0 smears colored text) at the first step.
+
+Quality is the worst-tile PSNR against the original: the image is split into
+QUALITY_TILE px tiles and the tile with the largest error in any one channel
+counts, so ringing around one line of text is not averaged away by a flat
+background and a shift in one channel (blue to a lighter blue) is not
+hidden by luma weighting.
+
+If even the best passing candidate is above the profile's byte budget it is
+still used (quality wins) and a warning is printed.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import io
+import math
+import os
+import sys
+
+from PIL import Image, ImageChops, ImageMath
+
+from store_assets import output_store, trace
+
+PROFILES = {
+    # App Store Connect takes RGB PNG or JPEG; 8-bit palette PNGs are fine
+    "app_store": {"lossy": True, "palette": True, "budget": 1_000_000},
+    # Google Play wants JPEG or 24-bit PNG without alpha
+    "play": {"lossy": True, "palette": False, "budget": 1_000_000},
+    # Files that are re-read by other scripts or bundled into the app build
+    "lossless": {"lossy": False, "palette": False, "budget": None},
+}
+
+# PNG encoder effort; "max" (opt-in: --effort max, --quality final) lets Pillow search filter/zlib settings
+EFFORTS = {
+    "fast": {"compress_level": 1},
+    "default": {"compress_level": 6},
+    "max": {"optimize": True},
+}
+
+MIN_QUALITY_DB = 35.0
+QUALITY_TILE = 32
+PALETTE_COLORS = (64, 128, 256)
+# Images with more colors than this skip the palette attempts and the JPEG quality walk
+PALETTE_MAX_COLORS = 4096
+JPEG_QUALITIES = (95, 90, 85, 80, 75)
+
+FORMATS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+IMAGE_EXTENSIONS = tuple(FORMATS)
+
+Encoded = namedtuple("Encoded", "data format method quality over_budget")
+
+
+def tile_mse(img, ref, tile=QUALITY_TILE):
+    """Mean squared error of img against ref per tile x tile block, in the tile's worst channel.
+
+    Returns an "F" image of the tile grid: tiles start at multiples of tile,
+    and the tiles on the right and bottom edges cover only what is left of
+    the image (a partial tile is averaged over its own pixels).
+    """
+    diff = ImageChops.difference(img.convert("RGB"), ref.convert("RGB"))
+    width, height = diff.size
+    cols, rows = -(-width // tile), -(-height // tile)
+    full_w, full_h = width // tile * tile, height // tile * tile
+    grid = None
+    for band in diff.split():
+        band = band.convert("F")
+        squared = ImageMath.lambda_eval(lambda args: args["d"] * args["d"], d=band)
+        mse = Image.new("F", (cols, rows))
+        for x0, x1, gx in ((0, full_w, 0), (full_w, width, full_w // tile)):
+            for y0, y1, gy in ((0, full_h, 0), (full_h, height, full_h // tile)):
+                if x1 > x0 and y1 > y0:
+                    size = (-(-(x1 - x0) // tile), -(-(y1 - y0) // tile))
+                    mse.paste(squared.resize(size, Image.BOX, box=(x0, y0, x1, y1)), (gx, gy))
+        grid = mse if grid is None else ImageMath.lambda_eval(lambda args: args["max"](args["a"], args["b"]),
+                                                              a=grid, b=mse)
+    return grid
+
+
+def psnr(mse):
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+@trace.traced("quality_db", "encode")
+def quality_db(img, ref):
+    """Worst-tile PSNR (dB) of img against ref; inf when identical."""
+    return psnr(tile_mse(img, ref).getextrema()[1])
+
+
+def settings(profile="app_store", effort="default"):
+    """Everything that affects encode() output, for build-cache digests."""
+    return {
+        "profile": PROFILES[profile], "effort": EFFORTS[effort], "min_quality": MIN_QUALITY_DB,
+        "tile": QUALITY_TILE, "metric": "channel_max", "palette": PALETTE_COLORS,
+        "palette_max": PALETTE_MAX_COLORS, "jpeg": JPEG_QUALITIES,
+    }
+
+
+def _save(img, fmt, **params):
+    buf = io.BytesIO()
+    img.save(buf, fmt, **params)
+    return buf.getvalue()
+
+
+def _few_colors(rgb):
+    return rgb.getcolors(PALETTE_MAX_COLORS) is not None
+
+
+def _png_candidates(img, spec, effort, min_quality):
+    png_params = EFFORTS[effort]
+    yield _save(img, "PNG", **png_params), "png", math.inf
+    if effort == "fast" or not spec["lossy"] or img.mode not in ("RGB", "L"):
+        return  # keep alpha lossless
+    rgb = img.convert("RGB")
+    if not _few_colors(rgb):
+        return  # too many colors to survive quantizing
+    if spec["palette"]:
+        for colors in PALETTE_COLORS:
+            quantized = rgb.quantize(colors, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+            quality = quality_db(quantized, rgb)
+            if quality >= min_quality:
+                yield _save(quantized, "PNG", **png_params), f"png8/{colors}", quality
+                return
+    else:
+        colors = PALETTE_COLORS[-1]
+        quantized = rgb.quantize(colors, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE).convert("RGB")
+        quality = quality_db(quantized, rgb)
+        if quality >= min_quality:
+            yield _save(quantized, "PNG", **png_params), f"png24/{colors}", quality
+
+
+def _jpeg_candidates(img, spec, effort, min_quality):
+    rgb = img.convert("RGB")
+    if effort == "fast":
+        yield _save(rgb, "JPEG", quality=JPEG_QUALITIES[0], optimize=True, subsampling=0), \
+            f"jpeg/q{JPEG_QUALITIES[0]}", None
+        return
+    if not spec["lossy"] or not _few_colors(rgb):
+        # Nothing to walk, or too many colors for a lower step to pay off: keep the first, unmeasured
+        q = JPEG_QUALITIES[0]
+        yield _save(rgb, "JPEG", quality=q, optimize=True, progressive=True, subsampling=0), f"jpeg/q{q}", None
+        return
+    qualities = JPEG_QUALITIES
+    chosen = None
+    for i, q in enumerate(qualities):
+        # Progressive and optimized Huffman coding do not change the decoded pixels
+        with Image.open(io.BytesIO(_save(rgb, "JPEG", quality=q, subsampling=0))) as decoded:
+            quality = quality_db(decoded, rgb)
+        if quality < min_quality and i > 0:
+            break
+        chosen = q, quality  # the first step is kept even below the threshold
+    q, quality = chosen
+    yield _save(rgb, "JPEG", quality=q, optimize=True, progressive=True, subsampling=0), f"jpeg/q{q}", quality
+
+
+def encode(img, fmt="PNG", profile="app_store", effort="default", min_quality=MIN_QUALITY_DB, budget=None):
+    """Smallest encoding of img allowed by profile that meets min_quality. Returns an Encoded."""
+    spec = PROFILES[profile]
+    budget = spec["budget"] if budget is None else budget
+    with trace.span("encode", "encode", format=fmt, profile=profile, size=list(img.size)):
+        if fmt == "PNG":
+            candidates = list(_png_candidates(img, spec, effort, min_quality))
+        elif fmt == "JPEG":
+            candidates = list(_jpeg_candidates(img, spec, effort, min_quality))
+        else:
+            raise ValueError(f"unsupported format: {fmt!r}")
+    data, method, quality = min(candidates, key=lambda c: len(c[0]))
+    return Encoded(data, fmt, method, quality, bool(budget) and len(data) > budget)
+
+
+def save(img, path, profile="app_store", effort="default", **kwargs):
+    """Encode img for path's extension and write it (through output_store). Returns the Encoded."""
+    fmt = FORMATS[os.path.splitext(path)[1].lower()]
+    encoded = encode(img, fmt, profile, effort, **kwargs)
+    if encoded.over_budget:
+        print(f"Warning: {path} is {len(encoded.data):,} bytes, over the {profile} budget", file=sys.stderr)
+    output_store.write(path, encoded.data)
+    return encoded
+
+
+def _save_item(item, kwargs):
+    img, path, profile = item
+    return save(img, path, profile, **kwargs)
+
+
+def save_all(items, jobs=None, **kwargs):
+    """save() every (img, path, profile) item on a process pool (jobs=1: in-process)."""
+    items = list(items)
+    jobs = min(jobs or os.cpu_count() or 1, len(items) or 1)
+    if jobs == 1:
+        return [_save_item(item, kwargs) for item in items]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_save_item, items, [kwargs] * len(items)))
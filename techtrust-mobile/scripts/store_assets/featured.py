@@ -0,0 +1,126 @@
+"""The Google Play featured graphic (1024x500), composed in memory.
+
+render() takes the decoded screenshots to mock up and the logo and returns
+an RGB image; generate-featured-graphic.py finds, decodes and saves them
+(MOCKUP_NAMES in the screenshot folder, LOGO_PATH).
+The layout is in pixels of the 1024x500 canvas, so every quality level keeps
+its size (see quality.py).
+"""
+import os
+
+from PIL import ImageDraw
+
+from store_assets import emoji, frames, quality
+from store_assets.backgrounds import linear_gradient, overlay_ellipses
+from store_assets.build_cache import MOBILE_DIR
+from store_assets.fonts import get_font
+
+LOGO_PATH = os.path.join(MOBILE_DIR, "assets", "images", "logo_icon_blue.png")
+# The screenshots mocked up on the phones, left to right
+MOCKUP_NAMES = ["01_find_services.png", "03_instant_quotes.png", "04_dashboard.png"]
+
+# Brand colors
+DARK_NAVY = (18, 32, 64)       # #122040
+MEDIUM_BLUE = (30, 58, 110)    # #1e3a6e
+ACCENT_BLUE = (45, 100, 180)   # #2d64b4
+WHITE = (255, 255, 255)
+LIGHT_GRAY = (200, 210, 225)
+
+WIDTH, HEIGHT = 1024, 500
+
+
+# Subtle circles for visual interest: (bbox, RGBA fill)
+DECOR_CIRCLES = [
+    ((WIDTH - 350, -100, WIDTH + 100, 350), (255, 255, 255, 8)),
+    ((WIDTH - 250, 150, WIDTH + 50, 450), (255, 255, 255, 5)),
+    ((-150, 200, 200, 550), (255, 255, 255, 5)),
+]
+
+
+def create_gradient(width, height, color_start, color_end):
+    """Create a horizontal gradient background."""
+    return linear_gradient((width, height), [color_start, color_end])
+
+
+def add_phone_mockup(canvas, screenshot, x, y, phone_height, q=None):
+    """Add a screenshot in a phone-like frame."""
+    return frames.paste_framed(canvas, screenshot, x, y, phone_height, device="phone", q=q)
+
+
+def constants():
+    """The layout constants, for build-cache digests."""
+    return {
+        "size": (WIDTH, HEIGHT), "DARK_NAVY": DARK_NAVY, "MEDIUM_BLUE": MEDIUM_BLUE,
+        "ACCENT_BLUE": ACCENT_BLUE, "WHITE": WHITE, "LIGHT_GRAY": LIGHT_GRAY,
+        "DECOR_CIRCLES": DECOR_CIRCLES, "device": frames.DEVICES["phone"],
+    }
+
+
+def render(screenshots, logo=None, q=None):
+    """Compose the featured graphic and return it as an RGB image.
+
+    screenshots: up to three images to mock up, left to right (None leaves a
+    gap); logo: the brand logo image, or None to leave it out.
+    """
+    q = quality.get(q)
+    # 1. Create gradient background
+    canvas = create_gradient(WIDTH, HEIGHT, DARK_NAVY, MEDIUM_BLUE).convert("RGBA")
+
+    # 2. Add subtle decorative elements
+    overlay_ellipses(canvas, DECOR_CIRCLES)
+
+    # 3. Add logo
+    if logo is not None:
+        logo_size = 80
+        logo = quality.resize(q, logo, (logo_size, logo_size), "RGBA")
+        canvas.paste(logo, (60, 60), logo)
+
+    # 4. Add text
+    draw = ImageDraw.Draw(canvas)
+
+    # Company name
+    font_title = get_font(42, bold=True)
+    font_subtitle = get_font(22)
+    font_tagline = get_font(18)
+    font_features = get_font(16)
+
+    text_x = 155
+
+    # "TechTrust" title
+    draw.text((text_x, 65), "TechTrust", fill=WHITE, font=font_title)
+    draw.text((text_x, 115), "AutoSolutions", fill=ACCENT_BLUE, font=font_subtitle)
+
+    # Tagline
+    draw.text((60, 170), "Driven by Technology. Trusted by You.", fill=LIGHT_GRAY, font=font_tagline)
+
+    # Separator line
+    draw.line([(60, 210), (380, 210)], fill=ACCENT_BLUE, width=2)
+
+    # Feature bullets (safe language only)
+    features = [
+        "🔧  Auto Repair & Maintenance Services",
+        "📋  Compare Quotes from Verified Providers",
+        "💬  Chat Directly with Mechanics",
+        "💳  Secure In-App Payments",
+    ]
+
+    y_pos = 230
+    for feat in features:
+        emoji.draw_text(canvas, draw, (60, y_pos), feat, fill=WHITE, font=font_features)
+        y_pos += 32
+
+    # Bottom tagline
+    draw.text((60, 440), "Find Verified Mechanics Near You", fill=LIGHT_GRAY, font=font_tagline)
+
+    # 5. Add phone mockups on the right side
+    phone_height = 380
+    start_x = 560
+    spacing = 155
+
+    for i, screenshot in enumerate(screenshots):
+        if screenshot is not None:
+            x = start_x + (i * spacing)
+            y = 60 + (i * 15)  # Slight stagger
+            add_phone_mockup(canvas, screenshot, x, y, phone_height, q)
+
+    return canvas.convert("RGB")
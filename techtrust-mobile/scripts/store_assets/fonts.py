@@ -0,0 +1,179 @@
+"""Memoized, platform-aware font resolver for the store-asset scripts.
+
+`get_font(size, bold)` is called hundreds of times per render, so loaded
+FreeTypeFont objects are cached by (family, size, weight) and candidate
+paths that failed once are never tried again. macOS and Windows use fixed
+system paths; on Linux the font directories are scanned once into an index
+that is cached on disk under .asset-cache/.
+"""
+import json
+import os
+import sys
+
+from PIL import ImageFont
+
+from store_assets.build_cache import CACHE_DIR
+
+FONT_INDEX_PATH = os.path.join(CACHE_DIR, "font-index.json")
+
+# Fixed candidates per platform, in preference order
+MAC_FONTS = {
+    ("sans", "regular"): [
+        "/System/Library/Fonts/Helvetica.ttc",
+        "/System/Library/Fonts/SFNSDisplay.ttf",
+        "/System/Library/Fonts/SFCompact.ttf",
+        "/Library/Fonts/Arial.ttf",
+        "/System/Library/Fonts/Supplemental/Arial.ttf",
+    ],
+    ("sans", "bold"): [
+        "/System/Library/Fonts/Helvetica.ttc",
+        "/System/Library/Fonts/SFNSDisplay.ttf",
+        "/System/Library/Fonts/SFCompact.ttf",
+        "/Library/Fonts/Arial.ttf",
+        "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    ],
+    ("emoji", "regular"): ["/System/Library/Fonts/Apple Color Emoji.ttc"],
+}
+WINDOWS_FONTS = {
+    ("sans", "regular"): [r"C:\Windows\Fonts\arial.ttf", r"C:\Windows\Fonts\segoeui.ttf"],
+    ("sans", "bold"): [r"C:\Windows\Fonts\arialbd.ttf", r"C:\Windows\Fonts\segoeuib.ttf"],
+    ("emoji", "regular"): [r"C:\Windows\Fonts\seguiemj.ttf"],
+}
+# Linux: normalized file stems looked up in the font index, in preference order
+LINUX_FONTS = {
+    ("sans", "regular"): [
+        "helvetica", "arial", "liberationsansregular", "dejavusans", "notosansregular", "freesans",
+    ],
+    ("sans", "bold"): [
+        "helveticabold", "arialbold", "arialbd", "liberationsansbold", "dejavusansbold",
+        "notosansbold", "freesansbold",
+    ],
+    ("emoji", "regular"): ["notocoloremoji", "twemojimozilla", "joypixels"],
+}
+LINUX_FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+]
+FONT_EXTENSIONS = (".ttf", ".ttc", ".otf")
+
+_fonts = {}           # (family, size, weight) -> FreeTypeFont
+_resolved = {}        # (family, weight) -> path or None
+_missing = set()      # paths that do not exist or failed to load
+_font_index = None
+
+
+def _normalize(name):
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+
+def _scan_font_dirs(dirs):
+    """Walk the font directories once. Returns ({normalized stem: path}, {dir: mtime})."""
+    fonts = {}
+    mtimes = {}
+    for root_dir in dirs:
+        for dirpath, _dirnames, filenames in os.walk(root_dir):
+            mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+            for fname in sorted(filenames):
+                stem, ext = os.path.splitext(fname)
+                if ext.lower() in FONT_EXTENSIONS:
+                    fonts.setdefault(_normalize(stem), os.path.join(dirpath, fname))
+    return fonts, mtimes
+
+
+def _index_is_current(mtimes):
+    for dirpath, mtime in mtimes.items():
+        try:
+            if os.stat(dirpath).st_mtime_ns != mtime:
+                return False
+        except FileNotFoundError:
+            return False
+    # A font directory that did not exist at scan time may have appeared since
+    return all(d in mtimes or not os.path.isdir(d) for d in LINUX_FONT_DIRS)
+
+
+def font_index():
+    """Normalized font file stem -> path, scanned once and cached on disk."""
+    global _font_index
+    if _font_index is not None:
+        return _font_index
+    try:
+        with open(FONT_INDEX_PATH) as f:
+            cached = json.load(f)
+        if _index_is_current(cached["dirs"]):
+            _font_index = cached["fonts"]
+            return _font_index
+    except (FileNotFoundError, KeyError, ValueError):
+        pass
+
+    fonts, mtimes = _scan_font_dirs(LINUX_FONT_DIRS)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(FONT_INDEX_PATH, "w") as f:
+            json.dump({"dirs": mtimes, "fonts": fonts}, f, indent=2, sort_keys=True)
+    except OSError:
+        pass  # read-only checkout: keep the in-memory index only
+    _font_index = fonts
+    return _font_index
+
+
+def candidate_paths(family="sans", weight="regular"):
+    """Font files to try for (family, weight) on this platform, in preference order."""
+    key = (family, weight)
+    if sys.platform == "darwin":
+        return list(MAC_FONTS.get(key, []))
+    if sys.platform.startswith("win"):
+        return list(WINDOWS_FONTS.get(key, []))
+    index = font_index()
+    return [index[name] for name in LINUX_FONTS.get(key, []) if name in index]
+
+
+def resolve_font_path(family="sans", weight="regular"):
+    """First loadable candidate for (family, weight), or None for Pillow's default font."""
+    key = (family, weight)
+    if key in _resolved:
+        return _resolved[key]
+    path = None
+    for candidate in candidate_paths(family, weight):
+        if candidate in _missing:
+            continue
+        if not os.path.exists(candidate):
+            _missing.add(candidate)
+            continue
+        try:
+            ImageFont.truetype(candidate, 12)
+        except OSError as exc:
+            print(f"warning: cannot load font {candidate}: {exc}", file=sys.stderr)
+            _missing.add(candidate)
+            continue
+        path = candidate
+        break
+    if path is None:
+        print(f"warning: no {weight} {family} font found, using Pillow's default font", file=sys.stderr)
+    _resolved[key] = path
+    return path
+
+
+def get_font(size, bold=False, family="sans"):
+    """Cached FreeTypeFont for (family, size, weight)."""
+    weight = "bold" if bold else "regular"
+    key = (family, size, weight)
+    font = _fonts.get(key)
+    if font is None:
+        path = resolve_font_path(family, weight)
+        if path is None:
+            try:
+                font = ImageFont.load_default(size)
+            except TypeError:  # Pillow < 10.1 has no sized default font
+                font = ImageFont.load_default()
+        else:
+            font = ImageFont.truetype(path, size)
+        _fonts[key] = font
+    return font
+
+
+def resolved_font_files(family="sans"):
+    """Font files the renders will actually use, for build-cache digests."""
+    paths = {resolve_font_path(family, weight) for weight in ("regular", "bold")}
+    return sorted(p for p in paths if p)
@@ -0,0 +1,128 @@
+"""Device frames and drop shadows for screenshot mockups.
+
+The frame body and its blurred shadow only depend on the device and the
+frame size, so they are rendered once per (device, width, height) and
+reused for every screenshot with the same aspect ratio. Framing a batch of
+captures costs one GaussianBlur per distinct size instead of one per image.
+
+The functions take a render quality (store_assets/quality.py): drafts skip
+the shadow and resample cheaply, final renders draw the frame body at 2x.
+"""
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from store_assets import quality, trace
+
+DEVICES = {
+    # The look used by the featured graphic mockups
+    "phone": {
+        "screen_scale": 0.88,        # screen height / frame height
+        "screen_top": 0.06,          # screen y offset / frame height
+        "bezel": 8,                  # left/right bezel in px
+        "radius": 18,
+        "body": (20, 20, 25, 255),
+        "outline": (60, 60, 70, 255),
+        "outline_width": 2,
+        "shadow_pad": 10,
+        "shadow_offset": (0, 5),     # relative to (x - pad, y - pad)
+        "shadow_color": (0, 0, 0, 80),
+        "shadow_blur": 8,
+    },
+    "tablet": {
+        "screen_scale": 0.92,
+        "screen_top": 0.04,
+        "bezel": 24,
+        "radius": 36,
+        "body": (20, 20, 25, 255),
+        "outline": (60, 60, 70, 255),
+        "outline_width": 3,
+        "shadow_pad": 16,
+        "shadow_offset": (0, 8),
+        "shadow_color": (0, 0, 0, 80),
+        "shadow_blur": 12,
+    },
+}
+
+
+def frame_geometry(device, height, aspect):
+    """(frame size, screen box) for a frame `height` px tall around a screen of `aspect` (w/h)."""
+    spec = DEVICES[device]
+    screen_h = int(height * spec["screen_scale"])
+    screen_w = int(screen_h * aspect)
+    frame_w = screen_w + 2 * spec["bezel"]
+    screen_x = spec["bezel"]
+    screen_y = int(height * spec["screen_top"])
+    return (frame_w, height), (screen_x, screen_y, screen_x + screen_w, screen_y + screen_h)
+
+
+@lru_cache(maxsize=64)
+def frame_template(device, width, height, supersample=1):
+    """Empty device body for a width x height frame (RGBA), drawn at supersample x and reduced.
+
+    Cached; copy before drawing on it.
+    """
+    spec = DEVICES[device]
+    s = supersample
+    frame = Image.new("RGBA", (width * s, height * s), (0, 0, 0, 0))
+    ImageDraw.Draw(frame).rounded_rectangle(
+        [0, 0, width * s - 1, height * s - 1],
+        radius=spec["radius"] * s,
+        fill=spec["body"],
+        outline=spec["outline"],
+        width=spec["outline_width"] * s,
+    )
+    return frame.reduce(s) if s > 1 else frame
+
+
+@lru_cache(maxsize=64)
+def shadow_template(device, width, height):
+    """Blurred drop shadow for a width x height frame (RGBA, padded on every side)."""
+    spec = DEVICES[device]
+    pad = spec["shadow_pad"]
+    shadow = Image.new("RGBA", (width + 2 * pad, height + 2 * pad), (0, 0, 0, 0))
+    ImageDraw.Draw(shadow).rounded_rectangle(
+        [pad, pad, width + pad - 1, height + pad - 1],
+        radius=spec["radius"],
+        fill=spec["shadow_color"],
+    )
+    return shadow.filter(ImageFilter.GaussianBlur(spec["shadow_blur"]))
+
+
+@trace.traced("frame_screenshot", "frame")
+def frame_screenshot(screenshot, height, device="phone", q=None):
+    """Screenshot inside a device frame `height` px tall (RGBA, no shadow)."""
+    q = quality.get(q)
+    (frame_w, frame_h), (sx0, sy0, sx1, sy1) = frame_geometry(device, height, screenshot.width / screenshot.height)
+    framed = frame_template(device, frame_w, frame_h, q.supersample).copy()
+    framed.paste(quality.resize(q, screenshot, (sx1 - sx0, sy1 - sy0), "RGBA"), (sx0, sy0))
+    return framed
+
+
+def paste_framed(canvas, screenshot, x, y, height, device="phone", shadow=True, q=None):
+    """Frame `screenshot` and paste it (with its shadow) onto canvas at (x, y). Returns the frame width."""
+    q = quality.get(q)
+    framed = frame_screenshot(screenshot, height, device, q)
+    if shadow and q.shadows:
+        spec = DEVICES[device]
+        pad = spec["shadow_pad"]
+        dx, dy = spec["shadow_offset"]
+        shadow_img = shadow_template(device, framed.width, framed.height)
+        canvas.paste(shadow_img, (x - pad + dx, y - pad + dy), shadow_img)
+    canvas.paste(framed, (x, y), framed)
+    return framed.width
+
+
+def framed_canvas(screenshot, size, device="phone", background=(255, 255, 255), fill_ratio=0.9, q=None):
+    """Center a framed screenshot on a size canvas, as large as fits within fill_ratio of it."""
+    width, height = size
+    aspect = screenshot.width / screenshot.height
+    frame_h = int(height * fill_ratio)
+    (frame_w, _), _ = frame_geometry(device, frame_h, aspect)
+    if frame_w > width * fill_ratio:
+        # Too wide for the canvas (e.g. a phone capture on a landscape target): fit by width
+        frame_h = int(frame_h * width * fill_ratio / frame_w)
+        (frame_w, _), _ = frame_geometry(device, frame_h, aspect)
+    canvas = Image.new("RGBA", size, tuple(background[:3]) + (255,))
+    paste_framed(canvas, screenshot, (width - frame_w) // 2, (height - frame_h) // 2, frame_h, device, q=q)
+    return canvas.convert("RGB")
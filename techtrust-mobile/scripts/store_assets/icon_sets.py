@@ -0,0 +1,237 @@
+"""The app icons, the icon matrix and the downscale pyramid it is resampled from.
+
+ICONS are the three Expo assets (app icon, adaptive icon, splash), each the
+logo fitted onto a canvas by render_icon(). IconSources builds everything
+else from one logo; it only computes, generate-icons.py does the writing.
+A logo smaller than the largest icon would be upscaled into a blurry 1024 px
+store icon, so IconSources refuses it unless told to allow the upscale.
+
+Every icon is cut from one of a few 1024 px masters (see MASTERS), through a
+Pyramid: the master is halved with LANCZOS down to 16 px once, and each size
+is resampled from the nearest level at or above it, so a 40 px icon comes
+from the 64 px level instead of a 25x downscale of the master.
+
+icon_matrix() lists every output, relative to ICON_SET_DIR:
+
+    ios/AppIcon.appiconset/   iPhone, iPad and App Store sizes + Contents.json
+    android/mipmap-*/         legacy, round and adaptive foreground/background
+                              layers per density, mipmap-anydpi-v26 XML
+    android/playstore-icon.png
+    web/                      favicon.ico (16/32/48), favicon PNGs, apple touch
+                              icon, manifest icons (incl. maskable) + manifest-icons.json
+"""
+import io
+import json
+
+from PIL import Image, ImageDraw
+
+from store_assets import registry, trace
+
+# (output, canvas size, logo target size, background, output mode, description)
+ICONS = [
+    # iOS App Store Icon (1024x1024, no transparency)
+    ("assets/icon.png", (1024, 1024), 820, (255, 255, 255, 255), "RGB", "1024x1024, no transparency"),
+    # Android Adaptive Icon (1024x1024, transparent bg)
+    ("assets/adaptive-icon.png", (1024, 1024), 680, (255, 255, 255, 0), "RGBA", "1024x1024, transparent bg"),
+    # Splash Icon (centered on white)
+    ("assets/splash-icon.png", (1284, 2778), 600, (255, 255, 255, 255), "RGB", "1284x2778"),
+]
+
+ICON_SET_DIR = "assets/icons"
+MASTER_SIZE = 1024
+BACKGROUND = (255, 255, 255)  # matches android.adaptiveIcon.backgroundColor in app.json
+
+# name -> (logo size on the MASTER_SIZE canvas, background RGBA, mode)
+MASTERS = {
+    "icon": (820, BACKGROUND + (255,), "RGB"),
+    # Adaptive foreground: the logo inside the 66/108 safe zone, transparent around it
+    "foreground": (680, BACKGROUND + (0,), "RGBA"),
+    # Maskable web icon: the logo inside the 80% safe circle
+    "maskable": (580, BACKGROUND + (255,), "RGB"),
+}
+
+# (point size, scale, idioms)
+IOS_ICONS = [
+    (20, 1, ["ipad"]), (20, 2, ["iphone", "ipad"]), (20, 3, ["iphone"]),
+    (29, 1, ["ipad"]), (29, 2, ["iphone", "ipad"]), (29, 3, ["iphone"]),
+    (40, 1, ["ipad"]), (40, 2, ["iphone", "ipad"]), (40, 3, ["iphone"]),
+    (60, 2, ["iphone"]), (60, 3, ["iphone"]),
+    (76, 1, ["ipad"]), (76, 2, ["ipad"]),
+    (83.5, 2, ["ipad"]),
+    (1024, 1, ["ios-marketing"]),
+]
+
+ANDROID_DENSITIES = {"mdpi": 1, "hdpi": 1.5, "xhdpi": 2, "xxhdpi": 3, "xxxhdpi": 4}
+ANDROID_LEGACY_DP = 48
+ANDROID_ADAPTIVE_DP = 108
+PLAY_STORE_ICON = 512
+
+FAVICON_SIZES = (16, 32, 48)
+WEB_ICONS = [("favicon-16.png", "icon", 16), ("favicon-32.png", "icon", 32),
+             ("apple-touch-icon.png", "icon", 180), ("icon-192.png", "icon", 192),
+             ("icon-512.png", "icon", 512), ("icon-maskable-512.png", "maskable", 512)]
+
+ADAPTIVE_XML = """<?xml version="1.0" encoding="utf-8"?>
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@mipmap/ic_launcher_background"/>
+    <foreground android:drawable="@mipmap/ic_launcher_foreground"/>
+</adaptive-icon>
+"""
+
+
+def render_icon(icon, canvas_size, target_size, background, mode):
+    """Fit the logo into target_size and center it on a canvas_size background."""
+    canvas = Image.new("RGBA", canvas_size, background)
+    ratio = min(target_size / icon.width, target_size / icon.height)
+    new_w = int(icon.width * ratio)
+    new_h = int(icon.height * ratio)
+    resized = registry.variant(icon, (new_w, new_h), resample=Image.LANCZOS)
+    x = (canvas_size[0] - new_w) // 2
+    y = (canvas_size[1] - new_h) // 2
+    canvas.paste(resized, (x, y), resized)
+    return canvas.convert(mode)
+
+
+def load_logo(source):
+    """The logo as RGBA, from a path or encoded bytes; an SVG master is rasterized at MASTER_SIZE."""
+    data = None if isinstance(source, str) else bytes(source)
+    if (source.lower().endswith(".svg") if data is None else data.lstrip()[:5] in (b"<?xml", b"<svg ")):
+        try:
+            import cairosvg
+        except ImportError:  # only needed for SVG masters
+            raise RuntimeError("SVG masters need cairosvg (pip install cairosvg)") from None
+        png = cairosvg.svg2png(url=source, output_width=MASTER_SIZE) if data is None \
+            else cairosvg.svg2png(bytestring=data, output_width=MASTER_SIZE)
+        return Image.open(io.BytesIO(png)).convert("RGBA")
+    if data is None:
+        return registry.load(source, "RGBA")
+    with Image.open(io.BytesIO(data)) as img:
+        return img.convert("RGBA")
+
+
+def logo_upscale(logo):
+    """How much the largest icon or master enlarges logo (<= 1: not at all)."""
+    largest = max([spec[0] for spec in MASTERS.values()] + [icon[2] for icon in ICONS])
+    return largest / max(logo.size), largest
+
+
+class Pyramid:
+    """Halving levels of a square master; each size is resampled from the nearest level at or above it."""
+
+    def __init__(self, master, min_size=16):
+        self.levels = [master]
+        while self.levels[-1].width // 2 >= min_size:
+            level = self.levels[-1]
+            self.levels.append(level.resize((level.width // 2, level.height // 2), Image.LANCZOS))
+        self._sizes = {}
+
+    def get(self, size):
+        image = self._sizes.get(size)
+        if image is None:
+            level = min((l for l in self.levels if l.width >= size), key=lambda l: l.width, default=self.levels[0])
+            image = self._sizes[size] = level if level.width == size else level.resize((size, size), Image.LANCZOS)
+        return image
+
+
+class IconSources:
+    """Logo, masters and pyramids, each built on first use.
+
+    logo is an RGBA image, or a path / encoded bytes handed to load_logo()
+    when an icon first needs it. A logo smaller than the largest icon raises
+    ValueError there, unless allow_upscale.
+    """
+
+    def __init__(self, logo, allow_upscale=False):
+        self._source = None if isinstance(logo, Image.Image) else logo
+        self._logo = None
+        self._given = logo if self._source is None else None
+        self.allow_upscale = allow_upscale
+        self._masters = {}
+        self._pyramids = {}
+
+    @property
+    def logo(self):
+        if self._logo is None:
+            logo = self._given if self._source is None else load_logo(self._source)
+            upscale, largest = logo_upscale(logo)
+            if upscale > 1 and not self.allow_upscale:
+                raise ValueError(f"the logo is {logo.width}x{logo.height} px, but the largest icon needs {largest} px "
+                                 f"({upscale:.1f}x upscale); use a >= {largest} px or SVG logo")
+            self._logo = logo
+        return self._logo
+
+    def master(self, name):
+        if name not in self._masters:
+            if name == "round":
+                self._masters[name] = round_icon(self.master("icon"))
+            else:
+                target_size, background, mode = MASTERS[name]
+                self._masters[name] = render_icon(self.logo, (MASTER_SIZE, MASTER_SIZE), target_size, background, mode)
+        return self._masters[name]
+
+    def icon(self, source, px):
+        if source == "background":
+            return Image.new("RGB", (px, px), BACKGROUND)
+        if source not in self._pyramids:
+            with trace.stage("pyramid", master=source):
+                self._pyramids[source] = Pyramid(self.master(source))
+        return self._pyramids[source].get(px)
+
+    def favicon(self):
+        """favicon.ico bytes; its frames come from the pyramid (not Pillow's own thumbnails)."""
+        frames = [self.icon("icon", px) for px in FAVICON_SIZES]
+        buf = io.BytesIO()
+        frames[-1].save(buf, "ICO", sizes=[f.size for f in frames], append_images=frames[:-1])
+        return buf.getvalue()
+
+
+def round_icon(master):
+    """The opaque icon master cut to a circle (Android's legacy round launcher icon)."""
+    mask = Image.new("L", master.size, 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, master.width - 1, master.height - 1), fill=255)
+    rounded = master.convert("RGBA")
+    rounded.putalpha(mask)
+    return rounded
+
+
+def _ios_name(points, scale):
+    return f"Icon-{points:g}@{scale}x.png"
+
+
+def icon_matrix():
+    """[(path, source, px)] for every raster icon; source is a MASTERS name, "round" or "background"."""
+    icons = {}
+    for points, scale, _ in IOS_ICONS:
+        icons[f"ios/AppIcon.appiconset/{_ios_name(points, scale)}"] = ("icon", round(points * scale))
+    for density, factor in ANDROID_DENSITIES.items():
+        folder = f"android/mipmap-{density}"
+        legacy, adaptive = round(ANDROID_LEGACY_DP * factor), round(ANDROID_ADAPTIVE_DP * factor)
+        icons[f"{folder}/ic_launcher.png"] = ("icon", legacy)
+        icons[f"{folder}/ic_launcher_round.png"] = ("round", legacy)
+        icons[f"{folder}/ic_launcher_foreground.png"] = ("foreground", adaptive)
+        icons[f"{folder}/ic_launcher_background.png"] = ("background", adaptive)
+    icons["android/playstore-icon.png"] = ("icon", PLAY_STORE_ICON)
+    for name, source, px in WEB_ICONS:
+        icons[f"web/{name}"] = (source, px)
+    return [(path, source, px) for path, (source, px) in icons.items()]
+
+
+def metadata_files():
+    """path -> text of the asset catalog, adaptive icon XML and web manifest entries."""
+    contents = {
+        "images": [
+            {"size": f"{points:g}x{points:g}", "idiom": idiom, "filename": _ios_name(points, scale), "scale": f"{scale}x"}
+            for points, scale, idioms in IOS_ICONS for idiom in idioms
+        ],
+        "info": {"version": 1, "author": "xcode"},
+    }
+    manifest = {"icons": [
+        dict({"src": name, "sizes": f"{px}x{px}", "type": "image/png"}, **({"purpose": "maskable"} if source == "maskable" else {}))
+        for name, source, px in WEB_ICONS if px >= 192
+    ]}
+    return {
+        "ios/AppIcon.appiconset/Contents.json": json.dumps(contents, indent=2) + "\n",
+        "android/mipmap-anydpi-v26/ic_launcher.xml": ADAPTIVE_XML,
+        "android/mipmap-anydpi-v26/ic_launcher_round.xml": ADAPTIVE_XML,
+        "web/manifest-icons.json": json.dumps(manifest, indent=2) + "\n",
+    }
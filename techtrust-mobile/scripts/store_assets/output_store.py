@@ -0,0 +1,220 @@
+"""Content-addressed store for the encoded outputs.
+
+encode.save() writes through write(). By default an output is a plain file,
+replaced atomically (never opened for writing, so whatever was at the path
+before is left alone) and not rewritten when its bytes are unchanged.
+
+Linking is opt-in: with ASSET_OUTPUT_STORE=1, and by default for outputs
+under .asset-cache/ (drafts), write() stores the file in
+.asset-cache/objects/ under the sha256 of its bytes and makes the output
+path a hardlink to that object (a copy where hardlinks are not possible).
+Identical outputs in several folders then share one file in the working
+tree. That saves local disk only (git stores identical blobs once anyway),
+and the objects are read-only and shared, so a tool that edits an output in
+place fails or changes every folder linked to it; tracked outputs
+(assets/, store-screenshots/) are therefore plain files unless asked for.
+ASSET_OUTPUT_STORE=0 writes plain files everywhere. Keying by bytes means a
+new encoding of the same pixels (another effort level, a changed encoder)
+is a new object and reaches the output; image_key() compares decoded pixels
+for the tools in output-store.py. An object whose link count dropped to 1 is
+no longer used by any output and gc() removes it.
+
+Every write is also appended to a per-run log (one run spans the process
+that started it, its workers and subprocesses, like trace.py), recording
+whether the path is new, changed or unchanged. The process that started the
+run prints a one-line summary at exit; output-store.py prints the details.
+Importing this module does nothing: a script calls start_run() before it
+starts workers, and otherwise the first write starts the run.
+"""
+import atexit
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+
+from PIL import Image
+
+from store_assets.build_cache import CACHE_DIR, MOBILE_DIR
+
+STORE_DIR = os.path.join(CACHE_DIR, "objects")
+RUNS_DIR = os.path.join(CACHE_DIR, "runs")
+RUN_ENV = "ASSET_RUN_ID"
+KEEP_RUNS = 20
+# ASSET_OUTPUT_STORE=1 links every output, 0 none; unset: only outputs under CACHE_DIR
+linking = {"1": True, "0": False}.get(os.environ.get("ASSET_OUTPUT_STORE"))
+
+
+def start_run():
+    """Start a run owned by this process unless one is already going; returns its id.
+
+    Workers and subprocesses started afterwards inherit it through RUN_ENV.
+    """
+    if RUN_ENV not in os.environ:
+        os.environ[RUN_ENV] = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        atexit.register(_summary)
+    return os.environ[RUN_ENV]
+
+
+def data_key(data):
+    """sha256 of the encoded bytes: the key of the object holding them."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def image_key(data):
+    """sha256 of the decoded image in data (format, mode, size, ICC profile and pixels)."""
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        h = hashlib.sha256(f"{img.format}:{img.mode}:{img.width}x{img.height}:".encode())
+        h.update(img.info.get("icc_profile") or b"")
+        if img.mode == "P":
+            h.update(bytes(img.getpalette() or []))
+            img = img.convert("RGBA")
+        h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def object_path(key, ext):
+    return os.path.join(STORE_DIR, key[:2], key + ext.lower())
+
+
+def rel_path(path):
+    """path relative to techtrust-mobile/ when it is inside it, for logs and reports."""
+    path = os.path.abspath(path)
+    return os.path.relpath(path, MOBILE_DIR) if path.startswith(MOBILE_DIR + os.sep) else path
+
+
+def _materialize(obj, path):
+    """Point path at obj: a hardlink where possible, a copy otherwise (replacing path atomically)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.link(obj, tmp)
+    except OSError:  # other filesystem, or no hardlinks
+        shutil.copyfile(obj, tmp)
+    os.replace(tmp, path)
+
+
+def _status(path, obj):
+    if not os.path.exists(path):
+        return "new"
+    return "unchanged" if os.path.samefile(path, obj) else "changed"
+
+
+def put(path, data):
+    """Store data (an encoded output) and link path to it. Returns (key, status)."""
+    key = data_key(data)
+    obj = object_path(key, os.path.splitext(path)[1])
+    if not os.path.exists(obj):
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        tmp = f"{obj}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, obj)
+    status = _status(path, obj)
+    if status != "unchanged":
+        _materialize(obj, path)
+    _log(path, key, status)
+    return key, status
+
+
+def links(path):
+    """True when write() links path to a stored object instead of writing a plain file."""
+    if linking is not None:
+        return linking
+    return os.path.abspath(path).startswith(os.path.abspath(CACHE_DIR) + os.sep)
+
+
+def write(path, data):
+    """Write an encoded output, as a plain file or through the store (see links()). Returns (key, status)."""
+    if links(path):
+        return put(path, data)
+    key = data_key(data)
+    status = "new"
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            status = "unchanged" if data_key(f.read()) == key else "changed"
+    if status != "unchanged" or os.stat(path).st_nlink > 1:
+        # Never open an existing path for writing: it may be a link to a stored object
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    _log(path, key, status)
+    return key, status
+
+
+# --- run log --------------------------------------------------------------
+
+def _log(path, key, status):
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    line = json.dumps({"path": rel_path(path), "key": key, "status": status}) + "\n"
+    # One short O_APPEND write per record, so concurrent processes do not interleave
+    with open(os.path.join(RUNS_DIR, start_run() + ".jsonl"), "a") as f:
+        f.write(line)
+
+
+def run_records(run_id=None):
+    """Records of a run (default: the latest one), last write per path wins."""
+    if run_id is None:
+        runs = sorted(os.listdir(RUNS_DIR), key=lambda f: os.path.getmtime(os.path.join(RUNS_DIR, f))) \
+            if os.path.isdir(RUNS_DIR) else []
+        if not runs:
+            return {}
+        run_id = os.path.splitext(runs[-1])[0]
+    records = {}
+    with open(os.path.join(RUNS_DIR, run_id + ".jsonl")) as f:
+        for line in f:
+            record = json.loads(line)
+            records[record["path"]] = record
+    return records
+
+
+def _summary():
+    run_id = os.environ.get(RUN_ENV)
+    if not run_id or not os.path.exists(os.path.join(RUNS_DIR, run_id + ".jsonl")):
+        return
+    counts = {}
+    for record in run_records(run_id).values():
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+    parts = ", ".join(f"{counts.get(s, 0)} {s}" for s in ("changed", "new", "unchanged"))
+    print(f"Output store: {parts} (details: python scripts/output-store.py report)", file=sys.stderr)
+
+
+# --- maintenance ----------------------------------------------------------
+
+def file_keys(paths):
+    """path -> image key (decoded pixels); paths linked to one object are decoded once."""
+    by_inode = {}
+    keys = {}
+    for path in paths:
+        st = os.stat(path)
+        key = by_inode.get((st.st_dev, st.st_ino))
+        if key is None:
+            with open(path, "rb") as f:
+                key = by_inode[st.st_dev, st.st_ino] = image_key(f.read())
+        keys[path] = key
+    return keys
+
+
+def gc(keep_runs=KEEP_RUNS):
+    """Delete objects no output links to any more, and all but the last keep_runs run logs.
+
+    Returns (objects, bytes) freed.
+    """
+    if os.path.isdir(RUNS_DIR):
+        runs = sorted((os.path.join(RUNS_DIR, f) for f in os.listdir(RUNS_DIR)), key=os.path.getmtime)
+        for run in runs[:-keep_runs]:
+            os.remove(run)
+    freed = count = 0
+    for dirpath, _, files in os.walk(STORE_DIR):
+        for fname in files:
+            obj = os.path.join(dirpath, fname)
+            st = os.stat(obj)
+            if st.st_nlink == 1 or fname.endswith(".tmp"):
+                os.remove(obj)
+                freed += st.st_size
+                count += 1
+    return count, freed
@@ -0,0 +1,201 @@
+"""Streaming screenshot pipeline: render -> resize / frame -> encode.
+
+The stages are generators handing PIL images to each other in memory, so a
+store-size screenshot is rendered once and encoded once, without writing the
+1290x2796 master to disk and decoding it again. Masters are only written
+when a "master" target asks for them.
+
+    work = plan(...)                      # (scene, locale, [(Target, digest)]) per stale screenshot
+    images = render_outputs(work, ...)    # ((Target, digest), image) per output
+    for (target, digest), seconds in encode_outputs(images, jobs): ...
+
+Store sizes with the master's aspect ratio (see resampled()) are resized
+from the master; the others (5.5", iPads) are "native" targets drawn at
+their own size, like generate-screenshots.py --sizes, so nothing is
+stretched. The locale-independent layer is drawn once per (scene, size).
+
+Only the encode stage runs on a process pool; it keeps at most 2 x jobs
+images in flight, so memory stays bounded however many targets there are.
+
+Every stage takes the render quality (store_assets/quality.py, default
+normal): target sizes, resampling, shadows and encoding follow it, and
+masters are drawn at its render size and finished down to the output size.
+"""
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import inspect
+import os
+import time
+
+
+from store_assets import emoji, encode, frames, quality, scenes, text_layout, trace
+from store_assets.build_cache import input_digest
+from store_assets.fonts import resolved_font_files
+
+# kind: "master", "resize" or "frame"; outputs: PNG path (+ JPEG path)
+Target = namedtuple("Target", "kind size_name size outputs")
+
+PROFILES = {"master": "lossless", "resize": "app_store", "native": "app_store", "frame": "app_store"}
+# Store sizes within this relative difference of the master's aspect ratio are resized from it
+ASPECT_TOLERANCE = 0.005
+
+
+def resampled(size):
+    """True when a store size is close enough to the master's aspect ratio to be resized from it."""
+    return abs(size[0] * scenes.H / (size[1] * scenes.W) - 1) <= ASPECT_TOLERANCE
+
+
+def targets_for(scene, locale, out_root, sizes, keep_masters=False, frame=False, q=None):
+    """Every output of one localized screenshot, laid out like the standalone scripts (drafts: PNG only)."""
+    q = quality.get(q)
+    folder = scenes.locale_dir(out_root, locale)
+    name = scene["output"]
+    stem = os.path.splitext(name)[0]
+    jpeg = not quality.is_draft(q)
+    targets = []
+    if keep_masters:
+        targets.append(Target("master", None, quality.output_size(q, (scenes.W, scenes.H)), [os.path.join(folder, name)]))
+    for size_name, size in sizes.items():
+        out_dir = os.path.join(folder, size_name)
+        outputs = [os.path.join(out_dir, name)] + ([os.path.join(out_dir, stem + ".jpg")] if jpeg else [])
+        kind = "resize" if resampled(size) else "native"
+        targets.append(Target(kind, size_name, quality.output_size(q, size), outputs))
+        if frame:
+            targets.append(Target("frame", size_name, quality.output_size(q, size),
+                                  [os.path.join(folder, "framed", size_name, name)]))
+    return targets
+
+
+def target_digest(scene_path, locale, target, effort="default", device="phone", background=scenes.PALETTE["NAVY"], q=None):
+    q = quality.get(q)
+    table = scenes.locale_path(locale)
+    constants = {
+        "kind": target.kind, "size": target.size, "palette": scenes.PALETTE, "locale": locale,
+        "encode": encode.settings(quality.profile(q, PROFILES[target.kind]), quality.effort(q, effort)),
+        "quality": quality.settings(q),
+    }
+    code = [inspect.getsource(m) for m in (scenes, text_layout, emoji, encode)] + [
+        inspect.getsource(f) for f in (render, render_outputs, apply_targets)]
+    if target.kind == "frame":
+        constants.update(device=frames.DEVICES[device], background=background)
+        code.append(inspect.getsource(frames))
+    return input_digest(
+        files=[scene_path] + ([table] if table else []),
+        constants=constants,
+        fonts=resolved_font_files() + emoji.source_files(),
+        code=code,
+    )
+
+
+def plan(scene_paths, locales, out_root, sizes, manifest, keep_masters=False, frame=False, q=None,
+         **digest_options):
+    """(scene, locale, [(Target, digest)]) for each screenshot with stale outputs, grouped by scene."""
+    work = []
+    for scene_path in scene_paths:
+        scene = scenes.load_scene(scene_path)
+        for locale in locales:
+            stale = []
+            for target in targets_for(scene, locale, out_root, sizes, keep_masters, frame, q):
+                digest = target_digest(scene_path, locale, target, q=q, **digest_options)
+                if not manifest.is_fresh(target.outputs, digest):
+                    stale.append((target, digest))
+            if stale:
+                work.append((scene, locale, stale))
+    return work
+
+
+def render(scene, locale, size, q=None, statics=None):
+    """scene in locale drawn natively at output size (see quality.py).
+
+    statics: a dict of the scene's static layers by render size, to share
+    them between the locales and sizes of one scene.
+    """
+    q = quality.get(q)
+    statics = {} if statics is None else statics
+    size = (size[0] * q.supersample, size[1] * q.supersample)
+    if size not in statics:
+        statics[size] = scenes.render_static(scene, size)
+    return quality.finish(q, scenes.draw_text_layer(statics[size].copy(), scene, scenes.load_strings(locale)))
+
+
+def render_masters(work, q=None):
+    """Yield (targets, master image); the locale-independent layer is drawn once per scene."""
+    q = quality.get(q)
+    statics, static_for = {}, None
+    size = quality.output_size(q, (scenes.W, scenes.H))
+    for scene, locale, targets in work:
+        with trace.stage("render master", output=scene["output"], locale=locale):
+            if static_for is not scene:
+                statics, static_for = {}, scene
+            master = render(scene, locale, size, q, statics)
+        yield targets, master
+
+
+def render_outputs(work, device="phone", background=scenes.PALETTE["NAVY"], q=None):
+    """Yield ((target, digest), image) for every target in work (see plan()).
+
+    The master is rendered only when a target is made from it; "native"
+    targets are drawn at their own size, each scene's static layers shared
+    between its locales.
+    """
+    q = quality.get(q)
+    statics, static_for = {}, None
+    master_size = quality.output_size(q, (scenes.W, scenes.H))
+    for scene, locale, targets in work:
+        if static_for is not scene:
+            statics, static_for = {}, scene
+        from_master = [(target, digest) for target, digest in targets if target.kind != "native"]
+        if from_master:
+            with trace.stage("render master", output=scene["output"], locale=locale):
+                master = render(scene, locale, master_size, q, statics)
+            yield from apply_targets([(from_master, master)], device, background, q)
+        for target, digest in targets:
+            if target.kind == "native":
+                with trace.stage("render native", output=scene["output"], locale=locale, size=target.size_name):
+                    image = render(scene, locale, target.size, q, statics)
+                yield (target, digest), image
+
+
+def apply_targets(masters, device="phone", background=scenes.PALETTE["NAVY"], q=None):
+    """Yield ((target, digest), image) for every target of every master (not "native" ones)."""
+    q = quality.get(q)
+    for targets, master in masters:
+        for target, digest in targets:
+            with trace.stage(target.kind, size=target.size_name):
+                if target.kind == "master":
+                    image = master
+                elif target.kind == "resize":
+                    image = quality.resize(q, master, target.size)
+                else:
+                    image = frames.framed_canvas(master, target.size, device, background, q=q)
+            yield (target, digest), image
+
+
+def _encode_job(image, target, effort, q=None):
+    q = quality.get(q)
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(target.outputs[0]), exist_ok=True)
+    with trace.stage("save", output=os.path.basename(target.outputs[0]), kind=target.kind, size=target.size_name):
+        for path in target.outputs:
+            encode.save(image, path, quality.profile(q, PROFILES[target.kind]), quality.effort(q, effort))
+    return time.perf_counter() - start
+
+
+def encode_outputs(images, jobs=None, effort="default", q=None):
+    """Encode and write each image; yields ((target, digest), seconds) in input order."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for item, image in images:
+            yield item, _encode_job(image, item[0], effort, q)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        in_flight = deque()
+        for item, image in images:
+            in_flight.append((item, pool.submit(_encode_job, image, item[0], effort, q)))
+            if len(in_flight) >= 2 * jobs:
+                done, future = in_flight.popleft()
+                yield done, future.result()
+        while in_flight:
+            done, future = in_flight.popleft()
+            yield done, future.result()
@@ -0,0 +1,91 @@
+"""Render quality levels shared by the asset scripts (--quality).
+
+    draft, draft-4   1/2 or 1/4 scale, no drop shadows or blurs, bilinear
+                     resampling from a box-reduced source, fastest lossless
+                     PNG and no JPEG twin: for checking a layout
+    normal           the target size with LANCZOS and the store encoders
+    final            drawn at 2x the target size and box-reduced with
+                     Image.reduce(), so the edges of rounded rectangles,
+                     ellipses and text are anti-aliased; maximum PNG effort
+
+Layouts are in design units (see scenes.Layout), so a scene renders at any
+size by asking for it: render_size() is what to draw, finish() brings a
+supersampled drawing down to output_size(). A draft is not a store file: the
+scripts write drafts under .asset-cache/draft/ unless given --out.
+"""
+from collections import namedtuple
+import os
+
+from PIL import Image
+
+from store_assets import registry
+from store_assets.build_cache import CACHE_DIR
+
+# scale: output size / target size; supersample: drawn at this multiple of the output
+# reducing_gap: Image.resize() box-reduces first (None: off); effort: encode effort (None: the script's)
+Quality = namedtuple("Quality", "name scale supersample resample reducing_gap shadows effort")
+
+QUALITIES = {
+    "draft-4": Quality("draft-4", 0.25, 1, Image.BILINEAR, 1.0, False, "fast"),
+    "draft": Quality("draft", 0.5, 1, Image.BILINEAR, 1.0, False, "fast"),
+    "normal": Quality("normal", 1, 1, Image.LANCZOS, None, True, None),
+    "final": Quality("final", 1, 2, Image.LANCZOS, None, True, "max"),
+}
+DEFAULT = "normal"
+DRAFT_DIR = os.path.join(CACHE_DIR, "draft")
+
+
+def get(q=None):
+    """The Quality for a level name, or DEFAULT for None; a Quality is returned as is.
+
+    Functions take q=None and resolve it with get(q) when called, so the default
+    is not frozen at import.
+    """
+    if q is None:
+        q = DEFAULT
+    return QUALITIES[q] if isinstance(q, str) else q
+
+
+def is_draft(q):
+    return q.scale < 1
+
+
+def output_size(q, size):
+    return max(1, round(size[0] * q.scale)), max(1, round(size[1] * q.scale))
+
+
+def render_size(q, size):
+    width, height = output_size(q, size)
+    return width * q.supersample, height * q.supersample
+
+
+def finish(q, img):
+    """img drawn at render_size(), brought down to output_size()."""
+    return img.reduce(q.supersample) if q.supersample > 1 else img
+
+
+def resize(q, img, size, mode=None):
+    """img (converted to mode) at size; memoized when img came from the registry."""
+    return registry.variant(img, size, mode, q.resample, q.reducing_gap)
+
+
+def effort(q, default="default"):
+    return q.effort or default
+
+
+def profile(q, default):
+    """Drafts skip the store encoders' candidate search and are written as plain fast PNGs."""
+    return "lossless" if is_draft(q) else default
+
+
+def out_dir(q, default):
+    """Where a script writes by default: drafts go to DRAFT_DIR/<last part of default>."""
+    if not is_draft(q):
+        return default
+    return os.path.join(DRAFT_DIR, os.path.basename(os.path.normpath(default)))
+
+
+def settings(q):
+    """Everything that affects the pixels, for build-cache digests."""
+    return {"scale": q.scale, "supersample": q.supersample, "resample": int(q.resample),
+            "reducing_gap": q.reducing_gap, "shadows": q.shadows}
@@ -0,0 +1,204 @@
+"""Decoded source images and their resized variants, shared within a process.
+
+    logo = registry.load(LOGO_PATH, "RGBA")           # decoded once per process
+    small = registry.variant(logo, (80, 80))          # resized once, then memoized
+    small = registry.variant(LOGO_PATH, (80, 80), "RGBA")   # the same entry
+
+Entries are keyed by (path, mtime, size) and the conversions and resizes
+that made them (mode, target size, filter), so an edited source is decoded
+again (and its old entries dropped) without any invalidation by the caller.
+variant() takes a path, or an image that load() or variant() returned; any
+other image is converted and resized without being cached. The images are
+shared: copy before drawing on them.
+
+Entries are kept in LRU order under ASSET_REGISTRY_MB (default 256) of
+decoded pixels. With ASSET_VARIANT_CACHE=1, resized variants are also written
+to .asset-cache/variants/ as fast PNGs keyed by the source's content digest
+and the operations, for sources big enough that decoding a variant beats
+resampling the original again in the next process. variant(path) looks
+there before decoding the source (the mode and size come from its header),
+and each file version is hashed once per process.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+
+import PIL
+from PIL import Image
+
+from store_assets.build_cache import CACHE_DIR, file_digest
+
+MB = 1024 * 1024
+MEMORY_LIMIT = int(os.environ.get("ASSET_REGISTRY_MB", "256")) * MB
+DISK_CACHE = os.environ.get("ASSET_VARIANT_CACHE") == "1"
+VARIANTS_DIR = os.path.join(CACHE_DIR, "variants")
+
+
+def _nbytes(img):
+    return img.width * img.height * len(img.getbands())
+
+
+class Registry:
+    """LRU map of (path, mtime, size, operations) -> image.
+
+    operations is the chain that made the image from the decoded file:
+    ("convert", mode) and ("resize", size, filter, reducing gap) steps.
+    """
+
+    def __init__(self, limit=MEMORY_LIMIT, disk_dir=VARIANTS_DIR if DISK_CACHE else None):
+        self.limit = limit
+        self.disk_dir = disk_dir
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.decodes = self.disk_hits = 0
+        self._stamps = {}   # abspath -> (mtime_ns, size) of the entries held
+        self._digests = {}  # (abspath, mtime_ns, size) -> content digest, for the disk cache
+        self._keys = {}     # id(image) -> its key, for variant(image)
+
+    def _source(self, path):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._stamps.get(path, stamp) != stamp:
+            for key in [k for k in self.entries if k[0] == path]:
+                self._drop(key)
+            self._digests.pop((path,) + self._stamps[path], None)
+        self._stamps[path] = stamp
+        return (path,) + stamp
+
+    def _drop(self, key):
+        img = self.entries.pop(key)
+        self.bytes -= _nbytes(img)
+        self._keys.pop(id(img), None)
+
+    def _get(self, key, make):
+        img = self.entries.get(key)
+        if img is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return img
+        self.misses += 1
+        img = make()
+        size = _nbytes(img)
+        if size <= self.limit:
+            while self.entries and self.bytes + size > self.limit:
+                self._drop(next(iter(self.entries)))
+            self.entries[key] = img
+            self._keys[id(img)] = key
+            self.bytes += size
+        return img
+
+    def load(self, path, mode=None):
+        """path decoded (and converted to mode), once per version of the file."""
+        source = self._source(path)
+        decoded = self._get(source + ((),), lambda: self._decode(path))
+        if not mode or decoded.mode == mode:
+            return decoded
+        if id(decoded) not in self._keys:  # too big to keep: convert without caching
+            return decoded.convert(mode)
+        return self._step(decoded, ("convert", mode))
+
+    def _decode(self, path):
+        self.decodes += 1
+        with Image.open(path) as img:
+            img.load()
+            return img.copy()
+
+    def variant(self, source, size=None, mode=None, resample=Image.LANCZOS, reducing_gap=None):
+        """source (a path or a registry image) converted to mode and resized to size, memoized."""
+        if isinstance(source, str) and self.disk_dir is not None and size is not None:
+            img = self._stored_variant(source, size, mode, resample, reducing_gap)
+            if img is not None:
+                return img
+        img = self.load(source) if isinstance(source, str) else source
+        if id(img) not in self._keys:
+            return _convert_resize(img, size, mode, resample, reducing_gap)
+        if mode and img.mode != mode:
+            img = self._step(img, ("convert", mode))
+        if size is not None and tuple(size) != img.size:
+            img = self._step(img, ("resize", tuple(size), int(resample), reducing_gap))
+        return img
+
+    def _step(self, img, op):
+        """The registry image img with one more operation applied."""
+        path, mtime, size, ops = self._keys[id(img)]
+        key = (path, mtime, size, ops + (op,))
+        if op[0] == "convert":
+            return self._get(key, lambda: img.convert(op[1]))
+        return self._get(key, lambda: self._from_disk(key, lambda: img.resize(op[1], op[2], reducing_gap=op[3])))
+
+    def _stored_variant(self, path, size, mode, resample, reducing_gap):
+        """The resized variant of path from memory or the disk cache without decoding path; None if neither has it."""
+        source = self._source(path)
+        with Image.open(path) as img:  # header only
+            decoded_mode, decoded_size = img.mode, img.size
+        if tuple(size) == decoded_size:
+            return None
+        ops = (("convert", mode),) if mode and decoded_mode != mode else ()
+        key = source + (ops + (("resize", tuple(size), int(resample), reducing_gap),),)
+        if key not in self.entries:
+            img = self._read_disk(key)
+            if img is None:
+                return None
+            return self._get(key, lambda: img)
+        return self._get(key, None)
+
+    def _disk_path(self, key):
+        source = key[:3]
+        if source not in self._digests:
+            self._digests[source] = file_digest(key[0])
+        spec = repr((self._digests[source], key[3], PIL.__version__))
+        return os.path.join(self.disk_dir, hashlib.sha256(spec.encode()).hexdigest() + ".png")
+
+    def _read_disk(self, key):
+        try:
+            with Image.open(self._disk_path(key)) as img:
+                img.load()
+            self.disk_hits += 1
+            return img
+        except OSError:  # not cached yet (or a torn write)
+            return None
+
+    def _from_disk(self, key, make):
+        if self.disk_dir is None:
+            return make()
+        img = self._read_disk(key)
+        if img is not None:
+            return img
+        img = make()
+        path = self._disk_path(key)
+        os.makedirs(self.disk_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            img.save(tmp, "PNG", compress_level=1)
+            os.replace(tmp, path)
+        except OSError:  # a mode PNG cannot hold, or a read-only cache
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return img
+
+    def clear(self):
+        self.entries.clear()
+        self._stamps.clear()
+        self._digests.clear()
+        self._keys.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {"entries": len(self.entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses,
+                "decodes": self.decodes, "disk_hits": self.disk_hits}
+
+
+def _convert_resize(img, size, mode, resample, reducing_gap):
+    if mode and img.mode != mode:
+        img = img.convert(mode)
+    if size is None or tuple(size) == img.size:
+        return img
+    return img.resize(size, resample, reducing_gap=reducing_gap)
+
+
+_default = Registry()
+load = _default.load
+variant = _default.variant
+clear = _default.clear
+stats = _default.stats
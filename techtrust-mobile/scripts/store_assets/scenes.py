@@ -0,0 +1,566 @@
+"""Declarative screenshot scenes and the renderer that draws them.
+
+A scene is a JSON file in scripts/screens/ describing one store screenshot:
+
+    {
+      "output": "01_find_services.png",
+      "background": "NAVY",
+      "header": {"title": [{"text": "Find Trusted"}, {"text": "Near You", "color": "GOLD"}],
+                 "subtitle": "...", "subtitle_color": [200, 210, 230]},
+      "phone": {"y": 650, "h": 1900},
+      "components": [...],     # drawn relative to the phone's top-left corner
+      "overlay": [...]         # drawn in canvas coordinates
+    }
+
+The shared structure (background, phone body, optional status bar) is
+drawn by the engine once per distinct layout and reused; the header block
+is drawn from data. Components are either primitives (rect, text, ellipse,
+line), a `repeat` that lays its children out once per item, or one of the
+widgets registered in COMPONENTS. Colors are palette names or [r, g, b].
+
+Inside a `repeat`, string values are templated from the item: a value that
+is exactly "{key}" is replaced by the item's raw value (so colors and
+numbers pass through), other strings go through str.format(**item).
+Children with "when": "key" are only drawn when item[key] is truthy.
+
+Other locales replace the visible strings from a table in screens/locales/
+keyed by the English text and its context (see string_key()), so the same
+word can be translated differently in a headline and in the mock UI.
+
+Scene coordinates are design units on the W x H (iPhone 6.7") master. Any
+other target size is rasterized natively through a Layout, which scales the
+header block (everything above the phone) and the phone block separately so
+that nothing is stretched: phone-shaped targets get a uniform scale, while
+wider targets such as iPads get a larger headline and a phone that is
+centered and shrunk to fit the remaining height.
+"""
+import json
+import os
+import re
+
+from PIL import Image, ImageDraw
+
+from store_assets import emoji, trace
+from store_assets.fonts import get_font
+from store_assets.text_layout import fit, line_height, text_width, wrap
+
+SCREENS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "screens")
+
+# Screen dimensions (iPhone 6.7")
+W, H = 1290, 2796
+
+# Brand colors
+PALETTE = {
+    "NAVY": (27, 58, 107),
+    "BLUE": (43, 94, 167),
+    "WHITE": (255, 255, 255),
+    "LIGHT_GRAY": (245, 247, 250),
+    "DARK_TEXT": (30, 30, 30),
+    "RED": (192, 57, 43),
+    "GREEN": (39, 174, 96),
+    "GOLD": (243, 156, 18),
+}
+
+HEADER_DEFAULTS = {
+    "title_size": 72,
+    "title_step": 90,
+    "title_y": 200,
+    "subtitle_size": 42,
+    "subtitle_y": 400,
+    "margin": 60,
+}
+PHONE_DEFAULTS = {"x": 145, "y": 560, "w": 1000, "h": 1980, "radius": 40, "fill": "WHITE", "frame": False}
+
+# How much larger than the uniform fit the header may grow on wide targets
+HEADER_MAX_GROWTH = 1.35
+
+COLOR_KEYS = {"fill", "outline", "color", "text_fill", "background", "subtitle_color"}
+_WHOLE_KEY = re.compile(r"^\{(\w+)\}$")
+
+# (size, background, phone geometry, status bar) -> rendered base layer
+_base_layers = {}
+
+
+def color(value):
+    """Palette name or [r, g, b(, a)] -> tuple."""
+    if isinstance(value, str):
+        return PALETTE[value]
+    return tuple(value)
+
+
+def load_scene(path):
+    with open(path) as f:
+        scene = json.load(f)
+    scene.setdefault("output", os.path.splitext(os.path.basename(path))[0] + ".png")
+    return scene
+
+
+def scene_paths(screens_dir=SCREENS_DIR):
+    return [
+        os.path.join(screens_dir, fname)
+        for fname in sorted(os.listdir(screens_dir))
+        if fname.endswith(".json")
+    ]
+
+
+def load_scenes(screens_dir=SCREENS_DIR):
+    return [load_scene(path) for path in scene_paths(screens_dir)]
+
+
+# --- layout ---------------------------------------------------------------
+
+class Layout:
+    """Maps design units to pixels on a target canvas.
+
+    Points above `split` (the phone's top edge) belong to the header block,
+    the rest to the phone block. Each block has its own uniform scale and
+    offset; for the W x H master both are the identity.
+    """
+
+    def __init__(self, size, split):
+        width, height = size
+        fit = min(width / W, height / H)
+        self.size = (width, height)
+        self.split = split
+        self.header_scale = min(width / W, fit * HEADER_MAX_GROWTH)
+        header_h = split * self.header_scale
+        self.body_scale = min(fit, (height - header_h) / (H - split))
+        self.blocks = (
+            (self.header_scale, (width - W * self.header_scale) / 2, 0.0),
+            (self.body_scale, (width - W * self.body_scale) / 2, header_h - split * self.body_scale),
+        )
+        self.identity = self.blocks == ((1.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+
+    def key(self):
+        return (self.size, self.split)
+
+    def block(self, y):
+        return self.blocks[0] if y < self.split else self.blocks[1]
+
+    def point(self, x, y, block):
+        if self.identity:
+            return x, y
+        scale, dx, dy = block
+        return round(x * scale + dx), round(y * scale + dy)
+
+    def length(self, value, block):
+        """Scale a radius, stroke width or font size (non-zero values stay >= 1)."""
+        if self.identity or not value:
+            return value
+        return max(1, round(value * block[0]))
+
+
+class ScaledDraw:
+    """The subset of ImageDraw the scenes use, taking design units.
+
+    Text takes a font size and weight instead of a font object, so the font
+    can be loaded at the target's pixel size, and draws emoji as color sprites.
+    """
+
+    def __init__(self, img, layout):
+        self.img = img
+        self.draw = ImageDraw.Draw(img)
+        self.layout = layout
+
+    def _box(self, xy):
+        x0, y0, x1, y1 = xy
+        block = self.layout.block(y0)
+        return [*self.layout.point(x0, y0, block), *self.layout.point(x1, y1, block)], block
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1):
+        box, block = self._box(xy)
+        self.draw.rounded_rectangle(
+            box, radius=self.layout.length(radius, block), fill=fill, outline=outline,
+            width=self.layout.length(width, block),
+        )
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        box, block = self._box(xy)
+        self.draw.ellipse(box, fill=fill, outline=outline, width=self.layout.length(width, block))
+
+    def line(self, points, fill=None, width=1):
+        block = self.layout.block(points[0][1])
+        self.draw.line(
+            [self.layout.point(x, y, block) for x, y in points], fill=fill,
+            width=self.layout.length(width, block),
+        )
+
+    def text(self, xy, text, fill=None, size=24, bold=False, anchor=None):
+        block = self.layout.block(xy[1])
+        font = get_font(self.layout.length(size, block), bold=bold)
+        emoji.draw_text(self.img, self.draw, self.layout.point(*xy, block), text, fill=fill, font=font, anchor=anchor)
+
+
+def scene_layout(scene, size=(W, H)):
+    return Layout(size, phone_geometry(scene)["y"])
+
+
+# --- shared structure -----------------------------------------------------
+
+def draw_status_bar(draw, y=60):
+    """Draw a mock iOS status bar."""
+    draw.text((60, y), "9:41", fill=PALETTE["WHITE"], size=28)
+    # Battery icon area
+    draw.rounded_rectangle((1140, y+2, 1220, y+24), radius=4, fill=PALETTE["WHITE"])
+
+
+def draw_phone_frame(draw, screen_area):
+    """Draw subtle phone frame around screen area."""
+    x0, y0, x1, y1 = screen_area
+    # Outer frame
+    draw.rounded_rectangle((x0-4, y0-4, x1+4, y1+4), radius=44, outline=(180,180,180), width=3)
+
+
+def phone_geometry(scene):
+    phone = dict(PHONE_DEFAULTS, **scene.get("phone", {}))
+    return phone
+
+
+def _draw_base_layer(scene, phone, layout, background):
+    layer = Image.new("RGB", layout.size, background)
+    draw = ScaledDraw(layer, layout)
+    if scene.get("status_bar"):
+        draw_status_bar(draw)
+    x, y, w, h = phone["x"], phone["y"], phone["w"], phone["h"]
+    if phone["frame"]:
+        draw_phone_frame(draw, (x, y, x+w, y+h))
+    draw.rounded_rectangle((x, y, x+w, y+h), radius=phone["radius"], fill=color(phone["fill"]))
+    return layer
+
+
+def base_layer(scene, size=(W, H)):
+    """Background + phone body (+ status bar), rendered once per distinct layout."""
+    phone = phone_geometry(scene)
+    layout = scene_layout(scene, size)
+    key = (
+        layout.key(),
+        color(scene.get("background", "NAVY")),
+        tuple(sorted((k, repr(v)) for k, v in phone.items())),
+        bool(scene.get("status_bar")),
+    )
+    layer = _base_layers.get(key)
+    if layer is None:
+        with trace.span("base layer", "draw", size=list(size)):
+            layer = _base_layers[key] = _draw_base_layer(scene, phone, layout, key[1])
+    return layer.copy()
+
+
+def draw_header(draw, header, width=W):
+    """Centered marketing title lines + subtitle above the phone, shrunk to fit between the margins."""
+    opts = dict(HEADER_DEFAULTS, **header)
+    max_width = width - 2 * opts["margin"]
+    title_y = opts["title_y"]
+    for i, line in enumerate(opts.get("title", [])):
+        y = title_y[i] if isinstance(title_y, list) else title_y + i * opts["title_step"]
+        text, size = fit(line["text"], max_width, opts["title_size"], bold=True)
+        draw.text((width//2, y), text, fill=color(line.get("color", "WHITE")), size=size, bold=True, anchor="mt")
+    if opts.get("subtitle"):
+        text, size = fit(opts["subtitle"], max_width, opts["subtitle_size"])
+        draw.text(
+            (width//2, opts["subtitle_y"]), text,
+            fill=color(opts.get("subtitle_color", "WHITE")), size=size, anchor="mt",
+        )
+
+
+# --- components -----------------------------------------------------------
+
+def _offset(xy, origin):
+    ox, oy = origin
+    return [v + (ox if i % 2 == 0 else oy) for i, v in enumerate(xy)]
+
+
+def draw_rect(draw, comp, origin):
+    draw.rounded_rectangle(
+        _offset(comp["xy"], origin),
+        radius=comp.get("radius", 0),
+        fill=comp.get("fill"),
+        outline=comp.get("outline"),
+        width=comp.get("width", 1),
+    )
+
+
+def draw_ellipse(draw, comp, origin):
+    draw.ellipse(
+        _offset(comp["xy"], origin),
+        fill=comp.get("fill"),
+        outline=comp.get("outline"),
+        width=comp.get("width", 1),
+    )
+
+
+def draw_line(draw, comp, origin):
+    points = [tuple(_offset(p, origin)) for p in comp["points"]]
+    draw.line(points, fill=comp.get("fill"), width=comp.get("width", 1))
+
+
+def draw_text(draw, comp, origin):
+    """Text; with max_width it is shrunk (down to min_size) and then truncated to fit."""
+    text, size = comp["text"], comp.get("size", 24)
+    bold = comp.get("bold", False)
+    if comp.get("max_width"):
+        text, size = fit(text, comp["max_width"], size, bold, comp.get("min_size"))
+    draw.text(
+        tuple(_offset(comp["xy"], origin)),
+        text,
+        fill=comp.get("fill", PALETTE["DARK_TEXT"]),
+        size=size,
+        bold=bold,
+        anchor=comp.get("anchor"),
+    )
+
+
+def _label(draw, comp, box, size):
+    """Text centered in box, fitted inside the box's horizontal padding."""
+    x0, y0, x1, y1 = box
+    bold = comp.get("bold", False)
+    text, size = fit(comp["text"], x1 - x0 - 2 * comp.get("padding", 16), size, bold, comp.get("min_size"))
+    draw.text(
+        ((x0 + x1) // 2, (y0 + y1) // 2), text,
+        fill=comp.get("text_fill", PALETTE["WHITE"]), size=size, bold=bold, anchor="mm",
+    )
+
+
+def draw_badge(draw, comp, origin):
+    """Pill with centered text; width follows the measured label plus padding."""
+    x, y = _offset(comp["xy"], origin)
+    size = comp.get("size", 18)
+    width = round(text_width(comp["text"], size, comp.get("bold", False))) + 2 * comp.get("padding", 16)
+    box = (x, y, x + width, y + comp.get("height", 30))
+    draw.rounded_rectangle(box, radius=comp.get("radius", 10), fill=comp.get("fill"))
+    _label(draw, comp, box, size)
+
+
+def draw_button(draw, comp, origin):
+    """Rounded button with a centered label.
+
+    xy is either a full box, whose label is shrunk or truncated to fit, or a
+    top-left corner (optionally with "align": "right" for a top-right one),
+    whose width follows the label.
+    """
+    size = comp.get("size", 24)
+    height = comp.get("height", 50)
+    xy = _offset(comp["xy"], origin)
+    if len(xy) == 4:
+        box = tuple(xy)
+    else:
+        width = round(text_width(comp["text"], size, comp.get("bold", False))) + 2 * comp.get("padding", 16)
+        x, y = xy
+        if comp.get("align") == "right":
+            x -= width
+        box = (x, y, x + width, y + height)
+    draw.rounded_rectangle(box, radius=comp.get("radius", 12), fill=comp.get("fill"))
+    _label(draw, comp, box, size)
+
+
+CHAT_STYLES = {
+    "user": {"x": 340, "width": 600, "fill": "BLUE", "text_fill": "WHITE", "time_fill": [180, 200, 230]},
+    "other": {"x": 60, "width": 650, "fill": [240, 242, 248], "text_fill": "DARK_TEXT", "time_fill": [150, 150, 170]},
+}
+
+
+def draw_chat(draw, comp, origin):
+    """Stacked chat bubbles; text wraps to the bubble width and each bubble grows with its lines."""
+    ox, oy = origin
+    size, time_size = comp.get("size", 24), comp.get("time_size", 16)
+    line_h = comp.get("line_height") or line_height(size) + 5
+    msg_y = oy + comp.get("y", 0)
+    for msg in comp["messages"]:
+        style = CHAT_STYLES[msg.get("from", "other")]
+        lines = wrap(msg["text"], style["width"] - 40, size)
+        bubble_h = 30 + len(lines) * line_h + 25
+        bx = ox + style["x"]
+        draw.rounded_rectangle((bx, msg_y, bx+style["width"], msg_y+bubble_h), radius=20, fill=color(style["fill"]))
+        for j, line in enumerate(lines):
+            draw.text((bx+20, msg_y+15+j*line_h), line, fill=color(style["text_fill"]), size=size)
+        # Timestamp right-aligned inside the bubble's padding
+        time_x = bx + style["width"] - 20 - round(text_width(msg["time"], time_size))
+        draw.text((time_x, msg_y+bubble_h-25), msg["time"], fill=color(style["time_fill"]), size=time_size)
+        msg_y += bubble_h + comp.get("gap", 20)
+
+
+def _template(value, item):
+    if isinstance(value, str):
+        match = _WHOLE_KEY.match(value)
+        if match and match.group(1) in item:
+            return item[match.group(1)]
+        return value.format(**item)
+    if isinstance(value, list):
+        return [_template(v, item) for v in value]
+    if isinstance(value, dict):
+        return {k: _template(v, item) for k, v in value.items()}
+    return value
+
+
+def draw_repeat(draw, comp, origin, layer=None):
+    """Draw `children` once per item, offset by `step` (or the item's own `at`).
+
+    With `columns`, items flow left to right and wrap into rows.
+    """
+    ox, oy = origin
+    step_x, step_y = comp.get("step", (0, 0))
+    columns = comp.get("columns")
+    for i, item in enumerate(comp["items"]):
+        if "at" in item:
+            dx, dy = item["at"]
+        elif columns:
+            dx, dy = (i % columns) * step_x, (i // columns) * step_y
+        else:
+            dx, dy = i * step_x, i * step_y
+        for child in comp["children"]:
+            if "when" in child and not item.get(child["when"]):
+                continue
+            draw_component(draw, _template(child, item), (ox + dx, oy + dy), layer)
+
+
+COMPONENTS = {
+    "rect": draw_rect,
+    "ellipse": draw_ellipse,
+    "line": draw_line,
+    "text": draw_text,
+    "badge": draw_badge,
+    "button": draw_button,
+    "chat": draw_chat,
+    "repeat": draw_repeat,
+}
+
+# Components whose pixels depend on the locale's strings; everything else
+# is drawn into the locale-independent layer.
+TEXT_COMPONENTS = {"text", "badge", "button", "chat"}
+
+
+def _resolve_colors(comp):
+    if comp["type"] == "repeat":
+        return comp  # children are resolved after templating
+    return {k: color(v) if k in COLOR_KEYS and v is not None else v for k, v in comp.items()}
+
+
+def draw_component(draw, comp, origin=(0, 0), layer=None):
+    """Draw one component. layer="static"/"text" draws only that layer's components."""
+    try:
+        handler = COMPONENTS[comp["type"]]
+    except KeyError:
+        raise ValueError(f"unknown scene component type: {comp.get('type')!r}") from None
+    if handler is draw_repeat:
+        draw_repeat(draw, comp, origin, layer)
+        return
+    if layer is not None and layer != ("text" if comp["type"] in TEXT_COMPONENTS else "static"):
+        return
+    handler(draw, _resolve_colors(comp), origin)
+
+
+def _draw_components(draw, scene, layer):
+    phone = phone_geometry(scene)
+    for comp in scene.get("components", []):
+        draw_component(draw, comp, (phone["x"], phone["y"]), layer)
+    for comp in scene.get("overlay", []):
+        draw_component(draw, comp, (0, 0), layer)
+
+
+# --- locales --------------------------------------------------------------
+
+LOCALES_DIR = os.path.join(SCREENS_DIR, "locales")
+DEFAULT_LOCALE = "en"
+
+# Keys whose string values are user-visible; everything under "items" is too
+TRANSLATABLE_KEYS = {"text", "subtitle", "time"}
+# A string table key is "<context>|<source>" for a string with a context, else the source text:
+# header strings are in the "header" context, and a component or item can set its own with "context"
+CONTEXT_SEPARATOR = "|"
+HEADER_CONTEXT = "header"
+
+
+def available_locales(locales_dir=LOCALES_DIR):
+    return [DEFAULT_LOCALE] + sorted(
+        os.path.splitext(fname)[0] for fname in os.listdir(locales_dir) if fname.endswith(".json")
+    )
+
+
+def locale_path(locale, locales_dir=LOCALES_DIR):
+    """String table file for a locale, or None for the source locale (English)."""
+    if locale == DEFAULT_LOCALE:
+        return None
+    return os.path.join(locales_dir, f"{locale}.json")
+
+
+def locale_dir(root, locale):
+    """A locale's folder under an output root: English keeps the top-level folder; other locales get a subfolder."""
+    return root if locale == DEFAULT_LOCALE else os.path.join(root, locale)
+
+
+def load_strings(locale, locales_dir=LOCALES_DIR):
+    """String table key (see CONTEXT_SEPARATOR) -> translation. Empty for the source locale."""
+    path = locale_path(locale, locales_dir)
+    if path is None:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def string_key(source, context=None):
+    """The string table key of source in context."""
+    return f"{context}{CONTEXT_SEPARATOR}{source}" if context else source
+
+
+def _map_strings(value, func, translate=False, context=None):
+    """value with func(string, context) applied to every user-visible string."""
+    if isinstance(value, str):
+        return func(value, context) if translate else value
+    if isinstance(value, list):
+        return [_map_strings(v, func, translate, context) for v in value]
+    if isinstance(value, dict):
+        context = value.get("context", context)
+        return {
+            k: v if k == "context" else _map_strings(
+                v, func, translate or k in TRANSLATABLE_KEYS or k == "items",
+                HEADER_CONTEXT if k == "header" else context)
+            for k, v in value.items()
+        }
+    return value
+
+
+def source_strings(scene):
+    """The string table keys of scene's user-visible strings."""
+    keys = set()
+    _map_strings(scene, lambda text, context: keys.add(string_key(text, context)))
+    return keys
+
+
+def localize_scene(scene, strings):
+    """Copy of scene with visible strings replaced from a string table (untranslated ones kept)."""
+    if not strings:
+        return scene
+    return _map_strings(scene, lambda text, context: strings.get(string_key(text, context), text))
+
+
+# --- renderer -------------------------------------------------------------
+
+def render_static(scene, size=(W, H)):
+    """Locale-independent layer: background, phone body and every non-text component."""
+    img = base_layer(scene, size)
+    with trace.span("static components", "draw", scene=scene["output"]):
+        _draw_components(ScaledDraw(img, scene_layout(scene, size)), scene, "static")
+    return img
+
+
+def draw_text_layer(img, scene, strings=None):
+    """Draw the header and text components of scene (localized with strings) onto img in place."""
+    scene = localize_scene(scene, strings)
+    draw = ScaledDraw(img, scene_layout(scene, img.size))
+    if "header" in scene:
+        with trace.span("header", "draw", scene=scene["output"]):
+            draw_header(draw, scene["header"])
+    with trace.span("text components", "draw", scene=scene["output"]):
+        _draw_components(draw, scene, "text")
+    return img
+
+
+def render_scene(scene, size=(W, H), strings=None):
+    """Render one scene spec to an RGB image."""
+    return draw_text_layer(render_static(scene, size), scene, strings)
+
+
+def render_locales(scene, locales, size=(W, H)):
+    """Yield (locale, image) for each locale, drawing the static layer only once."""
+    static = render_static(scene, size)
+    for locale in locales:
+        yield locale, draw_text_layer(static.copy(), scene, load_strings(locale))
@@ -0,0 +1,66 @@
+"""Run independent render jobs on a process pool.
+
+    jobs = [Job(key, func, args, cost), ...]
+    for result in run(jobs, workers): ...   # Results, in the order of jobs
+
+Jobs are submitted largest cost first (longest processing time first), so
+the expensive ones start right away and the cheap ones fill in the gaps: with
+enough cores a batch takes about as long as its slowest job instead of
+finishing with one long job running alone. Results still come back in the
+order the jobs were given, whatever order they finish in.
+
+A job that raises does not stop the batch: its Result carries the formatted
+traceback in `error` (a worker that dies takes the jobs it was running with
+it, and those fail the same way) and every other job still runs. func and
+args must be picklable; workers=1 runs the jobs in this process, in order.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+import traceback
+
+# cost: any number comparable between the jobs of one batch (e.g. pixels to encode)
+Job = namedtuple("Job", "key func args cost")
+# error: None, or the formatted traceback of the failure
+Result = namedtuple("Result", "key value error seconds")
+
+
+def _timed(func, args):
+    start = time.perf_counter()
+    value = func(*args)
+    return value, time.perf_counter() - start
+
+
+def _format(exc):
+    # A worker's exception arrives with its remote traceback chained as __cause__
+    return "".join(traceback.format_exception(type(exc), exc, exc.__traceback__)).rstrip()
+
+
+def run(jobs, workers=None):
+    """Run every job; returns [Result] in the order of jobs."""
+    jobs = list(jobs)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(jobs)))
+    if workers == 1:
+        results = []
+        for job in jobs:
+            try:
+                value, seconds = _timed(job.func, job.args)
+                results.append(Result(job.key, value, None, seconds))
+            except Exception as e:
+                results.append(Result(job.key, None, _format(e), 0.0))
+        return results
+
+    order = sorted(range(len(jobs)), key=lambda i: -jobs[i].cost)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {i: pool.submit(_timed, jobs[i].func, jobs[i].args) for i in order}
+        results = []
+        for i, job in enumerate(jobs):
+            exc = futures[i].exception()
+            if exc is None:
+                value, seconds = futures[i].result()
+                results.append(Result(job.key, value, None, seconds))
+            else:
+                results.append(Result(job.key, None, _format(exc), 0.0))
+    return results
+
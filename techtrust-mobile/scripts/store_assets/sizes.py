@@ -0,0 +1,24 @@
+"""Store screenshot target sizes shared by the asset scripts."""
+import os
+
+# All Apple required sizes
+SIZES = {
+    "6.7inch": (1290, 2796),   # iPhone 15 Pro Max, 14 Pro Max
+    "6.5inch": (1284, 2778),   # iPhone 15 Plus, 14 Plus, 11 Pro Max
+    "6.1inch": (1179, 2556),   # iPhone 15, 14
+    "5.5inch": (1242, 2208),   # iPhone 8 Plus
+    "ipad_13inch": (2064, 2752), # iPad Pro 13"
+    "ipad_129inch": (2048, 2732), # iPad Pro 12.9"
+}
+
+# Other store assets that live next to the screenshots but are not screenshots
+NOT_SCREENSHOTS = ("featured_graphic",)
+
+
+def list_screenshots(folder, extensions=(".png",)):
+    """Screenshot files directly in folder, sorted (the size subfolders are skipped)."""
+    return [
+        fname for fname in sorted(os.listdir(folder))
+        if fname.lower().endswith(extensions) and not fname.startswith(NOT_SCREENSHOTS)
+        and os.path.isfile(os.path.join(folder, fname))
+    ]
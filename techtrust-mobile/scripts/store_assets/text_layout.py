@@ -0,0 +1,104 @@
+"""Text measurement and layout by real font metrics.
+
+Everything here works in design units: a string is measured with the font
+loaded at its design size (see fonts.get_font), and ScaledDraw scales the
+result together with the rest of the scene. Layout therefore does not depend
+on the target size, only on the fonts and the (localized) strings.
+
+    lines = wrap(text, 560, size=24)           # greedy word wrap to a pixel width
+    label = truncate(text, 300, size=22)       # "Reparación de A…"
+    size = fit_size(text, 370, size=24)        # largest size <= 24 that fits
+
+Widths are memoized per (size, weight, string). Wrapping measures words, not
+candidate lines, so the cache fills with words shared across bubbles, cards
+and locales and a re-render measures almost nothing.
+"""
+from store_assets.emoji import text_length
+from store_assets.fonts import get_font
+
+ELLIPSIS = "…"
+
+# (size, bold, text) -> width in design units
+_widths = {}
+
+
+def text_width(text, size=24, bold=False):
+    """Advance width of text at a design font size (emoji sprites included)."""
+    key = (size, bold, text)
+    width = _widths.get(key)
+    if width is None:
+        width = _widths[key] = text_length(text, get_font(size, bold=bold))
+    return width
+
+
+def line_height(size=24, bold=False):
+    """Ascent + descent of the font, the natural distance between baselines."""
+    ascent, descent = get_font(size, bold=bold).getmetrics()
+    return ascent + descent
+
+
+def _break_word(word, max_width, size, bold):
+    """Split a word wider than max_width into pieces that fit (at least one character each)."""
+    pieces = []
+    piece = ""
+    for ch in word:
+        if piece and text_width(piece + ch, size, bold) > max_width:
+            pieces.append(piece)
+            piece = ch
+        else:
+            piece += ch
+    if piece:
+        pieces.append(piece)
+    return pieces
+
+
+def wrap(text, max_width, size=24, bold=False):
+    """Greedy word wrap of text into lines no wider than max_width."""
+    space = text_width(" ", size, bold)
+    lines = []
+    current, current_w = [], 0.0
+    for word in text.split():
+        word_w = text_width(word, size, bold)
+        if word_w > max_width:
+            pieces = _break_word(word, max_width, size, bold)
+            if current:
+                lines.append(" ".join(current))
+            lines.extend(pieces[:-1])
+            current, current_w = [pieces[-1]], text_width(pieces[-1], size, bold)
+            continue
+        if current and current_w + space + word_w > max_width:
+            lines.append(" ".join(current))
+            current, current_w = [], 0.0
+        current_w += (space if current else 0) + word_w
+        current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def truncate(text, max_width, size=24, bold=False, ellipsis=ELLIPSIS):
+    """text, or its longest prefix that fits max_width with ellipsis appended."""
+    if text_width(text, size, bold) <= max_width:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:  # longest prefix that fits
+        mid = (lo + hi + 1) // 2
+        if text_width(text[:mid].rstrip() + ellipsis, size, bold) <= max_width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + ellipsis
+
+
+def fit_size(text, max_width, size=24, bold=False, min_size=None):
+    """Largest font size from size down to min_size (default: 3/4 of size) at which text fits."""
+    min_size = min_size or max(1, round(size * 0.75))
+    while size > min_size and text_width(text, size, bold) > max_width:
+        size -= 1
+    return size
+
+
+def fit(text, max_width, size=24, bold=False, min_size=None):
+    """(text, size): shrink toward min_size first, then truncate what still does not fit."""
+    size = fit_size(text, max_width, size, bold, min_size)
+    return truncate(text, max_width, size, bold), size
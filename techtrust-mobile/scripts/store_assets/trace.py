@@ -0,0 +1,216 @@
+"""Opt-in tracing of the asset scripts as a Chrome / Perfetto trace.
+
+Set ASSET_TRACE to a JSON path to enable it for any script (and the worker
+processes and subprocesses it starts):
+
+    ASSET_TRACE=/tmp/assets.json python store-assets.py
+    ASSET_TRACE=/tmp/assets.json ASSET_TRACE_MEMORY=1 python generate-screenshots.py
+
+then open the file in https://ui.perfetto.dev or chrome://tracing.
+
+When enabled, Pillow's hot calls are wrapped in spans (font loading,
+ImageDraw.text, Image.resize, GaussianBlur, alpha_composite, quantize and
+every save) and the scripts add spans for their own phases with span() and
+stage(). With ASSET_TRACE_MEMORY=1, tracemalloc runs too and every stage
+span carries the traced memory and its top allocation sites (Python
+allocations only; Pillow's pixel buffers are not traced).
+
+The process that enabled tracing first owns the trace: it buffers its events
+and, at exit, merges them with the parts other processes appended to
+<trace>.parts/. Other processes (pool workers, subprocesses) append their
+events each time an outermost span closes, so nothing depends on how a
+worker exits. With ASSET_TRACE unset nothing is patched and span() is a no-op.
+"""
+from contextlib import contextmanager, nullcontext
+import atexit
+import functools
+import glob
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+
+TRACE_PATH = os.environ.get("ASSET_TRACE")
+TRACE_MEMORY = bool(os.environ.get("ASSET_TRACE_MEMORY"))
+OWNER_ENV = "ASSET_TRACE_OWNER"
+TOP_ALLOCATIONS = 10
+
+enabled = bool(TRACE_PATH)
+_events = []
+_owner = False
+_local = threading.local()
+_NULL = nullcontext()
+
+
+def _now_us():
+    # perf_counter is a system-wide monotonic clock, so worker timestamps line up
+    return time.perf_counter_ns() / 1000
+
+
+def _event(name, cat, start, end, args):
+    _events.append({
+        "name": name, "cat": cat, "ph": "X", "ts": start, "dur": end - start,
+        "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+    })
+
+
+def span(name, cat="asset", **args):
+    """Context manager recording one complete event (no-op when tracing is off)."""
+    return _span(name, cat, args) if enabled else _NULL
+
+
+@contextmanager
+def _nested():
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    try:
+        yield
+    finally:
+        _local.depth = depth
+        if depth == 0 and not _owner:
+            flush()
+
+
+@contextmanager
+def _span(name, cat, args):
+    start = _now_us()
+    with _nested():
+        try:
+            yield
+        finally:
+            _event(name, cat, start, _now_us(), args)
+
+
+def stage(name, **args):
+    """A span for one pipeline stage; carries a tracemalloc summary with ASSET_TRACE_MEMORY=1."""
+    return _stage(name, args) if enabled else _NULL
+
+
+@contextmanager
+def _stage(name, args):
+    start = _now_us()
+    with _nested():
+        try:
+            yield
+        finally:
+            _stage_event(name, start, args)
+
+
+def _stage_event(name, start, args):
+    if TRACE_MEMORY:
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        args = dict(args, traced_bytes=current, traced_peak_bytes=peak,
+                    top_allocations=[f"{stat.size:,}B {stat.traceback}" for stat in top])
+        tracemalloc.reset_peak()
+    _event(name, "stage", start, _now_us(), args)
+
+
+def traced(name, cat="asset", describe=None):
+    """Decorator form of span(); describe(*args, **kwargs) -> dict adds event args."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _span(name, cat, describe(*args, **kwargs) if describe else {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- Pillow hooks ---------------------------------------------------------
+
+def _describe_size(img, *args, **kwargs):
+    return {"from": list(img.size), "to": list(args[0] if args else kwargs.get("size", ()))}
+
+
+def _describe_save(img, fp, format=None, **params):
+    target = fp if isinstance(fp, str) else type(fp).__name__
+    return {"size": list(img.size), "mode": img.mode, "format": format, "target": target,
+            "params": {k: repr(v) for k, v in params.items()}}
+
+
+def _patch_pillow():
+    from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+    Image.Image.resize = traced("Image.resize", "pillow", _describe_size)(Image.Image.resize)
+    Image.Image.save = traced("Image.save", "pillow", _describe_save)(Image.Image.save)
+    Image.Image.quantize = traced("Image.quantize", "pillow")(Image.Image.quantize)
+    Image.Image.alpha_composite = traced("alpha_composite", "pillow")(Image.Image.alpha_composite)
+    Image.alpha_composite = traced("alpha_composite", "pillow")(Image.alpha_composite)
+    ImageDraw.ImageDraw.text = traced(
+        "ImageDraw.text", "text", lambda draw, xy, text, *a, **kw: {"chars": len(text)}
+    )(ImageDraw.ImageDraw.text)
+    ImageFilter.GaussianBlur.filter = traced(
+        "GaussianBlur", "pillow", lambda blur, image: {"radius": repr(blur.radius), "size": list(image.size)}
+    )(ImageFilter.GaussianBlur.filter)
+    ImageFont.truetype = traced(
+        "font load", "font", lambda font=None, size=10, *a, **kw: {"font": str(font), "size": size}
+    )(ImageFont.truetype)
+
+
+# --- output ---------------------------------------------------------------
+
+def _parts_dir():
+    return TRACE_PATH + ".parts"
+
+
+def _process_name():
+    name = os.path.basename(sys.argv[0]) or "python"
+    return {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": f"{name} ({os.getpid()})"}}
+
+
+def flush():
+    """Append this process's buffered events to its part file (one JSON event per line)."""
+    if not _events:
+        return
+    os.makedirs(_parts_dir(), exist_ok=True)
+    part = os.path.join(_parts_dir(), f"{os.getpid()}.jsonl")
+    new = not os.path.exists(part)
+    with open(part, "a") as f:
+        for event in ([_process_name()] if new else []) + _events:
+            f.write(json.dumps(event) + "\n")
+    _events.clear()
+
+
+def _finish():
+    if not _owner:
+        flush()
+        return
+    events = [_process_name()] + _events
+    for part in sorted(glob.glob(os.path.join(_parts_dir(), "*.jsonl"))):
+        with open(part) as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    with open(TRACE_PATH, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    shutil.rmtree(_parts_dir(), ignore_errors=True)
+    print(f"Trace written to {TRACE_PATH} ({len(events)} events)", file=sys.stderr)
+
+
+def _after_fork():
+    global _owner
+    _events.clear()
+    _owner = False
+    _local.depth = 0  # the fork may happen inside one of the parent's spans
+
+
+def _enable():
+    global _owner
+    if OWNER_ENV not in os.environ:
+        _owner = True
+        os.environ[OWNER_ENV] = str(os.getpid())
+        shutil.rmtree(_parts_dir(), ignore_errors=True)
+    if TRACE_MEMORY:
+        tracemalloc.start()
+    _patch_pillow()
+    atexit.register(_finish)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork)
+
+
+if enabled:
+    _enable()
@@ -0,0 +1,54 @@
+"""Tests for store_assets/backgrounds.py (run from scripts/: python -m pytest tests)."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops, ImageDraw  # noqa: E402
+
+from store_assets import backgrounds  # noqa: E402
+
+WHITE_TO_BLACK = [(255, 255, 255), (0, 0, 0)]
+
+
+@unittest.skipIf(backgrounds.np is None, "compares the Pillow fallback with the NumPy path")
+class PillowFallbackTest(unittest.TestCase):
+    def assert_matches_numpy(self, make, tolerance):
+        with_numpy = make()
+        numpy = backgrounds.np
+        backgrounds.np = None
+        try:
+            fallback = make()
+        finally:
+            backgrounds.np = numpy
+        diff = ImageChops.difference(with_numpy, fallback).convert("L")
+        self.assertLessEqual(diff.getextrema()[1], tolerance)
+
+    def test_linear_gradients(self):
+        for angle in (0, 90, 180, 270):
+            with self.subTest(angle=angle):
+                self.assert_matches_numpy(lambda: backgrounds.linear_gradient((300, 200), WHITE_TO_BLACK, angle), 1)
+
+    def test_radial_gradients(self):
+        self.assert_matches_numpy(lambda: backgrounds.radial_gradient((300, 200), WHITE_TO_BLACK), 3)
+        self.assert_matches_numpy(
+            lambda: backgrounds.radial_gradient((300, 200), WHITE_TO_BLACK, center=(0.3, 0.6), radius=120), 3)
+
+
+class OverlayEllipsesTest(unittest.TestCase):
+    def test_matches_one_full_canvas_layer(self):
+        # Overlapping, partly off-canvas and fully off-canvas circles
+        ellipses = [((150, -100, 450, 200), (0, 0, 255, 80)), ((250, 50, 350, 250), (255, 200, 0, 40)),
+                    ((-150, 100, 100, 350), (20, 40, 200, 60)), ((500, 500, 600, 600), (255, 0, 0, 255))]
+        base = backgrounds.linear_gradient((300, 200), WHITE_TO_BLACK, 90).convert("RGBA")
+        layer = Image.new("RGBA", base.size, (0, 0, 0, 0))
+        for box, fill in ellipses:
+            ImageDraw.Draw(layer).ellipse(box, fill=fill)
+        expected = Image.alpha_composite(base, layer)
+        result = backgrounds.overlay_ellipses(base.copy(), ellipses)
+        self.assertIsNone(ImageChops.difference(result, expected).getbbox(alpha_only=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
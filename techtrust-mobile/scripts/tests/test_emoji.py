@@ -0,0 +1,70 @@
+"""Tests for store_assets/emoji.py (run from scripts/: python -m pytest tests)."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+from store_assets import emoji  # noqa: E402
+
+RED = (220, 30, 30, 255)
+
+
+class EmojiTest(unittest.TestCase):
+    def use_sources(self, folder, font=None):
+        """Point the module at folder (PNGs only unless font is given), as if freshly imported."""
+        for name, value in (("EMOJI_DIR", folder), ("_files", None), ("_font", font), ("_sprites", {}),
+                            ("_warned", False)):
+            patcher = mock.patch.object(emoji, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        for name in (emoji.FALLBACK_ENV, emoji.WARNED_ENV):
+            os.environ.pop(name, None)
+
+    def folder(self):
+        path = tempfile.mkdtemp(prefix="emoji-test-")
+        self.addCleanup(shutil.rmtree, path)
+        return path
+
+    def test_sprite_clipped_at_the_canvas_edge(self):
+        folder = self.folder()
+        Image.new("RGBA", (32, 32), RED).save(os.path.join(folder, "1f50d.png"))
+        self.use_sources(folder)
+        font = ImageFont.load_default(20)
+        for mode in ("RGBA", "RGB"):
+            with self.subTest(mode=mode):
+                img = Image.new(mode, (40, 40), "white")
+                # Right-anchored at x=5 and top-anchored at y=0: the sprite starts left of and above the canvas
+                emoji.draw_text(img, ImageDraw.Draw(img), (5, 0), "🔍", fill="black", font=font, anchor="rt")
+                self.assertEqual(img.getpixel((0, 0))[:3], RED[:3])
+                self.assertEqual(img.getpixel((39, 39))[:3], (255, 255, 255))
+
+    def test_missing_source_fails_unless_fallback(self):
+        self.use_sources(self.folder())
+        font = ImageFont.load_default(20)
+        img = Image.new("RGB", (200, 40), "white")
+        with self.assertRaises(emoji.MissingEmojiError):
+            emoji.draw_text(img, ImageDraw.Draw(img), (0, 0), "🔍 Search", fill="black", font=font)
+        os.environ[emoji.FALLBACK_ENV] = "1"
+        with mock.patch("sys.stderr"):
+            emoji.draw_text(img, ImageDraw.Draw(img), (0, 0), "🔍 Search", fill="black", font=font)
+
+    def test_emoji_missing_from_the_png_set_fails(self):
+        folder = self.folder()
+        Image.new("RGBA", (32, 32), RED).save(os.path.join(folder, "1f50d.png"))
+        self.use_sources(folder)
+        font = ImageFont.load_default(20)
+        with self.assertRaisesRegex(emoji.MissingEmojiError, "U\\+1F44B"):
+            emoji.text_length("🔍 👋", font)
+
+
+if __name__ == "__main__":
+    unittest.main()
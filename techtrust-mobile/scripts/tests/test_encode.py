@@ -0,0 +1,40 @@
+"""Tests for store_assets/encode.py (run from scripts/: python -m pytest tests)."""
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from store_assets import encode  # noqa: E402
+
+BLUE = (43, 94, 167)
+
+
+class TileMseTest(unittest.TestCase):
+    def test_a_change_in_one_channel_counts(self):
+        ref = Image.new("RGB", (640, 480), BLUE)
+        img = ref.copy()
+        img.paste((43, 94, 230), (100, 100, 600, 400))
+        self.assertEqual(encode.tile_mse(img, ref, 32).getextrema()[1], 63 ** 2)
+        self.assertLess(encode.quality_db(img, ref), encode.MIN_QUALITY_DB)
+
+    def test_edge_tiles_cover_only_the_pixels_left(self):
+        ref = Image.new("RGB", (100, 70), BLUE)
+        img = ref.copy()
+        img.putpixel((99, 69), (43, 94, 0))
+        grid = encode.tile_mse(img, ref, 16)
+        self.assertEqual(grid.size, (7, 5))
+        # The corner tile is 4 x 6 px
+        self.assertAlmostEqual(grid.getpixel((6, 4)), 167 ** 2 / 24, places=2)
+        self.assertEqual(grid.getpixel((5, 4)), 0)
+
+    def test_identical_images(self):
+        ref = Image.new("RGB", (50, 50), BLUE)
+        self.assertEqual(encode.quality_db(ref.copy(), ref), math.inf)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+"""Tests for store_assets/icon_sets.py (run from scripts/: python -m pytest tests)."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from store_assets import icon_sets  # noqa: E402
+
+
+class LogoSizeTest(unittest.TestCase):
+    def test_small_logo_is_refused(self):
+        sources = icon_sets.IconSources(Image.new("RGBA", (203, 197), (20, 60, 160, 255)))
+        with self.assertRaisesRegex(ValueError, "203x197 px"):
+            sources.master("icon")
+
+    def test_small_logo_with_allow_upscale(self):
+        sources = icon_sets.IconSources(Image.new("RGBA", (203, 197), (20, 60, 160, 255)), allow_upscale=True)
+        self.assertEqual(sources.icon("icon", 64).size, (64, 64))
+
+    def test_logo_as_large_as_the_largest_icon(self):
+        _, largest = icon_sets.logo_upscale(Image.new("RGBA", (1, 1)))
+        sources = icon_sets.IconSources(Image.new("RGBA", (largest, largest), (20, 60, 160, 255)))
+        self.assertEqual(sources.master("icon").size, (icon_sets.MASTER_SIZE, icon_sets.MASTER_SIZE))
+
+
+if __name__ == "__main__":
+    unittest.main()
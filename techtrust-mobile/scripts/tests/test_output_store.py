@@ -0,0 +1,87 @@
+"""Tests for store_assets/output_store.py (run from scripts/: python -m pytest tests)."""
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from store_assets import output_store  # noqa: E402
+
+
+def png(color, **params):
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), color).save(buf, "PNG", **params)
+    return buf.getvalue()
+
+
+class OutputStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.out = os.path.join(self.root, "out.png")
+        for name, value in (("STORE_DIR", os.path.join(self.root, "objects")),
+                            ("RUNS_DIR", os.path.join(self.root, "runs")), ("linking", True)):
+            patcher = mock.patch.object(output_store, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        env = mock.patch.dict(os.environ, {output_store.RUN_ENV: "test"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_store_off_does_not_write_through_a_linked_object(self):
+        red, blue = png((255, 0, 0)), png((0, 0, 255))
+        key, _ = output_store.write(self.out, red)
+        obj = output_store.object_path(key, ".png")
+        self.assertTrue(os.path.samefile(self.out, obj))
+
+        with mock.patch.object(output_store, "linking", False):
+            output_store.write(self.out, blue)
+        self.assertEqual(self.read(self.out), blue)
+        self.assertEqual(self.read(obj), red)
+        self.assertFalse(os.path.samefile(self.out, obj))
+
+        # Switching the store back on links the output again
+        key, status = output_store.write(self.out, red)
+        self.assertEqual(status, "changed")
+        self.assertTrue(os.path.samefile(self.out, output_store.object_path(key, ".png")))
+
+    def test_new_encoding_of_the_same_pixels_reaches_the_output(self):
+        small, large = png((0, 128, 0), compress_level=9), png((0, 128, 0), compress_level=0)
+        self.assertNotEqual(small, large)
+        self.assertEqual(output_store.image_key(small), output_store.image_key(large))
+        output_store.write(self.out, small)
+        _, status = output_store.write(self.out, large)
+        self.assertEqual(status, "changed")
+        self.assertEqual(self.read(self.out), large)
+        _, status = output_store.write(self.out, large)
+        self.assertEqual(status, "unchanged")
+
+    def test_outputs_outside_the_cache_are_plain_files_by_default(self):
+        red, blue = png((255, 0, 0)), png((0, 0, 255))
+        cache = os.path.join(self.root, "cache")
+        draft = os.path.join(cache, "draft", "out.png")
+        os.makedirs(os.path.dirname(draft))
+        with mock.patch.object(output_store, "linking", None), mock.patch.object(output_store, "CACHE_DIR", cache):
+            self.assertEqual(output_store.write(self.out, red)[1], "new")
+            self.assertEqual(os.stat(self.out).st_nlink, 1)
+            self.assertTrue(os.access(self.out, os.W_OK))
+            self.assertEqual(output_store.write(self.out, red)[1], "unchanged")
+            self.assertEqual(output_store.write(self.out, blue)[1], "changed")
+            self.assertEqual(self.read(self.out), blue)
+
+            key, _ = output_store.write(draft, red)
+            self.assertTrue(os.path.samefile(draft, output_store.object_path(key, ".png")))
+
+
+if __name__ == "__main__":
+    unittest.main()
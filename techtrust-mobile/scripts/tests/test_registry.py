@@ -0,0 +1,66 @@
+"""Tests for store_assets/registry.py (run from scripts/: python -m pytest tests)."""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops  # noqa: E402
+
+from store_assets import registry  # noqa: E402
+
+
+class DiskCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.disk_dir = os.path.join(tmp.name, "variants")
+        self.path = os.path.join(tmp.name, "source.png")
+        self.save_source((20, 60, 120))
+
+    def save_source(self, color):
+        img = Image.new("RGB", (300, 200), color)
+        img.paste((250, 250, 250), (40, 40, 160, 120))
+        img.save(self.path)
+
+    def registry(self):
+        return registry.Registry(disk_dir=self.disk_dir)
+
+    def test_a_stored_variant_is_read_without_decoding_the_source(self):
+        first = self.registry()
+        made = first.variant(self.path, (75, 50), "RGBA")
+        self.assertEqual(first.stats()["decodes"], 1)
+
+        second = self.registry()
+        stored = second.variant(self.path, (75, 50), "RGBA")
+        self.assertEqual((second.stats()["decodes"], second.stats()["disk_hits"]), (0, 1))
+        self.assertEqual(stored.mode, "RGBA")
+        self.assertIsNone(ImageChops.difference(made, stored).getbbox(alpha_only=False))
+        # Memoized in memory, and usable as a registry image
+        self.assertIs(second.variant(self.path, (75, 50), "RGBA"), stored)
+        self.assertEqual(second.variant(stored, (30, 20)).size, (30, 20))
+
+    def test_an_edited_source_misses_the_disk_cache(self):
+        self.registry().variant(self.path, (75, 50))
+        self.save_source((200, 30, 30))
+        os.utime(self.path, ns=(1, 1))
+        fresh = self.registry()
+        img = fresh.variant(self.path, (75, 50))
+        self.assertEqual((fresh.stats()["decodes"], fresh.stats()["disk_hits"]), (1, 0))
+        self.assertEqual(img.getpixel((0, 0)), (200, 30, 30))
+
+
+class MemoryLimitTest(unittest.TestCase):
+    def test_an_image_over_the_limit_is_converted_without_being_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "palette.png")
+            Image.new("P", (400, 400), 3).save(path)
+            reg = registry.Registry(limit=100000, disk_dir=None)
+            img = reg.load(path, "RGBA")
+            self.assertEqual((img.mode, img.size), ("RGBA", (400, 400)))
+            self.assertEqual(reg.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Tests for the locale string tables of store_assets/scenes.py (run from scripts/: python -m pytest tests)."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from store_assets import scenes  # noqa: E402
+
+
+class StringTableTest(unittest.TestCase):
+    def test_one_source_string_can_have_two_translations(self):
+        scene = {
+            "output": "test.png",
+            "header": {"title": [{"text": "Get Instant"}, {"text": "Quotes"}]},
+            "components": [{"type": "repeat", "items": [{"label": "Quotes"}], "children": []},
+                           {"type": "text", "text": "Quotes", "context": "tab"}],
+        }
+        strings = {"header|Quotes": "al Instante", "Quotes": "Cotizadas", "tab|Quotes": "Cotizaciones"}
+        localized = scenes.localize_scene(scene, strings)
+        self.assertEqual(localized["header"]["title"][1]["text"], "al Instante")
+        self.assertEqual(localized["components"][0]["items"][0]["label"], "Cotizadas")
+        self.assertEqual(localized["components"][1]["text"], "Cotizaciones")
+        self.assertEqual(localized["components"][1]["context"], "tab")
+
+    def test_the_instant_quotes_step_label_is_not_the_headline(self):
+        scene = scenes.load_scene(os.path.join(scenes.SCREENS_DIR, "03_instant_quotes.json"))
+        for locale, label in (("es", "Cotizadas"), ("pt", "Orçamentos")):
+            localized = scenes.localize_scene(scene, scenes.load_strings(locale))
+            steps = next(c for c in localized["components"] if c["type"] == "repeat")["items"]
+            self.assertEqual(steps[2]["label"], label)
+
+    def test_every_table_key_is_used_by_a_scene(self):
+        # A key that no scene looks up is a translation for a string in the wrong context
+        used = set().union(*(scenes.source_strings(scene) for scene in scenes.load_scenes()))
+        for locale in scenes.available_locales()[1:]:
+            with self.subTest(locale=locale):
+                self.assertEqual(set(scenes.load_strings(locale)) - used, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
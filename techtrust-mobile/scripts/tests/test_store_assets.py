@@ -0,0 +1,34 @@
+"""Tests for store-assets.py (run from scripts/: python -m pytest tests)."""
+import importlib.util
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+_spec = importlib.util.spec_from_file_location("store_assets_cli", os.path.join(SCRIPTS_DIR, "store-assets.py"))
+cli = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cli)
+
+
+class WorkerSharesTest(unittest.TestCase):
+    def test_never_exceeds_the_free_workers(self):
+        names = sorted(cli.TASKS)
+        for free in range(len(names) + 3):
+            for n in range(len(names) + 1):
+                with self.subTest(free=free, ready=n):
+                    shares = cli.worker_shares(names[:n], free)
+                    self.assertLessEqual(sum(shares.values()), free)
+                    self.assertEqual(len(shares), min(n, free))
+                    self.assertTrue(all(workers >= 1 for workers in shares.values()))
+
+    def test_spare_workers_go_to_pools(self):
+        self.assertEqual(cli.worker_shares(["featured-graphic", "resize"], 8), {"featured-graphic": 1, "resize": 7})
+
+    def test_no_free_workers_starts_nothing(self):
+        self.assertEqual(cli.worker_shares(["resize", "frame"], 0), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
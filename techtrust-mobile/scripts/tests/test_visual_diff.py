@@ -0,0 +1,32 @@
+"""Tests for visual-diff.py (run from scripts/: python -m pytest tests)."""
+import importlib.util
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from PIL import Image  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("visual_diff", os.path.join(SCRIPTS_DIR, "visual-diff.py"))
+visual_diff = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(visual_diff)
+
+
+class ChangedTilesTest(unittest.TestCase):
+    def test_opaque_color_change(self):
+        for mode in ("RGB", "RGBA"):
+            with self.subTest(mode=mode):
+                old = Image.new(mode, (40, 40), "white")
+                new = old.copy()
+                new.paste("red", (20, 20, 30, 30))
+                self.assertEqual([(x, y) for x, y, _ in visual_diff.changed_tiles(new, old)], [(1, 1)])
+
+    def test_identical(self):
+        img = Image.new("RGBA", (40, 40), (10, 20, 30, 128))
+        self.assertEqual(visual_diff.changed_tiles(img, img.copy()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
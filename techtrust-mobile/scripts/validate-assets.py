@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Check the store outputs against the submission rules before uploading.
+
+Reads image headers only (Image.open parses the PNG chunks before IDAT and
+the JPEG markers before the scan data; nothing is decoded):
+
+  - dimensions: screenshots against SIZES (the size folder they are in, or
+    the WxH in a legacy folder name), icons against the icon matrix
+  - format and mode: PNG or JPEG matching the extension, RGB (no CMYK),
+    24-bit PNG where Google Play wants it, no alpha channel on iOS icons
+  - color profile: an embedded ICC profile must be RGB, and sRGB or
+    Display P3 (anything else is converted by the store and colors shift)
+  - file size: the stores' hard limits, and the encode profile's budget
+  - counts: 1-10 screenshots per size folder, the same set in every size
+    folder of a locale
+
+Only a screenshot that has an alpha channel is decoded, to tell an opaque
+alpha channel (a warning) from actual transparency (an error).
+
+    python validate-assets.py               # store-screenshots/ and the app icons
+    python validate-assets.py --strict      # warnings fail too
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+
+from PIL import Image
+
+from store_assets import encode, icon_sets, output_store, scenes
+from store_assets.build_cache import MOBILE_DIR
+from store_assets.sizes import SIZES
+
+SCREENSHOTS_DIR = os.path.join(MOBILE_DIR, "store-screenshots")
+MB = 1024 * 1024
+
+# App Store Connect: up to 10 screenshots per device size and locale
+MIN_SCREENSHOTS, MAX_SCREENSHOTS = 1, 10
+# Hard limits; Google Play's, which are the stricter ones for the shared files
+SCREENSHOT_LIMIT = 8 * MB
+FEATURED_GRAPHIC = {"size": (1024, 500), "limit": 15 * MB, "profile": "play"}
+PLAY_ICON_LIMIT = 1 * MB
+# Written by generate-icons.py: path -> (size, alpha allowed)
+APP_ICONS = {name: (canvas_size, mode == "RGBA") for name, canvas_size, _, _, mode, _ in icon_sets.ICONS}
+ICC_SPACES = (b"sRGB", b"Display P3")
+_SIZE_IN_NAME = re.compile(r"(\d+)x(\d+)$")
+
+
+class Report:
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+        self.checked = 0
+        self.scanned = 0
+
+    def error(self, path, message):
+        self.errors.append((path, message))
+
+    def warning(self, path, message):
+        self.warnings.append((path, message))
+
+
+def _has_alpha(img):
+    return "A" in img.getbands() or "transparency" in img.info
+
+
+def _icc_name(profile):
+    """The sRGB/Display P3 name found in an ICC profile's description, or None."""
+    for name in ICC_SPACES:
+        # v2 profiles store the description in ASCII, v4 (mluc) in UTF-16BE
+        if name in profile or name.decode().encode("utf-16-be") in profile:
+            return name.decode()
+    return None
+
+
+def check_header(report, path, img, st_size, size=None, limit=None, budget=None, alpha=True, palette=True):
+    """The header-level checks shared by every kind of output."""
+    ext = os.path.splitext(path)[1].lower()
+    if img.format != encode.FORMATS.get(ext):
+        report.error(path, f"{img.format} data in a {ext} file")
+    if size and img.size != size and img.size != size[::-1]:
+        report.error(path, f"{img.width}x{img.height}, expected {size[0]}x{size[1]}")
+    if img.mode == "CMYK" or img.mode.startswith("I") or img.mode == "F":
+        report.error(path, f"mode {img.mode}, expected 8-bit RGB")
+    elif img.mode == "P" and not palette:
+        report.error(path, "palette PNG, Google Play wants 24-bit PNG or JPEG")
+    if not alpha and _has_alpha(img):
+        report.error(path, f"has an alpha channel ({img.mode}{', tRNS' if 'transparency' in img.info else ''})")
+    icc = img.info.get("icc_profile")
+    if icc:
+        if icc[16:20] != b"RGB ":
+            report.error(path, f"ICC profile for {icc[16:20].decode('latin-1').strip()} data, expected RGB")
+        elif _icc_name(icc) is None:
+            report.warning(path, "ICC profile is neither sRGB nor Display P3; the store will convert colors")
+    if limit and st_size > limit:
+        report.error(path, f"{st_size / MB:.1f} MB, over the {limit / MB:.0f} MB limit")
+    elif budget and st_size > budget:
+        report.warning(path, f"{st_size / 1e6:.2f} MB, over the {budget / 1e6:g} MB encode budget")
+
+
+def check_transparency(report, path, img):
+    """Decode an image that has an alpha channel and fail it only if a pixel is actually transparent."""
+    report.scanned += 1
+    rgba = img if img.mode == "RGBA" else img.convert("RGBA")
+    if rgba.getchannel("A").getextrema()[0] < 255:
+        report.error(path, "has transparent pixels")
+    else:
+        report.warning(path, "has an alpha channel (fully opaque); flatten to RGB")
+
+
+def _open(report, path):
+    try:
+        return Image.open(path, formats=("PNG", "JPEG"))
+    except (OSError, SyntaxError) as e:  # not an image, or a truncated header
+        report.error(path, f"unreadable: {e}")
+        return None
+
+
+def folder_size(name):
+    """Expected screenshot size of a size folder: a SIZES entry, or a WxH suffix; None if unknown."""
+    if name in SIZES:
+        return SIZES[name]
+    match = _SIZE_IN_NAME.search(name)
+    return (int(match[1]), int(match[2])) if match else None
+
+
+def check_screenshots(report, root):
+    locales = set(scenes.available_locales()) - {scenes.DEFAULT_LOCALE}
+    # (locale, framed, size folder) -> screenshot stems in it
+    stems = defaultdict(set)
+    allowed = set(SIZES.values())
+    for dirpath, dirnames, files in os.walk(root):
+        dirnames.sort()
+        rel = os.path.relpath(dirpath, root)
+        parts = [] if rel == "." else rel.split(os.sep)
+        locale = parts.pop(0) if parts and parts[0] in locales else scenes.DEFAULT_LOCALE
+        framed = bool(parts) and parts[0] == "framed"
+        if framed:
+            parts.pop(0)
+        # Masters are kept lossless; size folders are encoded for the store
+        master = not parts
+        size = None if master else folder_size(parts[-1])
+        budget = None if master else encode.PROFILES["app_store"]["budget"]
+        for entry in os.scandir(dirpath):
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext not in encode.FORMATS or not entry.is_file():
+                continue
+            path = entry.path
+            report.checked += 1
+            img = _open(report, path)
+            if img is None:
+                continue
+            with img:
+                if master and entry.name.startswith("featured_graphic"):
+                    profile = encode.PROFILES[FEATURED_GRAPHIC["profile"]]
+                    check_header(report, path, img, entry.stat().st_size, FEATURED_GRAPHIC["size"],
+                                 FEATURED_GRAPHIC["limit"], profile["budget"], alpha=False, palette=profile["palette"])
+                    continue
+                check_header(report, path, img, entry.stat().st_size, size, SCREENSHOT_LIMIT, budget)
+                if size is None and img.size not in allowed and img.size[::-1] not in allowed:
+                    report.warning(path, f"{img.width}x{img.height} is none of the SIZES targets")
+                if _has_alpha(img):
+                    check_transparency(report, path, img)
+            if not master:
+                stems[locale, framed, dirpath].add(os.path.splitext(entry.name)[0])
+
+    # Size folders of one locale (framed ones apart) should hold the same screenshots
+    sets = defaultdict(dict)
+    for (locale, framed, folder), names in stems.items():
+        sets[locale, framed][folder] = names
+    for folders in sets.values():
+        union = set().union(*folders.values())
+        for folder, names in sorted(folders.items()):
+            if not MIN_SCREENSHOTS <= len(names) <= MAX_SCREENSHOTS:
+                report.error(folder, f"{len(names)} screenshots, the App Store takes "
+                                     f"{MIN_SCREENSHOTS}-{MAX_SCREENSHOTS} per size")
+            missing = sorted(union - names)
+            if missing:
+                report.warning(folder, f"missing {', '.join(missing)} (present in other size folders)")
+
+
+def check_icons(report, app_dir):
+    expected = {name: (size, alpha, None) for name, (size, alpha) in APP_ICONS.items()}
+    for rel, source, px in icon_sets.icon_matrix():
+        # iOS icons must not have an alpha channel at all; Play's 512 px icon has a size limit
+        alpha = not rel.startswith("ios/") and source in ("foreground", "round")
+        limit = PLAY_ICON_LIMIT if rel == "android/playstore-icon.png" else None
+        expected[f"{icon_sets.ICON_SET_DIR}/{rel}"] = ((px, px), alpha, limit)
+    for rel, (size, alpha, limit) in sorted(expected.items()):
+        path = os.path.join(app_dir, rel)
+        try:
+            st_size = os.stat(path).st_size
+        except FileNotFoundError:
+            continue  # the icon set is optional (generate-icons.py --no-icon-set)
+        report.checked += 1
+        img = _open(report, path)
+        if img is not None:
+            with img:
+                check_header(report, path, img, st_size, size, limit, alpha=alpha)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screenshots", default=SCREENSHOTS_DIR, help="store screenshot root")
+    parser.add_argument("--app-dir", default=MOBILE_DIR, help="app folder holding assets/ (the app icons)")
+    parser.add_argument("--strict", action="store_true", help="exit 1 on warnings too")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = Report()
+    check_screenshots(report, args.screenshots)
+    check_icons(report, args.app_dir)
+    elapsed = time.perf_counter() - start
+
+    for kind, items in (("error", report.errors), ("warning", report.warnings)):
+        for path, message in items:
+            print(f"{kind:<8} {output_store.rel_path(path)}: {message}")
+    print(f"\n{report.checked} files checked ({report.scanned} pixel scans) in {elapsed * 1000:.0f} ms: "
+          f"{len(report.errors)} errors, {len(report.warnings)} warnings")
+    if report.errors or (args.strict and report.warnings):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Find which store images changed visually against a baseline set.
+
+Images are matched by path relative to the two roots. A pair is unchanged
+when its bytes are equal; otherwise both are decoded and compared in bands
+of tiles: a band whose pixels are equal is skipped, and in a band that
+differs every TILE x TILE tile's mean squared error in its worst channel is
+computed in one pass (encode.tile_mse). Tiles start at multiples of TILE, so
+the last column and row are partial tiles on images that are not a multiple
+of TILE. A tile counts as changed when its PSNR falls below
+--min-db, so re-encoding noise (the encoder keeps every tile >= 35 dB) is
+ignored while a moved label or a new color is not. Without --highlight the
+comparison stops at the first changed tile.
+
+    python visual-diff.py --baseline /tmp/old-screenshots
+    python visual-diff.py --rev HEAD --highlight --exit-code   # against the committed files
+
+Changed files are listed (and written to <out>/changed.txt); with
+--highlight, each changed image is saved under --out with its changed tiles
+outlined, as <rel>.png (01_chat.jpg -> 01_chat.jpg.png, so a PNG and its
+JPEG twin keep separate highlights), and listed in <out>/highlights.txt; the
+next --highlight run deletes those files and nothing else in --out. --exit-code exits 1 when anything changed, so a store upload can be
+skipped when nothing did.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+from PIL import Image, ImageChops, ImageDraw
+
+from store_assets import encode
+from store_assets.build_cache import CACHE_DIR, MOBILE_DIR
+
+SCREENSHOTS_DIR = os.path.join(MOBILE_DIR, "store-screenshots")
+OUT_DIR = os.path.join(CACHE_DIR, "visual-diff")
+HIGHLIGHTS_LIST = "highlights.txt"
+
+TILE = 16
+BAND_TILES = 32        # tile rows compared per band before the early-exit check (bands start on tile rows)
+MIN_DB = 30.0
+HIGHLIGHT = (230, 40, 40)
+
+
+def image_paths(root):
+    """Image paths under root, relative to it."""
+    paths = set()
+    for dirpath, _, files in os.walk(root):
+        for fname in files:
+            if fname.lower().endswith(encode.IMAGE_EXTENSIONS):
+                paths.add(os.path.relpath(os.path.join(dirpath, fname), root))
+    return paths
+
+
+def _same_bytes(a, b):
+    if os.path.samefile(a, b):
+        return True  # e.g. both linked to one output_store object
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            chunk = fa.read(1 << 20)
+            if chunk != fb.read(1 << 20):
+                return False
+            if not chunk:
+                return True
+
+
+def _decode(path):
+    with Image.open(path) as img:
+        mode = "RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB"
+        return img.convert(mode)
+
+
+def changed_tiles(new, old, min_db=MIN_DB, first_only=False):
+    """(x, y, tile PSNR) of every tile of new below min_db against old, in tile units."""
+    limit = 255 ** 2 / 10 ** (min_db / 10)
+    if new.mode == "RGBA" or old.mode == "RGBA":
+        # Compare what is visible: both composited onto white and black
+        pairs = [(Image.alpha_composite(Image.new("RGBA", im.size, bg), im.convert("RGBA")) for im in (new, old))
+                 for bg in ((255, 255, 255, 255), (0, 0, 0, 255))]
+    else:
+        pairs = [(new, old)]
+    band = TILE * BAND_TILES
+    tiles = {}
+    for top in range(0, new.height, band):
+        box = (0, top, new.width, min(new.height, top + band))
+        for a, b in pairs:
+            a, b = a.crop(box), b.crop(box)
+            if ImageChops.difference(a, b).getbbox(alpha_only=False) is None:
+                continue  # pixel-identical band
+            grid = encode.tile_mse(a, b, TILE)
+            if grid.getextrema()[1] <= limit:
+                continue
+            data = grid.load()
+            for ty in range(grid.height):
+                for tx in range(grid.width):
+                    if data[tx, ty] > limit:
+                        key = (tx, top // TILE + ty)
+                        tiles[key] = min(tiles.get(key, math.inf), encode.psnr(data[tx, ty]))
+                        if first_only:
+                            return [key + (tiles[key],)]
+    return [key + (db,) for key, db in sorted(tiles.items())]
+
+
+def highlight(new, tiles, path):
+    """Save new, faded, with the changed tiles outlined."""
+    image = Image.blend(new.convert("RGB"), Image.new("RGB", new.size, (255, 255, 255)), 0.5)
+    draw = ImageDraw.Draw(image)
+    for tx, ty, _ in tiles:
+        x0, y0 = tx * TILE, ty * TILE
+        draw.rectangle((x0, y0, min(new.width, x0 + TILE) - 1, min(new.height, y0 + TILE) - 1),
+                       outline=HIGHLIGHT, width=2)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.save(path, compress_level=1)
+
+
+def compare(rel, new_root, old_root, min_db, out_dir):
+    """(rel, status, detail) for one pair; status is "same", "identical bytes" or "changed"."""
+    new_path, old_path = os.path.join(new_root, rel), os.path.join(old_root, rel)
+    if _same_bytes(new_path, old_path):
+        return rel, "identical bytes", ""
+    new, old = _decode(new_path), _decode(old_path)
+    if new.size != old.size:
+        return rel, "changed", f"size {old.size[0]}x{old.size[1]} -> {new.size[0]}x{new.size[1]}"
+    tiles = changed_tiles(new, old, min_db, first_only=out_dir is None)
+    if not tiles:
+        return rel, "same", ""
+    worst = min(db for _, _, db in tiles)
+    if out_dir is None:
+        return rel, "changed", f"worst tile {worst:.1f} dB"
+    highlight(new, tiles, os.path.join(out_dir, rel + ".png"))
+    return rel, "changed", f"{len(tiles)} tiles, worst {worst:.1f} dB"
+
+
+def clear_highlights(out_dir):
+    """Delete the highlight images the last --highlight run listed in out_dir (and folders left empty)."""
+    try:
+        with open(os.path.join(out_dir, HIGHLIGHTS_LIST)) as f:
+            rels = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    for rel in rels:
+        path = os.path.join(out_dir, rel + ".png")
+        if os.path.isfile(path):
+            os.remove(path)
+        folder = os.path.dirname(path)
+        while folder != os.path.normpath(out_dir) and os.path.isdir(folder) and not os.listdir(folder):
+            os.rmdir(folder)
+            folder = os.path.dirname(folder)
+    os.remove(os.path.join(out_dir, HIGHLIGHTS_LIST))
+
+
+def baseline_from_rev(rev, root, into):
+    """Extract root (a folder in this git repo) as of rev into the folder `into`; returns the copy's path."""
+    top = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=root, capture_output=True, text=True,
+                         check=True).stdout.strip()
+    rel = os.path.relpath(os.path.realpath(root), os.path.realpath(top))
+    archive = subprocess.run(["git", "archive", "--format=tar", rev, "--", rel], cwd=top, capture_output=True,
+                             check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(into, filter="data")
+    return os.path.join(into, rel)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--new", default=SCREENSHOTS_DIR, help="folder with the fresh renders")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--baseline", help="folder with the baseline images")
+    source.add_argument("--rev", help="git revision whose copy of --new is the baseline (e.g. HEAD)")
+    parser.add_argument("--min-db", type=float, default=MIN_DB, help="tiles at or above this PSNR count as unchanged")
+    parser.add_argument("--highlight", action="store_true", help="save highlight images of the changed files")
+    parser.add_argument("--out", default=OUT_DIR, help="where changed.txt and the highlight images go")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes (default: CPU count, 1 = run in-process)")
+    parser.add_argument("--exit-code", action="store_true", help="exit 1 when any image changed")
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    start = time.perf_counter()
+    tmp = tempfile.mkdtemp(prefix="visual-diff-") if args.rev else None
+    try:
+        old_root = baseline_from_rev(args.rev, args.new, tmp) if args.rev else args.baseline
+        new_paths, old_paths = image_paths(args.new), image_paths(old_root)
+        common = sorted(new_paths & old_paths)
+        if args.highlight:
+            clear_highlights(args.out)
+        out_dir = args.out if args.highlight else None
+        jobs = args.jobs or os.cpu_count() or 1
+        if jobs == 1:
+            results = [compare(rel, args.new, old_root, args.min_db, out_dir) for rel in common]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                n = len(common)
+                results = list(pool.map(compare, common, [args.new] * n, [old_root] * n, [args.min_db] * n,
+                                        [out_dir] * n, chunksize=max(1, n // (jobs * 4))))
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    changed = [(rel, detail) for rel, status, detail in results if status == "changed"]
+    added, removed = sorted(new_paths - old_paths), sorted(old_paths - new_paths)
+    for rel, detail in changed:
+        print(f"changed  {rel}  ({detail})")
+    for rel in added:
+        print(f"added    {rel}")
+    for rel in removed:
+        print(f"removed  {rel}")
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "changed.txt"), "w") as f:
+        f.writelines(f"{rel}\n" for rel in [r for r, _ in changed] + added)
+    if args.highlight:
+        # Only changed pairs of the same size get a highlight image
+        with open(os.path.join(args.out, HIGHLIGHTS_LIST), "w") as f:
+            f.writelines(f"{rel}\n" for rel, _ in changed if os.path.exists(os.path.join(args.out, rel + ".png")))
+    identical = sum(status == "identical bytes" for _, status, _ in results)
+    print(f"\n{len(common)} compared: {len(common) - len(changed)} unchanged ({identical} byte-identical), "
+          f"{len(changed)} changed, {len(added)} added, {len(removed)} removed "
+          f"in {time.perf_counter() - start:.2f}s")
+    if args.highlight and changed:
+        print(f"Highlights in {args.out}")
+    if args.exit_code and (changed or added or removed):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Re-render store asset previews as soon as their sources are saved.
+
+Runs in one long-lived process, so Pillow, the fonts, the measured text
+widths, the emoji sprites and each screenshot's locale-independent layer stay
+in memory between edits. The sources are polled (--interval) and a change
+re-renders only what depends on it:
+
+    screens/<scene>.json           that screenshot, every watched locale
+    screens/locales/<locale>.json  every screenshot of that locale (text only,
+                                   on the cached static layers)
+    store_assets/featured.py,      the featured graphic (the module is
+    the logo                       reloaded, its imports stay warm)
+    other store_assets/*.py        the watcher restarts itself
+
+Previews are masters saved with fast PNG compression to
+.asset-cache/preview/ (other locales in subfolders, like the real outputs);
+the featured graphic preview is built from the English previews, straight
+from memory. Nothing in
+store-screenshots/ is touched: run store-assets.py for the store files.
+--quality draft renders them at half size, without shadows, for a quicker
+turnaround (see store_assets/quality.py).
+
+    python watch-assets.py                     # English
+    python watch-assets.py --locales en es --quality draft   # Ctrl-C to stop
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+from store_assets import featured, quality, registry, scenes
+from store_assets.build_cache import CACHE_DIR
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.join(SCRIPTS_DIR, "store_assets")
+FEATURED_MODULE = os.path.join(PACKAGE_DIR, "featured.py")
+FEATURED_NAME = "featured_graphic_1024x500.png"
+SCREENSHOTS_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "store-screenshots")
+PREVIEW_DIR = os.path.join(CACHE_DIR, "preview")
+# Previews are overwritten on every save: favor speed over size
+PREVIEW_SAVE = {"compress_level": 1}
+
+
+def _json_files(folder):
+    return [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(".json")]
+
+
+class Watcher:
+    """Caches and dependency rules of the watch loop."""
+
+    def __init__(self, screens_dir, locales, out_dir, featured=True, q=None):
+        self.screens_dir = screens_dir
+        self.q = quality.get(q)
+        self.locales_dir = os.path.join(screens_dir, "locales")
+        self.locales = locales
+        self.out_dir = out_dir
+        self.featured = featured
+        self.scenes = {}    # scene path -> parsed scene
+        self.statics = {}   # scene path -> locale-independent layer at the render size
+        self.previews = {}  # output name -> last English preview, for the featured graphic
+
+    def sources(self):
+        """path -> (mtime_ns, size) of every watched file."""
+        paths = _json_files(self.screens_dir) + _json_files(self.locales_dir)
+        paths += [os.path.join(PACKAGE_DIR, f) for f in os.listdir(PACKAGE_DIR) if f.endswith(".py")]
+        if self.featured:
+            paths.append(featured.LOGO_PATH)
+        stamps = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def preview_path(self, locale, name):
+        return os.path.join(scenes.locale_dir(self.out_dir, locale), name)
+
+    def render_scene(self, path, locales):
+        """Render one screenshot for locales; the static layer is redrawn only if the spec changed."""
+        if not os.path.exists(path):
+            self.scenes.pop(path, None)
+            self.statics.pop(path, None)
+            return
+        if path not in self.statics:
+            self.scenes[path] = scenes.load_scene(path)
+            size = quality.render_size(self.q, (scenes.W, scenes.H))
+            self.statics[path] = scenes.render_static(self.scenes[path], size)
+        scene = self.scenes[path]
+        for locale in locales:
+            start = time.perf_counter()
+            img = scenes.draw_text_layer(self.statics[path].copy(), scene, scenes.load_strings(locale))
+            img = quality.finish(self.q, img)
+            out = self.preview_path(locale, scene["output"])
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            img.save(out, **PREVIEW_SAVE)
+            if locale == scenes.DEFAULT_LOCALE and scene["output"] in featured.MOCKUP_NAMES:
+                self.previews[scene["output"]] = img
+            self._report(out, start)
+
+    def render_featured(self):
+        start = time.perf_counter()
+        # Mock up the fresh English previews where there are any, else the store files
+        screenshots = [self.previews.get(name) or _open(os.path.join(SCREENSHOTS_DIR, name))
+                       for name in featured.MOCKUP_NAMES]
+        out = os.path.join(self.out_dir, FEATURED_NAME)
+        featured.render(screenshots, _open(featured.LOGO_PATH), self.q).save(out, **PREVIEW_SAVE)
+        self._report(out, start)
+
+    def update(self, changed):
+        """Re-render everything that depends on the changed paths."""
+        scene_paths = {p for p in changed if os.path.dirname(p) == self.screens_dir}
+        locales = {os.path.splitext(os.path.basename(p))[0] for p in changed if os.path.dirname(p) == self.locales_dir}
+        redo_featured = self.featured and bool({FEATURED_MODULE, featured.LOGO_PATH} & changed)
+        if FEATURED_MODULE in changed:
+            self._try(FEATURED_MODULE, importlib.reload, featured)
+
+        for path in sorted(scene_paths):
+            self.statics.pop(path, None)
+            self._try(path, self.render_scene, path, self.locales)
+            name = self.scenes.get(path, {}).get("output")
+            redo_featured |= self.featured and scenes.DEFAULT_LOCALE in self.locales and name in featured.MOCKUP_NAMES
+        for locale in sorted(locales & set(self.locales)):
+            for path in _json_files(self.screens_dir):
+                if path not in scene_paths:
+                    self._try(path, self.render_scene, path, [locale])
+        if redo_featured:
+            self._try(FEATURED_MODULE, self.render_featured)
+
+    def _try(self, path, func, *args):
+        # A half-typed spec or script must not stop the watcher
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"error  {os.path.relpath(path, SCRIPTS_DIR)}: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def _report(self, out, start):
+        print(f"{time.strftime('%H:%M:%S')}  {os.path.relpath(out, self.out_dir)}  "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms", flush=True)
+
+
+def _open(path):
+    # The registry decodes a file again only when it changed
+    return registry.load(path) if os.path.exists(path) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screens", default=scenes.SCREENS_DIR, help="folder with the JSON scene specs")
+    parser.add_argument("--locales", nargs="+", default=[scenes.DEFAULT_LOCALE],
+                        help=f"locales to preview, or 'all' (available: {' '.join(scenes.available_locales())})")
+    parser.add_argument("--out", default=PREVIEW_DIR, help="preview folder")
+    parser.add_argument("--quality", default=quality.DEFAULT, choices=list(quality.QUALITIES),
+                        help="preview quality (see store_assets/quality.py)")
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between checks for changes")
+    parser.add_argument("--no-featured-graphic", dest="featured", action="store_false",
+                        help="do not preview the featured graphic")
+    args = parser.parse_args()
+
+    locales = scenes.available_locales() if args.locales == ["all"] else args.locales
+    watcher = Watcher(os.path.abspath(args.screens), locales, args.out, args.featured, quality.get(args.quality))
+    stamps = watcher.sources()
+    print(f"Rendering previews to {args.out}")
+    watcher.update(set(stamps))
+    print("Watching for changes (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = watcher.sources()
+            changed = {p for p in current.keys() | stamps.keys() if current.get(p) != stamps.get(p)}
+            stamps = current
+            if not changed:
+                continue
+            if any(os.path.dirname(p) == PACKAGE_DIR and p != FEATURED_MODULE for p in changed):
+                print("store_assets changed, restarting", flush=True)
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+            watcher.update(changed)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()